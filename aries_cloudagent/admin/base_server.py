@@ -40,3 +40,7 @@ class BaseAdminServer(ABC):
     @abstractmethod
     async def send_webhook(self, profile: Profile, topic: str, payload: dict):
         """Add a webhook to the queue, to send to all registered targets."""
+
+    def webhook_subscribed(self, profile: Profile, topic: str) -> bool:
+        """Check whether any webhook target may receive a topic."""
+        return True
@@ -17,6 +17,7 @@ import jwt
 
 from marshmallow import fields
 
+from ..cache.base import BaseCache
 from ..config.injection_context import InjectionContext
 from ..core.profile import Profile
 from ..core.plugin_registry import PluginRegistry
@@ -28,6 +29,7 @@ from ..transport.outbound.message import OutboundMessage
 from ..utils.stats import Collector
 from ..utils.task_queue import TaskQueue
 from ..version import __version__
+from ..wallet.crypto import VERKEY_CACHE
 from ..multitenant.manager import MultitenantManager, MultitenantManagerError
 
 from ..storage.error import StorageNotFoundError
@@ -357,10 +359,21 @@ class AdminServer(BaseAdminServer):
 
             if collector:
                 handler = collector.wrap_coro(handler, [handler.__qualname__])
-            if self.task_queue:
-                task = await self.task_queue.put(handler(request))
-                return await task
-            return await handler(request)
+
+            # keep the subwallet profile open while the request is handled
+            wallet_id = profile is not self.root_profile and profile.settings.get(
+                "wallet.id"
+            )
+            if wallet_id:
+                self.multitenant_manager.acquire_profile(wallet_id)
+            try:
+                if self.task_queue:
+                    task = await self.task_queue.put(handler(request))
+                    return await task
+                return await handler(request)
+            finally:
+                if wallet_id:
+                    self.multitenant_manager.release_profile(wallet_id)
 
         middlewares.append(setup_context)
 
@@ -543,6 +556,12 @@ class AdminServer(BaseAdminServer):
             status["timing"] = collector.results
         if self.conductor_stats:
             status["conductor"] = await self.conductor_stats()
+        cache = self.context.inject(BaseCache, required=False)
+        if cache and cache.stats:
+            status["cache"] = dict(cache.stats)
+        status["verkey_cache"] = dict(VERKEY_CACHE.stats)
+        if self.multitenant_manager:
+            status["multitenant_profiles"] = self.multitenant_manager.profile_stats
         return web.json_response(status)
 
     @docs(tags=["server"], summary="Reset statistics")
@@ -561,6 +580,7 @@ class AdminServer(BaseAdminServer):
         collector = self.context.inject(Collector, required=False)
         if collector:
             collector.reset()
+        VERKEY_CACHE.reset_stats()
         return web.json_response({})
 
     async def redirect_handler(self, request: web.BaseRequest):
@@ -741,6 +761,17 @@ class AdminServer(BaseAdminServer):
         if target_url in self.webhook_targets:
             del self.webhook_targets[target_url]
 
+    def webhook_subscribed(self, profile: Profile, topic: str) -> bool:
+        """Check whether any webhook target or admin websocket may receive a topic."""
+        if any(queue.authenticated for queue in self.websocket_queues.values()):
+            return True
+        if self.webhook_router:
+            for endpoint in profile.settings.get("admin.webhook_urls") or ():
+                target = self.webhook_targets.get(endpoint)
+                if not (target and target.topic_filter) or topic in target.topic_filter:
+                    return True
+        return False
+
     async def send_webhook(self, profile: Profile, topic: str, payload: dict):
         """Add a webhook to the queue, to send to all registered targets."""
         wallet_id = profile.settings.get("wallet.id")
@@ -751,14 +782,15 @@ class AdminServer(BaseAdminServer):
             metadata = {"x-wallet-id": wallet_id}
 
         if self.webhook_router:
-            # for idx, target in self.webhook_targets.items():
-            #     if not target.topic_filter or topic in target.topic_filter:
             for endpoint in webhook_urls:
+                target = self.webhook_targets.get(endpoint)
+                if target and target.topic_filter and topic not in target.topic_filter:
+                    continue
                 self.webhook_router(
                     topic,
                     payload,
                     endpoint,
-                    None,
+                    target and target.max_attempts,
                     metadata,
                 )
 
@@ -307,3 +307,27 @@ class TestAdminServer(AsyncTestCase):
         ) as response:
             assert response.status == 503
         await server.stop()
+
+    async def test_send_webhook_topic_filter(self):
+        server = self.get_admin_server()
+        server.add_webhook_target("http://all")
+        server.add_webhook_target("http://filtered", ["connections"], max_attempts=2)
+        profile = InMemoryProfile.test_profile(
+            {"admin.webhook_urls": ["http://all", "http://filtered"]}
+        )
+
+        assert server.webhook_subscribed(profile, "issue_credential")
+        await server.send_webhook(profile, "issue_credential", {"a": 1})
+        await server.send_webhook(profile, "connections", {"b": 2})
+        assert self.webhook_results == [
+            ("issue_credential", {"a": 1}, "http://all", None, None),
+            ("connections", {"b": 2}, "http://all", None, None),
+            ("connections", {"b": 2}, "http://filtered", 2, None),
+        ]
+
+        server.remove_webhook_target("http://all")
+        server.add_webhook_target("http://all", ["present_proof"])
+        assert server.webhook_subscribed(profile, "connections")
+        assert not server.webhook_subscribed(profile, "issue_credential")
+        server.websocket_queues["socket"] = async_mock.MagicMock(authenticated=True)
+        assert server.webhook_subscribed(profile, "issue_credential")
@@ -0,0 +1,128 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import AioHTTPTestCase, unittest_run_loop
+from asynctest import mock as async_mock
+
+from .. import webhooks as test_module
+from ..webhooks import WebhookDispatcher, split_webhook_url
+
+
+class TestWebhookDispatcher(AioHTTPTestCase):
+    async def setUpAsync(self):
+        self.requests = []
+        self.fail_count = 0
+
+    async def receive_webhook(self, request):
+        if self.fail_count:
+            self.fail_count -= 1
+            raise web.HTTPServiceUnavailable()
+        self.requests.append(
+            (request.path, dict(request.headers), await request.json())
+        )
+        raise web.HTTPOk()
+
+    async def get_application(self):
+        app = web.Application()
+        app.add_routes([web.post("/{path:.*}", self.receive_webhook)])
+        return app
+
+    async def wait_delivered(self, dispatcher: WebhookDispatcher):
+        for _ in range(100):
+            if not dispatcher.targets:
+                break
+            await asyncio.sleep(0.01)
+
+    def test_split_webhook_url(self):
+        assert split_webhook_url("http://hooks#key") == ("http://hooks", "key")
+        assert split_webhook_url("http://hooks") == ("http://hooks", None)
+
+    @unittest_run_loop
+    async def test_deliver(self):
+        server_addr = f"http://localhost:{self.server.port}"
+        dispatcher = WebhookDispatcher(concurrency=2)
+        await dispatcher.start()
+
+        for i in range(3):
+            dispatcher.enqueue(
+                "topic", {"i": i}, f"{server_addr}#key", metadata={"x-wallet-id": "w"}
+            )
+        assert dispatcher.stats["in_flight"] == 2
+        await self.wait_delivered(dispatcher)
+
+        assert sorted(body["i"] for _, _, body in self.requests) == [0, 1, 2]
+        path, headers, _ = self.requests[0]
+        assert path == "/topic/topic/"
+        assert headers["x-api-key"] == "key"
+        assert headers["x-wallet-id"] == "w"
+        assert dispatcher.stats["delivered"] == 3
+        assert dispatcher.stats["requests"] == 3
+        await dispatcher.stop()
+
+    @unittest_run_loop
+    async def test_deliver_batch(self):
+        server_addr = f"http://localhost:{self.server.port}"
+        dispatcher = WebhookDispatcher(
+            concurrency=1, batch_endpoints=[f"{server_addr}#key"], batch_size=2
+        )
+        await dispatcher.start()
+
+        for i in range(3):
+            dispatcher.enqueue(f"topic-{i}", {"i": i}, f"{server_addr}#key")
+        await self.wait_delivered(dispatcher)
+
+        assert [(path, body) for path, _, body in self.requests] == [
+            (
+                "/batch/",
+                [
+                    {"topic": "topic-0", "payload": {"i": 0}},
+                    {"topic": "topic-1", "payload": {"i": 1}},
+                ],
+            ),
+            ("/batch/", [{"topic": "topic-2", "payload": {"i": 2}}]),
+        ]
+        assert dispatcher.stats["delivered"] == 3
+        assert dispatcher.stats["requests"] == 2
+        await dispatcher.stop()
+
+    @unittest_run_loop
+    async def test_queue_limit_and_retry(self):
+        server_addr = f"http://localhost:{self.server.port}"
+        dispatcher = WebhookDispatcher(
+            concurrency=1, queue_limit=2, max_attempts=2, retry_interval=0.01
+        )
+        await dispatcher.start()
+        self.fail_count = 3
+
+        with async_mock.patch.object(test_module.LOGGER, "warning") as mock_warning:
+            for i in range(4):
+                dispatcher.enqueue("topic", {"i": i}, server_addr)
+            # warnings about dropped events are rate limited
+            mock_warning.assert_called_once()
+        assert dispatcher.stats["dropped"] == 2
+        assert dispatcher.stats["queued"] == 2
+        await self.wait_delivered(dispatcher)
+
+        # event 2 fails twice, event 3 fails once before delivery
+        assert [body["i"] for _, _, body in self.requests] == [3]
+        assert dispatcher.stats["failed"] == 1
+        assert dispatcher.stats["delivered"] == 1
+        await dispatcher.stop()
+        assert repr(dispatcher).startswith("<WebhookDispatcher")
+
+    @unittest_run_loop
+    async def test_stop_drops_pending(self):
+        server_addr = f"http://localhost:{self.server.port}"
+        dispatcher = WebhookDispatcher(concurrency=1, max_attempts=2, retry_interval=5)
+        await dispatcher.start()
+        self.fail_count = 1
+
+        for i in range(3):
+            dispatcher.enqueue("topic", {"i": i}, server_addr)
+        await asyncio.sleep(0.05)
+        await dispatcher.stop(timeout=0.01)
+
+        # the event awaiting retry and the queued events are counted as dropped
+        assert dispatcher.stats["dropped"] == 3
+        assert dispatcher.stats["queued"] == 0
+        assert not self.requests
@@ -0,0 +1,273 @@
+"""Dedicated webhook dispatcher with per-target queues."""
+
+import asyncio
+import json
+import logging
+import time
+
+from collections import deque
+from typing import Dict, Mapping, Sequence, Set, Tuple
+
+from ..transport.outbound.http import HttpTransport
+from ..utils.repeat import RepeatSequence
+from ..utils.task_queue import task_exc_info
+
+LOGGER = logging.getLogger(__name__)
+
+
+def split_webhook_url(url: str) -> Tuple[str, str]:
+    """Split a webhook URL into the endpoint and the optional API key."""
+    endpoint, _, api_key = url.partition("#")
+    return endpoint, api_key or None
+
+
+class WebhookTargetQueue:
+    """Queue of the webhook events pending delivery to a single target."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        api_key: str = None,
+        headers: Mapping[str, str] = None,
+        batch: bool = False,
+        batch_size: int = 100,
+    ):
+        """
+        Initialize a `WebhookTargetQueue` instance.
+
+        Args:
+            endpoint: the webhook endpoint, without the API key
+            api_key: the API key sent to the endpoint
+            headers: additional headers sent with each request
+            batch: whether to deliver events in batches
+            batch_size: the maximum number of events in a batch
+
+        """
+        self.endpoint = endpoint
+        self.api_key = api_key
+        self.headers = dict(headers) if headers else None
+        self.batch = batch
+        self.batch_size = batch_size
+        self.events = deque()
+        self.active = 0
+        # workers which have not yet taken events from the queue
+        self.starting = 0
+
+    @property
+    def worker_capacity(self) -> int:
+        """Get the number of events a worker takes from the queue at once."""
+        return self.batch_size if self.batch else 1
+
+
+class WebhookDispatcher:
+    """
+    Deliver webhooks to controllers, separately from DIDComm messages.
+
+    Events are queued per target and delivered by up to `concurrency` workers
+    per target, over a dedicated connection pool. For targets which opt in,
+    queued events are posted together as a JSON array to `<endpoint>/batch/`.
+    When the queue of a target is full, its oldest events are dropped.
+    """
+
+    # minimum number of seconds between warnings about dropped events
+    DROP_WARNING_INTERVAL = 60
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        batch_endpoints: Sequence[str] = None,
+        batch_size: int = 100,
+        queue_limit: int = 10000,
+        max_attempts: int = 5,
+        retry_interval: float = 2.0,
+    ):
+        """
+        Initialize a `WebhookDispatcher` instance.
+
+        Args:
+            concurrency: the maximum number of concurrent requests per target
+            batch_endpoints: the endpoints which accept batches of events
+            batch_size: the maximum number of events in a batch
+            queue_limit: the maximum number of queued events per target
+            max_attempts: the default maximum number of delivery attempts
+            retry_interval: the base interval in seconds between attempts
+
+        """
+        self.concurrency = concurrency
+        self.batch_endpoints = {
+            split_webhook_url(url)[0] for url in (batch_endpoints or ())
+        }
+        self.batch_size = batch_size
+        self.queue_limit = queue_limit
+        self.max_attempts = max_attempts
+        self.retry_interval = retry_interval
+        self.targets: Dict[Tuple, WebhookTargetQueue] = {}
+        self.transport: HttpTransport = None
+        self._workers: Set[asyncio.Task] = set()
+        self._stats = {"delivered": 0, "failed": 0, "dropped": 0, "requests": 0}
+        self._drop_warned_at: float = None
+        self._drops_unreported = 0
+
+    @property
+    def stats(self) -> Mapping[str, int]:
+        """Accessor for the queue and delivery counters."""
+        return {
+            **self._stats,
+            "queued": sum(len(target.events) for target in self.targets.values()),
+            "in_flight": sum(target.active for target in self.targets.values()),
+            "targets": len(self.targets),
+        }
+
+    async def start(self):
+        """Start the dispatcher."""
+        self.transport = HttpTransport(limit_per_host=self.concurrency)
+        await self.transport.start()
+
+    async def stop(self, timeout: float = 5.0):
+        """Wait for the queued webhooks to be delivered, then stop."""
+        if self._workers:
+            _, pending = await asyncio.wait(list(self._workers), timeout=timeout)
+            for worker in pending:
+                worker.cancel()
+            if pending:
+                await asyncio.wait(pending)
+        for target in self.targets.values():
+            if target.events:
+                self._dropped(target, len(target.events), "dispatcher stopped")
+                target.events.clear()
+        self.targets = {}
+        if self.transport:
+            await self.transport.stop()
+            self.transport = None
+
+    def enqueue(
+        self,
+        topic: str,
+        payload: dict,
+        endpoint: str,
+        max_attempts: int = None,
+        metadata: dict = None,
+    ):
+        """
+        Add a webhook event to the queue of its target.
+
+        Args:
+            topic: The webhook topic
+            payload: The webhook payload
+            endpoint: The webhook endpoint, with an optional `#api_key` suffix
+            max_attempts: Override the maximum number of attempts
+            metadata: Additional headers sent with the webhook
+
+        """
+        endpoint, api_key = split_webhook_url(endpoint)
+        key = (endpoint, api_key, tuple(sorted(metadata.items())) if metadata else ())
+        target = self.targets.get(key)
+        if not target:
+            target = self.targets[key] = WebhookTargetQueue(
+                endpoint,
+                api_key,
+                metadata,
+                endpoint in self.batch_endpoints,
+                self.batch_size,
+            )
+        if len(target.events) >= self.queue_limit:
+            target.events.popleft()
+            self._dropped(target, 1, "queue limit reached")
+        target.events.append((topic, payload, max_attempts))
+
+        if (
+            target.active < self.concurrency
+            and len(target.events) > target.starting * target.worker_capacity
+        ):
+            target.active += 1
+            target.starting += 1
+            worker = asyncio.ensure_future(self._run_worker(key, target))
+            self._workers.add(worker)
+            worker.add_done_callback(self._worker_done)
+
+    def _dropped(self, target: WebhookTargetQueue, count: int, reason: str):
+        """Count dropped events, warning at most once per interval."""
+        self._stats["dropped"] += count
+        self._drops_unreported += count
+        now = time.perf_counter()
+        if (
+            self._drop_warned_at is None
+            or now - self._drop_warned_at >= self.DROP_WARNING_INTERVAL
+        ):
+            LOGGER.warning(
+                "Dropped %d webhook event(s), most recently for %s: %s",
+                self._drops_unreported,
+                target.endpoint,
+                reason,
+            )
+            self._drop_warned_at = now
+            self._drops_unreported = 0
+
+    def _worker_done(self, worker: asyncio.Task):
+        """Handle completion of a worker."""
+        self._workers.discard(worker)
+        exc_info = task_exc_info(worker)
+        if exc_info:
+            LOGGER.exception("Exception in webhook worker:", exc_info=exc_info)
+
+    async def _run_worker(self, key: Tuple, target: WebhookTargetQueue):
+        """Deliver the queued events of a target until the queue is empty."""
+        target.starting -= 1
+        try:
+            while target.events:
+                if target.batch:
+                    count = min(len(target.events), target.batch_size)
+                    events = [target.events.popleft() for _ in range(count)]
+                    body = [
+                        {"topic": topic, "payload": payload}
+                        for topic, payload, _ in events
+                    ]
+                    url = f"{target.endpoint}/batch/"
+                    max_attempts = self.max_attempts
+                else:
+                    events = [target.events.popleft()]
+                    topic, body, max_attempts = events[0]
+                    url = f"{target.endpoint}/topic/{topic}/"
+                    max_attempts = max_attempts or self.max_attempts
+                try:
+                    delivered = await self._post(target, url, body, max_attempts)
+                except asyncio.CancelledError:
+                    self._dropped(target, len(events), "dispatcher stopped")
+                    raise
+                if delivered:
+                    self._stats["delivered"] += len(events)
+                else:
+                    self._stats["failed"] += len(events)
+        finally:
+            target.active -= 1
+            if not target.active and not target.events:
+                self.targets.pop(key, None)
+
+    async def _post(
+        self, target: WebhookTargetQueue, url: str, body, max_attempts: int
+    ) -> bool:
+        """Post a webhook request, retrying with backoff."""
+        payload = json.dumps(body)
+        async for attempt in RepeatSequence(max_attempts, self.retry_interval, 0.25):
+            self._stats["requests"] += 1
+            try:
+                await self.transport.handle_message(
+                    None,
+                    payload,
+                    url,
+                    dict(target.headers) if target.headers else None,
+                    target.api_key,
+                )
+                return True
+            except Exception as err:
+                if attempt.final:
+                    LOGGER.warning("Webhook could not be delivered to %s: %s", url, err)
+                else:
+                    LOGGER.debug("Retrying webhook delivery to %s: %s", url, err)
+        return False
+
+    def __repr__(self) -> str:
+        """Human readable representation of this instance."""
+        return "<{}(concurrency={}, targets={})>".format(
+            self.__class__.__name__, self.concurrency, len(self.targets)
+        )
@@ -2,7 +2,7 @@
 
 import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Sequence, Text, Union
+from typing import Any, Mapping, Sequence, Text, Union
 
 from ..core.error import BaseError
 
@@ -57,6 +57,88 @@ class BaseCache(ABC):
     async def flush(self):
         """Remove all items from the cache."""
 
+    async def get_many(self, keys: Sequence[Text]) -> Mapping[Text, Any]:
+        """
+        Get several items from the cache.
+
+        Args:
+            keys: the keys to retrieve items for
+
+        Returns:
+            A mapping from each key to the record found or `None`
+
+        """
+        return {key: await self.get(key) for key in keys}
+
+    async def set_many(self, values: Mapping[Text, Any], ttl: int = None):
+        """
+        Add several items to the cache with an optional ttl.
+
+        Args:
+            values: a mapping from each key to the value to store for it
+            ttl: number of seconds that the records should persist
+
+        """
+        for key, value in values.items():
+            await self.set(key, value, ttl)
+
+    async def clear_many(self, keys: Sequence[Text]):
+        """
+        Remove several items from the cache, if present.
+
+        Args:
+            keys: the keys to remove
+
+        """
+        for key in keys:
+            await self.clear(key)
+
+    async def close(self):
+        """Release any resources held by the cache."""
+
+    async def acquire_lease(self, key: Text) -> bool:
+        """
+        Acquire an exclusive lease to produce the value for a cache key.
+
+        Caches shared between processes override this to deduplicate work
+        across agent instances. The default only relies on in-process locking.
+
+        Args:
+            key: the key to lease
+
+        Returns:
+            `False` if the lease is currently held elsewhere
+
+        """
+        return True
+
+    async def release_lease(self, key: Text):
+        """
+        Release a lease on a cache key, notifying any waiters.
+
+        Args:
+            key: the key to release
+
+        """
+
+    async def wait_for_lease(self, key: Text):
+        """
+        Wait for the holder of a lease elsewhere to produce a value.
+
+        Args:
+            key: the key to wait for
+
+        Returns:
+            The value produced, or `None` if the lease was released or expired
+            without producing one
+
+        """
+
+    @property
+    def stats(self) -> Mapping[str, int]:
+        """Accessor for cache statistics, if tracked by the implementation."""
+        return {}
+
     def acquire(self, key: Text):
         """Acquire a lock on a given cache key."""
         result = CacheKeyLock(self, key)
@@ -81,6 +163,12 @@ class CacheKeyLock:
 
     Used to prevent multiple async threads from generating
     or querying the same semi-expensive data. Not thread safe.
+
+    When the cache is shared between processes, the cache may also
+    grant a lease on the key so that only one process produces the value
+    while the others wait for it. If the lease holder does not produce a
+    value before the lease expires, waiters fall back to producing it
+    themselves.
     """
 
     def __init__(self, cache: BaseCache, key: Text):
@@ -88,6 +176,7 @@ class CacheKeyLock:
         self.cache = cache
         self.exception: BaseException = None
         self.key = key
+        self.leased = False
         self.released = False
         self._future: asyncio.Future = asyncio.get_event_loop().create_future()
         self._parent: "CacheKeyLock" = None
@@ -132,6 +221,7 @@ class CacheKeyLock:
         self._future.set_result(value)
         if not self._parent or self._parent.done:
             await self.cache.set(self.key, value, ttl)
+        await self.release_lease()
 
     def __await__(self):
         """Wait for a result to be produced."""
@@ -146,10 +236,22 @@ class CacheKeyLock:
                 await self  # wait for parent's done handler to complete
         if not result:
             found = await self.cache.get(self.key)
+            if not found and not self.parent:
+                # coordinate with other processes sharing the cache, if any
+                if await self.cache.acquire_lease(self.key):
+                    self.leased = True
+                else:
+                    found = await self.cache.wait_for_lease(self.key)
             if found:
                 self._future.set_result(found)
         return self
 
+    async def release_lease(self):
+        """Release the lease on the cache key, if held."""
+        if self.leased:
+            self.leased = False
+            await self.cache.release_lease(self.key)
+
     def release(self):
         """Release the cache lock."""
         if not self.parent and not self.released:
@@ -166,6 +268,7 @@ class CacheKeyLock:
             self.exception = exc_val
         if not self.done:
             self._future.set_result(None)
+        await self.release_lease()
         self.release()
 
     def __del__(self):
@@ -1,29 +1,120 @@
 """Basic in-memory cache implementation."""
 
+import heapq
+import sys
 import time
-from typing import Any, Sequence, Text, Union
+
+from collections import OrderedDict
+from typing import Any, Mapping, Sequence, Text, Union
 
 from .base import BaseCache
 
 
+def _estimate_size(value: Any, seen: set = None) -> int:
+    """Estimate the memory footprint of a cached value in bytes."""
+    if seen is None:
+        seen = set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(
+            _estimate_size(k, seen) + _estimate_size(v, seen) for k, v in value.items()
+        )
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_estimate_size(item, seen) for item in value)
+    elif hasattr(value, "__dict__"):
+        size += _estimate_size(vars(value), seen)
+    return size
+
+
 class InMemoryCache(BaseCache):
     """Basic in-memory cache class."""
 
-    def __init__(self):
-        """Initialize a `InMemoryCache` instance."""
+    def __init__(self, max_entries: int = None, max_bytes: int = None):
+        """
+        Initialize a `InMemoryCache` instance.
+
+        Args:
+            max_entries: the maximum number of entries to retain
+            max_bytes: the maximum estimated size of all retained values
+
+        When either bound is exceeded, the least recently used entries are evicted.
+        """
         super().__init__()
         # looks like { "key": { "expires": <epoch timestamp>, "value": <val> } }
-        self._cache = {}
+        # ordered from least to most recently used
+        self._cache = OrderedDict()
+        # min-heap of (expires, key); entries superseded by a later set are skipped
+        self._expiry = []
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._total_bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    @property
+    def stats(self) -> Mapping[str, int]:
+        """Accessor for hit, miss, eviction and expiration counters."""
+        return {
+            **self._stats,
+            "entries": len(self._cache),
+            "bytes": self._total_bytes,
+        }
+
+    def _remove_entry(self, key: Text):
+        """Remove a single entry, updating the size accounting."""
+        entry = self._cache.pop(key, None)
+        if entry:
+            self._total_bytes -= entry["size"]
 
     def _remove_expired_cache_items(self):
         """Remove all expired items from cache."""
-        for key, val in self._cache.copy().items():  # iterate copy, del from original
-            cache_item_expiry = val["expires"]
-            if cache_item_expiry is None:
-                continue
-            now = time.perf_counter()
-            if now >= cache_item_expiry:
-                del self._cache[key]
+        now = time.perf_counter()
+        while self._expiry and self._expiry[0][0] <= now:
+            expires, key = heapq.heappop(self._expiry)
+            entry = self._cache.get(key)
+            if entry and entry["expires"] == expires:
+                self._remove_entry(key)
+                self._stats["expirations"] += 1
+
+    def _compact_expiry(self):
+        """Rebuild the expiry heap once superseded entries dominate it."""
+        if len(self._expiry) > 2 * len(self._cache) + 64:
+            self._expiry = [
+                (entry["expires"], key)
+                for key, entry in self._cache.items()
+                if entry["expires"] is not None
+            ]
+            heapq.heapify(self._expiry)
+
+    def _evict(self):
+        """Evict least recently used entries until within configured bounds."""
+        while self._cache and (
+            (self._max_entries and len(self._cache) > self._max_entries)
+            or (self._max_bytes and self._total_bytes > self._max_bytes)
+        ):
+            _, entry = self._cache.popitem(last=False)
+            self._total_bytes -= entry["size"]
+            self._stats["evictions"] += 1
+
+    def _lookup(self, key: Text):
+        """Look up an unexpired entry, updating the usage order and counters."""
+        entry = self._cache.get(key)
+        if not entry:
+            self._stats["misses"] += 1
+            return None
+        self._cache.move_to_end(key)
+        self._stats["hits"] += 1
+        return entry["value"]
+
+    def _store(self, key: Text, value: Any, expires_ts: float, size: int):
+        """Store a single entry, replacing any existing one."""
+        self._remove_entry(key)
+        self._cache[key] = {"expires": expires_ts, "value": value, "size": size}
+        self._total_bytes += size
+        if expires_ts is not None:
+            heapq.heappush(self._expiry, (expires_ts, key))
 
     async def get(self, key: Text):
         """
@@ -37,7 +128,21 @@ class InMemoryCache(BaseCache):
 
         """
         self._remove_expired_cache_items()
-        return self._cache.get(key)["value"] if self._cache.get(key) else None
+        return self._lookup(key)
+
+    async def get_many(self, keys: Sequence[Text]) -> Mapping[Text, Any]:
+        """
+        Get several items from the cache.
+
+        Args:
+            keys: the keys to retrieve items for
+
+        Returns:
+            A mapping from each key to the record found or `None`
+
+        """
+        self._remove_expired_cache_items()
+        return {key: self._lookup(key) for key in keys}
 
     async def set(self, keys: Union[Text, Sequence[Text]], value: Any, ttl: int = None):
         """
@@ -53,8 +158,30 @@ class InMemoryCache(BaseCache):
         """
         self._remove_expired_cache_items()
         expires_ts = time.perf_counter() + ttl if ttl else None
+        size = _estimate_size(value) if self._max_bytes else 0
         for key in [keys] if isinstance(keys, Text) else keys:
-            self._cache[key] = {"expires": expires_ts, "value": value}
+            self._store(key, value, expires_ts, size)
+        self._evict()
+        self._compact_expiry()
+
+    async def set_many(self, values: Mapping[Text, Any], ttl: int = None):
+        """
+        Add several items to the cache with an optional ttl.
+
+        Overwrites existing cache entries.
+
+        Args:
+            values: a mapping from each key to the value to store for it
+            ttl: number of seconds that the records should persist
+
+        """
+        self._remove_expired_cache_items()
+        expires_ts = time.perf_counter() + ttl if ttl else None
+        for key, value in values.items():
+            size = _estimate_size(value) if self._max_bytes else 0
+            self._store(key, value, expires_ts, size)
+        self._evict()
+        self._compact_expiry()
 
     async def clear(self, key: Text):
         """
@@ -64,10 +191,22 @@ class InMemoryCache(BaseCache):
             key: the key to remove
 
         """
-        if key in self._cache:
-            del self._cache[key]
+        self._remove_entry(key)
+
+    async def clear_many(self, keys: Sequence[Text]):
+        """
+        Remove several items from the cache, if present.
+
+        Args:
+            keys: the keys to remove
+
+        """
+        for key in keys:
+            self._remove_entry(key)
 
     async def flush(self):
         """Remove all items from the cache."""
 
-        self._cache = {}
+        self._cache = OrderedDict()
+        self._expiry = []
+        self._total_bytes = 0
@@ -0,0 +1,378 @@
+"""Redis-backed cache implementation shared between agent instances."""
+
+import asyncio
+import json
+import logging
+from typing import Any, Mapping, Sequence, Text, Union
+from uuid import uuid4
+
+import aioredis
+
+from .base import BaseCache, CacheError
+from .in_memory import InMemoryCache
+
+LOGGER = logging.getLogger(__name__)
+
+# delete a lease only while it is still held with the given token
+RELEASE_LEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class RedisCache(BaseCache):
+    """
+    Cache stored in a Redis server.
+
+    Values are JSON-encoded, so they must be JSON-serializable. An optional
+    near-cache tier keeps recently read values in local memory for a short
+    time, avoiding a round trip for hot keys. Values in the near cache may be
+    stale for up to `near_cache_ttl` seconds after another instance updates
+    or clears them.
+
+    Key locks are coordinated between instances using a lease key with an
+    expiry, and waiters are notified through a pub/sub channel when the lease
+    holder releases it.
+    """
+
+    protocol = "redis"
+
+    def __init__(
+        self,
+        connection: str,
+        prefix: str = None,
+        near_cache_ttl: float = None,
+        near_cache_max_entries: int = None,
+        lease_ttl: float = 10.0,
+    ):
+        """
+        Initialize a `RedisCache` instance.
+
+        Args:
+            connection: the Redis connection string, e.g. 'redis://127.0.0.1:6379'
+            prefix: the prefix used to namespace cache keys
+            near_cache_ttl: the lifetime of locally held entries, or `None` to
+                disable the near cache
+            near_cache_max_entries: the maximum number of locally held entries
+            lease_ttl: the maximum number of seconds a key lock is held for
+                other instances
+
+        """
+        super().__init__()
+        self.connection = connection
+        self.prefix = prefix or "acapy"
+        self.redis = None
+        self._connect_lock = None
+        self._near_cache = (
+            InMemoryCache(max_entries=near_cache_max_entries)
+            if near_cache_ttl
+            else None
+        )
+        self._near_cache_ttl = near_cache_ttl
+        self._lease_ttl = lease_ttl
+        self._leases = {}
+        self._subscriber = None
+        self._subscriber_task: asyncio.Task = None
+        self._waiters = {}
+
+    @property
+    def stats(self) -> Mapping[str, int]:
+        """Accessor for near-cache statistics, if enabled."""
+        return self._near_cache.stats if self._near_cache else {}
+
+    def _key(self, key: Text) -> str:
+        """Namespace a cache key."""
+        return f"{self.prefix}.cache.{key}"
+
+    def _lease_key(self, key: Text) -> str:
+        """Derive the key of the lease on a cache key."""
+        return f"{self.prefix}.lease.{key}"
+
+    def _notify_channel(self, key: Text) -> str:
+        """Derive the channel used to announce the release of a lease."""
+        return f"{self.prefix}.notify.{key}"
+
+    async def _connect(self):
+        """Open the connection pool on first use."""
+        if self.redis:
+            return self.redis
+        if not self._connect_lock:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if not self.redis:
+                try:
+                    self.redis = await aioredis.create_redis_pool(
+                        self.connection, minsize=1, maxsize=10
+                    )
+                except (aioredis.RedisError, OSError) as err:
+                    raise CacheError(f"Unable to connect to cache: {err}") from err
+        return self.redis
+
+    async def get(self, key: Text):
+        """
+        Get an item from the cache.
+
+        Args:
+            key: the key to retrieve an item for
+
+        Returns:
+            The record found or `None`
+
+        """
+        return (await self.get_many([key]))[key]
+
+    async def get_many(self, keys: Sequence[Text]) -> Mapping[Text, Any]:
+        """
+        Get several items from the cache in a single round trip.
+
+        Args:
+            keys: the keys to retrieve items for
+
+        Returns:
+            A mapping from each key to the record found or `None`
+
+        """
+        results = {}
+        missing = []
+        for key in keys:
+            found = await self._near_cache.get(key) if self._near_cache else None
+            if found is None:
+                missing.append(key)
+            results[key] = found
+        if missing:
+            redis = await self._connect()
+            try:
+                values = await redis.mget(*(self._key(key) for key in missing))
+            except aioredis.RedisError as err:
+                raise CacheError(f"Unexpected cache client exception: {err}") from err
+            for key, value in zip(missing, values):
+                if value is not None:
+                    value = json.loads(value)
+                    if self._near_cache:
+                        await self._near_cache.set(key, value, self._near_cache_ttl)
+                results[key] = value
+        return results
+
+    async def set(self, keys: Union[Text, Sequence[Text]], value: Any, ttl: int = None):
+        """
+        Add an item to the cache with an optional ttl.
+
+        Multiple keys are written in a single pipelined round trip.
+
+        Args:
+            keys: the key or keys for which to set an item
+            value: the value to store in the cache
+            ttl: number of seconds that the record should persist
+
+        """
+        keys = [keys] if isinstance(keys, Text) else list(keys)
+        data = json.dumps(value)
+        redis = await self._connect()
+        pipe = redis.pipeline()
+        for key in keys:
+            pipe.set(self._key(key), data, pexpire=int(ttl * 1000) if ttl else 0)
+        try:
+            await pipe.execute()
+        except aioredis.RedisError as err:
+            raise CacheError(f"Unexpected cache client exception: {err}") from err
+        if self._near_cache:
+            near_ttl = min(ttl, self._near_cache_ttl) if ttl else self._near_cache_ttl
+            await self._near_cache.set(keys, value, near_ttl)
+
+    async def set_many(self, values: Mapping[Text, Any], ttl: int = None):
+        """
+        Add several items to the cache with an optional ttl.
+
+        All items are written in a single pipelined round trip.
+
+        Args:
+            values: a mapping from each key to the value to store for it
+            ttl: number of seconds that the records should persist
+
+        """
+        redis = await self._connect()
+        pipe = redis.pipeline()
+        for key, value in values.items():
+            pipe.set(
+                self._key(key), json.dumps(value), pexpire=int(ttl * 1000) if ttl else 0
+            )
+        try:
+            await pipe.execute()
+        except aioredis.RedisError as err:
+            raise CacheError(f"Unexpected cache client exception: {err}") from err
+        if self._near_cache:
+            near_ttl = min(ttl, self._near_cache_ttl) if ttl else self._near_cache_ttl
+            await self._near_cache.set_many(values, near_ttl)
+
+    async def clear(self, key: Text):
+        """
+        Remove an item from the cache, if present.
+
+        Args:
+            key: the key to remove
+
+        """
+        if self._near_cache:
+            await self._near_cache.clear(key)
+        redis = await self._connect()
+        try:
+            await redis.delete(self._key(key))
+        except aioredis.RedisError as err:
+            raise CacheError(f"Unexpected cache client exception: {err}") from err
+
+    async def clear_many(self, keys: Sequence[Text]):
+        """
+        Remove several items from the cache, if present.
+
+        Args:
+            keys: the keys to remove
+
+        """
+        if not keys:
+            return
+        if self._near_cache:
+            await self._near_cache.clear_many(keys)
+        redis = await self._connect()
+        try:
+            await redis.delete(*(self._key(key) for key in keys))
+        except aioredis.RedisError as err:
+            raise CacheError(f"Unexpected cache client exception: {err}") from err
+
+    async def flush(self):
+        """Remove all items from the cache."""
+        if self._near_cache:
+            await self._near_cache.flush()
+        redis = await self._connect()
+        try:
+            keys = [key async for key in redis.iscan(match=self._key("*"))]
+            if keys:
+                await redis.delete(*keys)
+        except aioredis.RedisError as err:
+            raise CacheError(f"Unexpected cache client exception: {err}") from err
+
+    async def acquire_lease(self, key: Text) -> bool:
+        """
+        Acquire an exclusive lease to produce the value for a cache key.
+
+        Args:
+            key: the key to lease
+
+        Returns:
+            `False` if the lease is currently held by another instance
+
+        """
+        token = str(uuid4())
+        redis = await self._connect()
+        try:
+            acquired = await redis.set(
+                self._lease_key(key),
+                token,
+                pexpire=int(self._lease_ttl * 1000),
+                exist=redis.SET_IF_NOT_EXIST,
+            )
+        except aioredis.RedisError as err:
+            LOGGER.warning("Unable to acquire cache lease: %s", err)
+            return True
+        if acquired:
+            self._leases[key] = token
+        return acquired
+
+    async def release_lease(self, key: Text):
+        """
+        Release a lease on a cache key, notifying any waiters.
+
+        Args:
+            key: the key to release
+
+        """
+        token = self._leases.pop(key, None)
+        if not token:
+            return
+        redis = await self._connect()
+        lease_key = self._lease_key(key)
+        try:
+            # the lease may have expired and been granted to another instance,
+            # so it is compared and deleted atomically
+            await redis.eval(RELEASE_LEASE_SCRIPT, keys=[lease_key], args=[token])
+            await redis.publish(self._notify_channel(key), token)
+        except aioredis.RedisError as err:
+            LOGGER.warning("Unable to release cache lease: %s", err)
+
+    async def wait_for_lease(self, key: Text):
+        """
+        Wait for the holder of a lease on another instance to produce a value.
+
+        Args:
+            key: the key to wait for
+
+        Returns:
+            The value produced, or `None` if the lease was released or expired
+            without producing one
+
+        """
+        waiter = asyncio.get_event_loop().create_future()
+        self._waiters.setdefault(key, set()).add(waiter)
+        try:
+            await self._subscribe()
+            # the value may have been produced before the subscription was ready
+            found = await self.get(key)
+            if found is None:
+                try:
+                    await asyncio.wait_for(waiter, self._lease_ttl)
+                except asyncio.TimeoutError:
+                    pass
+                found = await self.get(key)
+        except (CacheError, aioredis.RedisError, OSError) as err:
+            LOGGER.warning("Unable to wait for cache lease: %s", err)
+            found = None
+        finally:
+            waiters = self._waiters.get(key)
+            waiters.discard(waiter)
+            if not waiters:
+                del self._waiters[key]
+        return found
+
+    async def _subscribe(self):
+        """Subscribe to lease release notifications on first use."""
+        if self._subscriber:
+            return
+        if not self._connect_lock:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if not self._subscriber:
+                self._subscriber = await aioredis.create_redis(self.connection)
+                (channel,) = await self._subscriber.psubscribe(
+                    self._notify_channel("*")
+                )
+                self._subscriber_task = asyncio.ensure_future(
+                    self._handle_notifications(channel)
+                )
+
+    async def _handle_notifications(self, channel: aioredis.Channel):
+        """Wake local waiters when a lease is released on any instance."""
+        prefix_len = len(self._notify_channel(""))
+        async for name, _ in channel.iter():
+            key = name.decode()[prefix_len:]
+            for waiter in self._waiters.get(key, ()):
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    async def close(self):
+        """Close the connection pool."""
+        if self._subscriber_task:
+            self._subscriber_task.cancel()
+            self._subscriber_task = None
+        if self._subscriber:
+            self._subscriber.close()
+            await self._subscriber.wait_closed()
+            self._subscriber = None
+        if self.redis:
+            self.redis.close()
+            await self.redis.wait_closed()
+            self.redis = None
+
+    def __repr__(self) -> str:
+        """Human readable representation of this instance."""
+        return f"<{self.__class__.__name__} connection={self.connection}>"
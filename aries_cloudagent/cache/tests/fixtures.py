@@ -0,0 +1,133 @@
+import asyncio
+import fnmatch
+import time
+
+from ..redis import RELEASE_LEASE_SCRIPT
+
+
+class StandInRedisServer:
+    """Minimal in-process server speaking enough of the Redis protocol for tests."""
+
+    def __init__(self):
+        self.data = {}
+        self.commands = []
+        self.subscribers = []
+        self.server = None
+        self.port = None
+
+    @property
+    def url(self):
+        return f"redis://127.0.0.1:{self.port}"
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    def _get(self, key):
+        entry = self.data.get(key)
+        if entry and entry[1] is not None and entry[1] <= time.perf_counter():
+            del self.data[key]
+            entry = None
+        return entry[0] if entry else None
+
+    async def _read_command(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        assert line.startswith(b"*")
+        args = []
+        for _ in range(int(line[1:])):
+            size = int((await reader.readline())[1:])
+            args.append((await reader.readexactly(size + 2))[:-2])
+        return args
+
+    def _encode(self, value):
+        if value is None:
+            return b"$-1\r\n"
+        if value is True:
+            return b"+OK\r\n"
+        if isinstance(value, int):
+            return b":%d\r\n" % value
+        if isinstance(value, bytes):
+            return b"$%d\r\n%s\r\n" % (len(value), value)
+        if isinstance(value, list):
+            return b"*%d\r\n" % len(value) + b"".join(self._encode(v) for v in value)
+        raise ValueError(value)
+
+    def _publish(self, channel, message):
+        count = 0
+        for pattern, writer in self.subscribers:
+            if fnmatch.fnmatch(channel.decode(), pattern.decode()):
+                writer.write(self._encode([b"pmessage", pattern, channel, message]))
+                count += 1
+        return count
+
+    def _execute(self, args, writer):
+        cmd = args[0].upper().decode()
+        self.commands.append(cmd)
+        if cmd in ("PING", "SELECT"):
+            return True
+        if cmd == "GET":
+            return self._get(args[1])
+        if cmd == "MGET":
+            return [self._get(key) for key in args[1:]]
+        if cmd == "SET":
+            key, value, opts = args[1], args[2], [a.upper() for a in args[3:]]
+            expires = None
+            if b"PX" in opts:
+                px = int(opts[opts.index(b"PX") + 1])
+                expires = time.perf_counter() + px / 1000
+            if b"NX" in opts and self._get(key) is not None:
+                return None
+            self.data[key] = (value, expires)
+            return True
+        if cmd == "DEL":
+            count = 0
+            for key in args[1:]:
+                if self._get(key) is not None:
+                    del self.data[key]
+                    count += 1
+            return count
+        if cmd == "SCAN":
+            pattern = (
+                args[args.index(b"MATCH") + 1].decode() if b"MATCH" in args else "*"
+            )
+            keys = [
+                key
+                for key in list(self.data)
+                if self._get(key) is not None and fnmatch.fnmatch(key.decode(), pattern)
+            ]
+            return [b"0", keys]
+        if cmd == "EVAL":
+            # only the lease release script is supported
+            assert args[1].decode() == RELEASE_LEASE_SCRIPT
+            key, token = args[3], args[4]
+            if self._get(key) == token:
+                del self.data[key]
+                return 1
+            return 0
+        if cmd == "PSUBSCRIBE":
+            self.subscribers.append((args[1], writer))
+            return [b"psubscribe", args[1], 1]
+        if cmd == "PUBLISH":
+            return self._publish(args[1], args[2])
+        raise ValueError(f"Unsupported command: {cmd}")
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                args = await self._read_command(reader)
+                if args is None:
+                    break
+                writer.write(self._encode(self._execute(args, writer)))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.subscribers = [sub for sub in self.subscribers if sub[1] is not writer]
+            writer.close()
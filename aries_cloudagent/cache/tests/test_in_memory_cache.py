@@ -66,6 +66,77 @@ class TestBasicCache:
             item = await cache.get(key)
             assert item is None
 
+    @pytest.mark.asyncio
+    async def test_set_expires_overwrite(self, cache):
+        await cache.set("key", "value", 0.05)
+        await cache.set("key", "newval")
+        await sleep(0.05)
+        assert await cache.get("key") == "newval"
+        assert cache.stats["expirations"] == 0
+
+    @pytest.mark.asyncio
+    async def test_max_entries_lru(self):
+        cache = InMemoryCache(max_entries=3)
+        await cache.set([f"key{i}" for i in range(3)], "value")
+        assert await cache.get("key0") == "value"  # now most recently used
+        await cache.set("key3", "value")
+        assert await cache.get("key1") is None
+        for key in ("key0", "key2", "key3"):
+            assert await cache.get(key) == "value"
+        assert cache.stats["evictions"] == 1
+        assert cache.stats["entries"] == 3
+
+    @pytest.mark.asyncio
+    async def test_max_bytes(self):
+        cache = InMemoryCache(max_bytes=4096)
+        for i in range(16):
+            await cache.set(f"key{i}", "x" * 1000)
+        assert 0 < cache.stats["bytes"] <= 4096
+        assert cache.stats["evictions"] > 0
+        assert await cache.get("key15") == "x" * 1000
+        assert await cache.get("key0") is None
+
+        await cache.clear("key15")
+        await cache.flush()
+        assert cache.stats["bytes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_stats(self, cache):
+        await cache.get("valid key")
+        await cache.get("no such key")
+        await cache.set("key", "value", 0.01)
+        await sleep(0.02)
+        await cache.get("key")
+        stats = cache.stats
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+        assert stats["expirations"] == 1
+        assert stats["entries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_expiry_heap_compacted(self, cache):
+        for _ in range(200):
+            await cache.set("key", "value", 60)
+        assert len(cache._expiry) <= 2 * len(cache._cache) + 65
+
+    @pytest.mark.asyncio
+    async def test_get_set_clear_many(self, cache):
+        await cache.set_many({"key0": "value0", "key1": "value1"}, 0.05)
+        assert await cache.get_many(["valid key", "key0", "key1", "key2"]) == {
+            "valid key": "value",
+            "key0": "value0",
+            "key1": "value1",
+            "key2": None,
+        }
+        await cache.clear_many(["key0", "valid key"])
+        assert await cache.get_many(["valid key", "key0", "key1"]) == {
+            "valid key": None,
+            "key0": None,
+            "key1": "value1",
+        }
+        await sleep(0.05)
+        assert await cache.get("key1") is None
+
     @pytest.mark.asyncio
     async def test_flush(self, cache):
         await cache.flush()
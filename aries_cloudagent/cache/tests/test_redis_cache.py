@@ -0,0 +1,180 @@
+from asyncio import gather, sleep
+import pytest
+
+from aioredis import RedisError
+from asynctest import mock as async_mock
+
+from ..base import CacheError
+from ..redis import RedisCache
+from .fixtures import StandInRedisServer
+
+
+@pytest.fixture()
+async def server():
+    server = await StandInRedisServer().start()
+    yield server
+    await server.stop()
+
+
+@pytest.fixture()
+async def cache(server):
+    cache = RedisCache(server.url, prefix="test")
+    yield cache
+    await cache.close()
+
+
+class TestRedisCache:
+    @pytest.mark.asyncio
+    async def test_get_none(self, cache):
+        assert await cache.get("doesn't exist") is None
+
+    @pytest.mark.asyncio
+    async def test_set_get(self, cache, server):
+        await cache.set("key", {"dictkey": "dval"})
+        assert await cache.get("key") == {"dictkey": "dval"}
+        assert server._get(b"test.cache.key") == b'{"dictkey": "dval"}'
+
+    @pytest.mark.asyncio
+    async def test_set_multi_pipelined(self, cache, server):
+        await cache.set([f"key{i}" for i in range(4)], "value")
+        assert server.commands.count("SET") == 4
+        results = await cache.get_many([f"key{i}" for i in range(5)])
+        assert results == {**{f"key{i}": "value" for i in range(4)}, "key4": None}
+        assert server.commands.count("MGET") == 1
+
+    @pytest.mark.asyncio
+    async def test_set_clear_many(self, cache, server):
+        await cache.set_many({"key0": "value0", "key1": {"a": 1}})
+        assert server.commands.count("SET") == 2
+        assert await cache.get_many(["key0", "key1"]) == {
+            "key0": "value0",
+            "key1": {"a": 1},
+        }
+        await cache.clear_many(["key0", "key1"])
+        await cache.clear_many([])
+        assert server.commands.count("DEL") == 1
+        assert await cache.get_many(["key0", "key1"]) == {"key0": None, "key1": None}
+
+    @pytest.mark.asyncio
+    async def test_set_expires(self, cache):
+        await cache.set("key", "value", 0.05)
+        assert await cache.get("key") == "value"
+        await sleep(0.06)
+        assert await cache.get("key") is None
+
+    @pytest.mark.asyncio
+    async def test_clear_flush(self, cache, server):
+        await cache.set(["key", "other"], "value")
+        await cache.clear("key")
+        assert await cache.get("key") is None
+        assert await cache.get("other") == "value"
+        server.data[b"unrelated"] = (b"value", None)
+        await cache.flush()
+        assert await cache.get("other") is None
+        assert b"unrelated" in server.data
+
+    @pytest.mark.asyncio
+    async def test_shared_between_instances(self, cache, server):
+        other = RedisCache(server.url, prefix="test")
+        await cache.set("key", "value")
+        assert await other.get("key") == "value"
+        await other.close()
+
+    @pytest.mark.asyncio
+    async def test_near_cache(self, server):
+        cache = RedisCache(server.url, prefix="test", near_cache_ttl=60)
+        await cache.set("key", "value")
+        server.commands.clear()
+        assert await cache.get("key") == "value"
+        assert "MGET" not in server.commands
+        assert cache.stats["hits"] == 1
+
+        await cache.clear("key")
+        assert await cache.get("key") is None
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_acquire(self, cache):
+        async with cache.acquire("key") as entry:
+            assert not entry.done
+            await entry.set_result("value")
+        assert await cache.get("key") == "value"
+        async with cache.acquire("key") as entry:
+            assert entry.result == "value"
+
+    @pytest.mark.asyncio
+    async def test_connect_error(self):
+        cache = RedisCache("redis://127.0.0.1:1")
+        with pytest.raises(CacheError):
+            await cache.get("key")
+
+    @pytest.mark.asyncio
+    async def test_client_error(self, cache):
+        await cache.get("key")
+        with async_mock.patch.object(
+            cache.redis, "mget", async_mock.CoroutineMock()
+        ) as mock_mget:
+            mock_mget.side_effect = RedisError("bad")
+            with pytest.raises(CacheError):
+                await cache.get("key")
+
+    @pytest.mark.asyncio
+    async def test_repr(self, cache):
+        assert cache.connection in repr(cache)
+
+    @pytest.mark.asyncio
+    async def test_lease_single_flight(self, cache, server):
+        other = RedisCache(server.url, prefix="test")
+        calls = []
+
+        async def produce(instance, delay):
+            async with instance.acquire("key") as entry:
+                if not entry.done:
+                    calls.append(instance)
+                    await sleep(delay)
+                    await entry.set_result("value")
+            return entry.result
+
+        results = await gather(produce(cache, 0.1), produce(other, 0))
+        assert results == ["value", "value"]
+        assert calls == [cache]
+        assert not cache._leases and not other._waiters
+        assert cache._lease_key("key").encode() not in server.data
+        await other.close()
+
+    @pytest.mark.asyncio
+    async def test_lease_released_without_value(self, cache, server):
+        other = RedisCache(server.url, prefix="test")
+        assert await cache.acquire_lease("key")
+        assert not await other.acquire_lease("key")
+
+        async def release():
+            await sleep(0.05)
+            await cache.release_lease("key")
+
+        results = await gather(other.wait_for_lease("key"), release())
+        assert results[0] is None
+        assert await other.acquire_lease("key")
+        await other.close()
+
+    @pytest.mark.asyncio
+    async def test_lease_expired(self, server):
+        cache = RedisCache(server.url, prefix="test", lease_ttl=0.05)
+        other = RedisCache(server.url, prefix="test", lease_ttl=0.05)
+        assert await cache.acquire_lease("key")
+        assert await other.wait_for_lease("key") is None
+        assert await other.acquire_lease("key")
+        await cache.release_lease("key")  # lease now held by other
+        assert other._lease_key("key").encode() in server.data
+        assert "EVAL" in server.commands and "GET" not in server.commands
+        await cache.close()
+        await other.close()
+
+    @pytest.mark.asyncio
+    async def test_lease_client_error(self, cache):
+        await cache.get("key")
+        with async_mock.patch.object(
+            cache.redis, "set", async_mock.CoroutineMock()
+        ) as mock_set:
+            mock_set.side_effect = RedisError("bad")
+            assert await cache.acquire_lease("key")
@@ -8,6 +8,7 @@ from typing import Type
 
 from .error import ArgsParseError
 from .util import BoundedInt, ByteSize
+from ..utils.json_codec import JSON_CODECS, json_codec_available
 from ..utils.tracing import trace_event
 
 CAT_PROVISION = "general"
@@ -148,6 +149,52 @@ class AdminGroup(ArgumentGroup):
             and respond to those events using the admin API. If not specified, \
             webhooks are not published by the agent.",
         )
+        parser.add_argument(
+            "--webhook-topic-filter",
+            action="append",
+            nargs="+",
+            metavar=("<url#api_key>", "<topic>"),
+            env_var="ACAPY_WEBHOOK_TOPIC_FILTER",
+            help="Only send webhooks with the given topics to a webhook URL, as\
+            specified with --webhook-url. May be specified once per URL. Records\
+            are not serialized for webhooks when no target receives the topic.",
+        )
+        parser.add_argument(
+            "--webhook-compact-topics",
+            nargs="+",
+            metavar="<topic>",
+            env_var="ACAPY_WEBHOOK_COMPACT_TOPICS",
+            help="Send only the tags, identifier, state and update time of\
+            records in webhooks with these topics, instead of the full records.",
+        )
+        parser.add_argument(
+            "--webhook-batch-url",
+            action="append",
+            metavar="<url#api_key>",
+            env_var="ACAPY_WEBHOOK_BATCH_URL",
+            help="Send webhooks to the specified URL like --webhook-url, but post\
+            the queued events together as a JSON array of topic and payload\
+            objects to <url>/batch/. Enables the webhook dispatcher.",
+        )
+        parser.add_argument(
+            "--webhook-concurrency",
+            type=BoundedInt(min=1),
+            metavar="<count>",
+            env_var="ACAPY_WEBHOOK_CONCURRENCY",
+            help="Deliver webhooks with a dedicated dispatcher, separately from\
+            agent messages, with at most this many concurrent requests to each\
+            webhook URL. Default: 4 when --webhook-batch-url is set, otherwise\
+            webhooks are delivered by the outbound transports.",
+        )
+        parser.add_argument(
+            "--webhook-queue-limit",
+            type=BoundedInt(min=1),
+            metavar="<count>",
+            env_var="ACAPY_WEBHOOK_QUEUE_LIMIT",
+            help="Set the maximum number of webhook events queued for each\
+            webhook URL by the webhook dispatcher. The oldest events are dropped\
+            when the queue is full. Default: 10000.",
+        )
 
     def get_settings(self, args: Namespace):
         """Extract admin settings."""
@@ -178,7 +225,106 @@ class AdminGroup(ArgumentGroup):
             hook_url = environ.get("WEBHOOK_URL")
             if hook_url:
                 hook_urls.append(hook_url)
+            if args.webhook_batch_url:
+                batch_urls = list(args.webhook_batch_url)
+                hook_urls.extend(url for url in batch_urls if url not in hook_urls)
+                settings["admin.webhook_batch_urls"] = batch_urls
             settings["admin.webhook_urls"] = hook_urls
+            if args.webhook_topic_filter:
+                topic_filters = {}
+                for url, *topics in args.webhook_topic_filter:
+                    if url not in hook_urls:
+                        raise ArgsParseError(
+                            f"Webhook topic filter for unknown webhook URL: {url}"
+                        )
+                    if not topics:
+                        raise ArgsParseError(
+                            f"Webhook topic filter for {url} requires a topic"
+                        )
+                    topic_filters[url] = topics
+                settings["admin.webhook_topic_filters"] = topic_filters
+            if args.webhook_compact_topics:
+                settings["admin.webhook_compact_topics"] = args.webhook_compact_topics
+            if args.webhook_concurrency:
+                settings["admin.webhook_concurrency"] = args.webhook_concurrency
+            elif args.webhook_batch_url:
+                settings["admin.webhook_concurrency"] = 4
+            if args.webhook_queue_limit:
+                settings["admin.webhook_queue_limit"] = args.webhook_queue_limit
+        return settings
+
+
+@group(CAT_START)
+class CacheGroup(ArgumentGroup):
+    """Cache settings."""
+
+    GROUP_NAME = "Cache"
+
+    def add_arguments(self, parser: ArgumentParser):
+        """Add cache-specific command line arguments to the parser."""
+        parser.add_argument(
+            "--cache-max-entries",
+            type=BoundedInt(min=1),
+            metavar="<count>",
+            env_var="ACAPY_CACHE_MAX_ENTRIES",
+            help="Set the maximum number of entries held by the in-memory cache.\
+            The least recently used entries are evicted beyond this limit.\
+            Default: unbounded.",
+        )
+        parser.add_argument(
+            "--cache-max-bytes",
+            type=ByteSize(min=1024),
+            metavar="<size>",
+            env_var="ACAPY_CACHE_MAX_BYTES",
+            help="Set the maximum estimated size in bytes of the values held by the\
+            in-memory cache. The least recently used entries are evicted beyond\
+            this limit. Default: unbounded.",
+        )
+        parser.add_argument(
+            "--cache-url",
+            type=str,
+            metavar="<cache-url>",
+            env_var="ACAPY_CACHE_URL",
+            help="Use a shared cache server instead of the in-memory cache, so that\
+            cached lookups are reused by all agent instances connected to it.\
+            For example, 'redis://127.0.0.1:6379'.",
+        )
+        parser.add_argument(
+            "--cache-prefix",
+            type=str,
+            metavar="<prefix>",
+            env_var="ACAPY_CACHE_PREFIX",
+            help="Set the prefix used to namespace keys on the shared cache server.\
+            Default: 'acapy'.",
+        )
+        parser.add_argument(
+            "--cache-near-ttl",
+            default=5,
+            type=BoundedInt(min=0),
+            metavar="<seconds>",
+            env_var="ACAPY_CACHE_NEAR_TTL",
+            help="Set how many seconds values read from the shared cache server are\
+            also held in local memory. Locally held values may be stale for up to\
+            this long after another instance updates them. Set to 0 to disable.\
+            Default: 5.",
+        )
+
+    def get_settings(self, args: Namespace) -> dict:
+        """Extract cache settings."""
+        settings = {}
+        if args.cache_url:
+            if not args.cache_url.startswith("redis://"):
+                raise ArgsParseError(
+                    "Parameter --cache-url must be of the form 'redis://host:port'"
+                )
+            settings["cache.url"] = args.cache_url
+            if args.cache_prefix:
+                settings["cache.prefix"] = args.cache_prefix
+            settings["cache.near_ttl"] = args.cache_near_ttl
+        if args.cache_max_entries:
+            settings["cache.max_entries"] = args.cache_max_entries
+        if args.cache_max_bytes:
+            settings["cache.max_bytes"] = args.cache_max_bytes
         return settings
 
 
@@ -943,6 +1089,87 @@ class TransportGroup(ArgumentGroup):
             messages. Increasing this number might cause to increase the\
             accumulated messages in message queue. Default value is 4.",
         )
+        parser.add_argument(
+            "--outbound-endpoint-concurrency",
+            type=BoundedInt(min=1),
+            metavar="<count>",
+            env_var="ACAPY_OUTBOUND_ENDPOINT_CONCURRENCY",
+            help="Set the maximum number of concurrent deliveries to a single\
+            outbound endpoint, so that a slow endpoint cannot hold up deliveries\
+            to other agents. Default: 10.",
+        )
+        parser.add_argument(
+            "--outbound-http-limit",
+            type=BoundedInt(min=1),
+            metavar="<count>",
+            env_var="ACAPY_OUTBOUND_HTTP_LIMIT",
+            help="Set the maximum number of open outbound HTTP connections.\
+            Default: 200.",
+        )
+        parser.add_argument(
+            "--outbound-http-limit-per-host",
+            type=BoundedInt(min=1),
+            metavar="<count>",
+            env_var="ACAPY_OUTBOUND_HTTP_LIMIT_PER_HOST",
+            help="Set the maximum number of open outbound HTTP connections to a\
+            single endpoint. Default: 50.",
+        )
+        parser.add_argument(
+            "--outbound-http-keepalive",
+            type=BoundedInt(min=1),
+            metavar="<seconds>",
+            env_var="ACAPY_OUTBOUND_HTTP_KEEPALIVE",
+            help="Set the number of seconds to keep idle outbound HTTP\
+            connections open for reuse. Default: 15.",
+        )
+        parser.add_argument(
+            "--outbound-ws-heartbeat",
+            type=BoundedInt(min=1),
+            metavar="<seconds>",
+            env_var="ACAPY_OUTBOUND_WS_HEARTBEAT",
+            help="Set the interval between pings on open outbound websocket\
+            connections. Default: 30.",
+        )
+        parser.add_argument(
+            "--outbound-ws-idle-timeout",
+            type=BoundedInt(min=1),
+            metavar="<seconds>",
+            env_var="ACAPY_OUTBOUND_WS_IDLE_TIMEOUT",
+            help="Close outbound websocket connections which have not been used\
+            for this many seconds. Default: 300.",
+        )
+        parser.add_argument(
+            "--outbound-journal",
+            type=str,
+            metavar="<path>",
+            env_var="ACAPY_OUTBOUND_JOURNAL",
+            help="Record outbound messages pending delivery in a journal file at\
+            this path, so that messages not yet delivered when the agent stops\
+            are delivered after it restarts. Not supported together with\
+            --outbound-queue.",
+        )
+        parser.add_argument(
+            "--crypto-workers",
+            type=BoundedInt(min=1),
+            env_var="ACAPY_CRYPTO_WORKERS",
+            help="Pack and unpack messages for keys held in memory using a pool\
+            of this many workers, instead of the default executor.",
+        )
+        parser.add_argument(
+            "--crypto-worker-processes",
+            action="store_true",
+            env_var="ACAPY_CRYPTO_WORKER_PROCESSES",
+            help="Run the crypto workers in separate processes, so that message\
+            packing and unpacking can use multiple cores. Requires --crypto-workers.",
+        )
+        parser.add_argument(
+            "--json-codec",
+            choices=JSON_CODECS,
+            env_var="ACAPY_JSON_CODEC",
+            help="Specifies the JSON decoder used to parse inbound messages.\
+            The 'orjson' decoder is faster but requires the orjson package to\
+            be installed. Default: json.",
+        )
 
     def get_settings(self, args: Namespace):
         """Extract transport settings."""
@@ -982,6 +1209,43 @@ class TransportGroup(ArgumentGroup):
             settings["transport.max_message_size"] = args.max_message_size
         if args.max_outbound_retry:
             settings["transport.max_outbound_retry"] = args.max_outbound_retry
+        if args.outbound_endpoint_concurrency:
+            settings[
+                "transport.endpoint_max_active"
+            ] = args.outbound_endpoint_concurrency
+        if args.outbound_http_limit:
+            settings["transport.http_limit"] = args.outbound_http_limit
+        if args.outbound_http_limit_per_host:
+            settings[
+                "transport.http_limit_per_host"
+            ] = args.outbound_http_limit_per_host
+        if args.outbound_http_keepalive:
+            settings["transport.http_keepalive_timeout"] = args.outbound_http_keepalive
+        if args.outbound_ws_heartbeat:
+            settings["transport.ws_heartbeat"] = args.outbound_ws_heartbeat
+        if args.outbound_ws_idle_timeout:
+            settings["transport.ws_idle_timeout"] = args.outbound_ws_idle_timeout
+        if args.outbound_journal:
+            if args.outbound_queue:
+                raise ArgsParseError(
+                    "--outbound-journal and -oq/--outbound-queue are "
+                    "not allowed together"
+                )
+            settings["transport.outbound_journal"] = args.outbound_journal
+        if args.crypto_workers:
+            settings["transport.crypto_workers"] = args.crypto_workers
+            settings["transport.crypto_worker_processes"] = bool(
+                args.crypto_worker_processes
+            )
+        elif args.crypto_worker_processes:
+            raise ArgsParseError("--crypto-worker-processes requires --crypto-workers")
+        if args.json_codec:
+            if not json_codec_available(args.json_codec):
+                raise ArgsParseError(
+                    f"JSON codec '{args.json_codec}' is not available: "
+                    "its package is not installed"
+                )
+            settings["transport.json_codec"] = args.json_codec
 
         return settings
 
@@ -1240,6 +1504,41 @@ class MultitenantGroup(ArgumentGroup):
             env_var="ACAPY_MULTITENANT_ADMIN",
             help="Specify whether to enable the multitenant admin api.",
         )
+        parser.add_argument(
+            "--multitenant-max-profiles",
+            type=BoundedInt(min=1),
+            metavar="<count>",
+            env_var="ACAPY_MULTITENANT_MAX_PROFILES",
+            help="Specify the maximum number of subwallet profiles kept open.\
+            The least recently used profiles not in use are closed when the\
+            limit is exceeded. Default: no limit.",
+        )
+        parser.add_argument(
+            "--multitenant-profile-idle-timeout",
+            type=BoundedInt(min=1),
+            metavar="<seconds>",
+            env_var="ACAPY_MULTITENANT_PROFILE_IDLE_TIMEOUT",
+            help="Close subwallet profiles which have not been used for this\
+            number of seconds. Default: profiles are not closed when idle.",
+        )
+        parser.add_argument(
+            "--multitenant-prewarm",
+            type=str,
+            nargs="+",
+            metavar="<wallet_id>",
+            env_var="ACAPY_MULTITENANT_PREWARM",
+            help="Open the profiles of the specified subwallets at startup, so\
+            that the first messages for these tenants are not delayed by opening\
+            their wallets. Unmanaged wallets are skipped.",
+        )
+        parser.add_argument(
+            "--multitenant-prewarm-concurrency",
+            type=BoundedInt(min=1),
+            metavar="<count>",
+            env_var="ACAPY_MULTITENANT_PREWARM_CONCURRENCY",
+            help="Specify the maximum number of subwallets opened in parallel\
+            when pre-warming. Default: 10.",
+        )
 
     def get_settings(self, args: Namespace):
         """Extract multitenant settings."""
@@ -1256,4 +1555,16 @@ class MultitenantGroup(ArgumentGroup):
 
             if args.multitenant_admin:
                 settings["multitenant.admin_enabled"] = True
+            if args.multitenant_max_profiles:
+                settings["multitenant.profile_capacity"] = args.multitenant_max_profiles
+            if args.multitenant_profile_idle_timeout:
+                settings[
+                    "multitenant.profile_idle_timeout"
+                ] = args.multitenant_profile_idle_timeout
+            if args.multitenant_prewarm:
+                settings["multitenant.prewarm_wallets"] = args.multitenant_prewarm
+            if args.multitenant_prewarm_concurrency:
+                settings[
+                    "multitenant.prewarm_concurrency"
+                ] = args.multitenant_prewarm_concurrency
         return settings
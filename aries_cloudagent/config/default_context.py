@@ -6,6 +6,7 @@ from .provider import CachedProvider, ClassProvider
 
 from ..cache.base import BaseCache
 from ..cache.in_memory import InMemoryCache
+from ..cache.redis import RedisCache
 from ..core.plugin_registry import PluginRegistry
 from ..core.profile import ProfileManager, ProfileManagerProvider
 from ..core.protocol_registry import ProtocolRegistry
@@ -20,6 +21,7 @@ from ..protocols.introduction.v0_1.demo_service import DemoIntroductionService
 
 from ..transport.wire_format import BaseWireFormat
 from ..utils.stats import Collector
+from ..wallet.crypto_pool import CryptoWorkerPool
 
 
 class DefaultContextBuilder(ContextBuilder):
@@ -35,8 +37,29 @@ class DefaultContextBuilder(ContextBuilder):
             collector = Collector(log_path=timing_log)
             context.injector.bind_instance(Collector, collector)
 
-        # Shared in-memory cache
-        context.injector.bind_instance(BaseCache, InMemoryCache())
+        # Shared cache: networked when configured, otherwise in-memory
+        if context.settings.get("cache.url"):
+            cache = RedisCache(
+                context.settings["cache.url"],
+                prefix=context.settings.get("cache.prefix"),
+                near_cache_ttl=context.settings.get("cache.near_ttl"),
+                near_cache_max_entries=context.settings.get("cache.max_entries"),
+            )
+        else:
+            cache = InMemoryCache(
+                max_entries=context.settings.get("cache.max_entries"),
+                max_bytes=context.settings.get("cache.max_bytes"),
+            )
+        context.injector.bind_instance(BaseCache, cache)
+
+        if context.settings.get("transport.crypto_workers"):
+            context.injector.bind_instance(
+                CryptoWorkerPool,
+                CryptoWorkerPool(
+                    context.settings["transport.crypto_workers"],
+                    context.settings.get("transport.crypto_worker_processes", False),
+                ),
+            )
 
         # Global protocol registry
         context.injector.bind_instance(ProtocolRegistry, ProtocolRegistry())
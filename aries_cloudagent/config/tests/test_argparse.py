@@ -52,6 +52,194 @@ class TestArgParse(AsyncTestCase):
         assert settings.get("transport.inbound_configs") == [["http", "0.0.0.0", "80"]]
         assert settings.get("transport.outbound_configs") == ["http"]
         assert result.max_outbound_retry == 5
+        assert "transport.crypto_workers" not in settings
+
+    async def test_crypto_worker_settings(self):
+        """Test crypto worker pool argument parsing."""
+        parser = argparse.create_argument_parser()
+        group = argparse.TransportGroup()
+        group.add_arguments(parser)
+        base_args = ["--inbound-transport", "http", "0.0.0.0", "80", "-ot", "http"]
+
+        result = parser.parse_args(
+            base_args + ["--crypto-workers", "4", "--crypto-worker-processes"]
+        )
+        settings = group.get_settings(result)
+        assert settings.get("transport.crypto_workers") == 4
+        assert settings.get("transport.crypto_worker_processes") is True
+
+        result = parser.parse_args(base_args + ["--crypto-worker-processes"])
+        with self.assertRaises(argparse.ArgsParseError):
+            group.get_settings(result)
+
+    async def test_multitenant_profile_settings(self):
+        """Test multitenant profile pool argument parsing."""
+        parser = argparse.create_argument_parser()
+        group = argparse.MultitenantGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args(
+            [
+                "--multitenant",
+                "--jwt-secret",
+                "secret",
+                "--multitenant-max-profiles",
+                "100",
+                "--multitenant-profile-idle-timeout",
+                "600",
+                "--multitenant-prewarm",
+                "wallet-1",
+                "wallet-2",
+                "--multitenant-prewarm-concurrency",
+                "4",
+            ]
+        )
+        settings = group.get_settings(result)
+        assert settings.get("multitenant.prewarm_wallets") == ["wallet-1", "wallet-2"]
+        assert settings.get("multitenant.prewarm_concurrency") == 4
+        assert settings.get("multitenant.profile_capacity") == 100
+        assert settings.get("multitenant.profile_idle_timeout") == 600
+
+    async def test_json_codec_settings(self):
+        """Test JSON codec argument parsing."""
+        parser = argparse.create_argument_parser()
+        group = argparse.TransportGroup()
+        group.add_arguments(parser)
+        base_args = ["--inbound-transport", "http", "0.0.0.0", "80", "-ot", "http"]
+
+        result = parser.parse_args(base_args + ["--json-codec", "json"])
+        settings = group.get_settings(result)
+        assert settings.get("transport.json_codec") == "json"
+
+        result = parser.parse_args(base_args + ["--json-codec", "orjson"])
+        with async_mock.patch.object(
+            argparse, "json_codec_available", return_value=False
+        ):
+            with self.assertRaises(argparse.ArgsParseError):
+                group.get_settings(result)
+
+    async def test_outbound_journal_settings(self):
+        """Test outbound journal argument parsing."""
+        parser = argparse.create_argument_parser()
+        group = argparse.TransportGroup()
+        group.add_arguments(parser)
+        base_args = ["--inbound-transport", "http", "0.0.0.0", "80"]
+
+        result = parser.parse_args(
+            base_args + ["-ot", "http", "--outbound-journal", "outbound.log"]
+        )
+        settings = group.get_settings(result)
+        assert settings.get("transport.outbound_journal") == "outbound.log"
+        assert "transport.endpoint_max_active" not in settings
+
+        result = parser.parse_args(
+            base_args + ["-ot", "http", "--outbound-endpoint-concurrency", "3"]
+        )
+        settings = group.get_settings(result)
+        assert settings.get("transport.endpoint_max_active") == 3
+
+        result = parser.parse_args(
+            base_args + ["-oq", "redis://", "--outbound-journal", "outbound.log"]
+        )
+        with self.assertRaises(argparse.ArgsParseError):
+            group.get_settings(result)
+
+    async def test_outbound_connection_settings(self):
+        """Test outbound connection argument parsing."""
+        parser = argparse.create_argument_parser()
+        group = argparse.TransportGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args(
+            [
+                "--inbound-transport",
+                "http",
+                "0.0.0.0",
+                "80",
+                "-ot",
+                "http",
+                "--outbound-http-limit",
+                "500",
+                "--outbound-http-limit-per-host",
+                "20",
+                "--outbound-http-keepalive",
+                "30",
+                "--outbound-ws-heartbeat",
+                "10",
+                "--outbound-ws-idle-timeout",
+                "60",
+            ]
+        )
+        settings = group.get_settings(result)
+        assert settings.get("transport.http_limit") == 500
+        assert settings.get("transport.http_limit_per_host") == 20
+        assert settings.get("transport.http_keepalive_timeout") == 30
+        assert settings.get("transport.ws_heartbeat") == 10
+        assert settings.get("transport.ws_idle_timeout") == 60
+
+    async def test_webhook_dispatcher_settings(self):
+        """Test webhook dispatcher argument parsing."""
+        parser = argparse.create_argument_parser()
+        group = argparse.AdminGroup()
+        group.add_arguments(parser)
+        base_args = ["--admin", "0.0.0.0", "80", "--admin-insecure-mode"]
+
+        result = parser.parse_args(
+            base_args
+            + ["--webhook-url", "http://hooks", "--webhook-batch-url", "http://batch#k"]
+        )
+        settings = group.get_settings(result)
+        assert settings.get("admin.webhook_urls") == ["http://hooks", "http://batch#k"]
+        assert settings.get("admin.webhook_batch_urls") == ["http://batch#k"]
+        assert settings.get("admin.webhook_concurrency") == 4
+
+        result = parser.parse_args(
+            base_args + ["--webhook-concurrency", "8", "--webhook-queue-limit", "100"]
+        )
+        settings = group.get_settings(result)
+        assert settings.get("admin.webhook_concurrency") == 8
+        assert settings.get("admin.webhook_queue_limit") == 100
+        assert "admin.webhook_batch_urls" not in settings
+
+    async def test_webhook_topic_settings(self):
+        """Test webhook topic filter argument parsing."""
+        parser = argparse.create_argument_parser()
+        group = argparse.AdminGroup()
+        group.add_arguments(parser)
+        base_args = ["--admin", "0.0.0.0", "80", "--admin-insecure-mode"]
+
+        result = parser.parse_args(
+            base_args
+            + [
+                "--webhook-url",
+                "http://hooks",
+                "--webhook-topic-filter",
+                "http://hooks",
+                "connections",
+                "present_proof",
+                "--webhook-compact-topics",
+                "issue_credential",
+            ]
+        )
+        settings = group.get_settings(result)
+        assert settings.get("admin.webhook_topic_filters") == {
+            "http://hooks": ["connections", "present_proof"]
+        }
+        assert settings.get("admin.webhook_compact_topics") == ["issue_credential"]
+
+        result = parser.parse_args(
+            base_args + ["--webhook-topic-filter", "http://other", "connections"]
+        )
+        with self.assertRaises(argparse.ArgsParseError):
+            group.get_settings(result)
+
+        result = parser.parse_args(
+            base_args
+            + ["--webhook-url", "http://hooks"]
+            + ["--webhook-topic-filter", "http://hooks"]
+        )
+        with self.assertRaises(argparse.ArgsParseError):
+            group.get_settings(result)
 
     async def test_outbound_is_required(self):
         """Test that either -ot or -oq are required"""
@@ -147,6 +335,35 @@ class TestArgParse(AsyncTestCase):
             settings.get("transport.outbound_queue_class"), "mymodule:MyClass"
         )
 
+    async def test_cache_settings(self):
+        """Test cache bound argument parsing."""
+        parser = argparse.create_argument_parser()
+        group = argparse.CacheGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args(
+            ["--cache-max-entries", "1000", "--cache-max-bytes", "16m"]
+        )
+        settings = group.get_settings(result)
+
+        assert settings.get("cache.max_entries") == 1000
+        assert settings.get("cache.max_bytes") == 16 * 1024 * 1024
+
+        settings = group.get_settings(parser.parse_args([]))
+        assert settings == {}
+
+        result = parser.parse_args(
+            ["--cache-url", "redis://127.0.0.1:6379", "--cache-prefix", "agent"]
+        )
+        settings = group.get_settings(result)
+        assert settings.get("cache.url") == "redis://127.0.0.1:6379"
+        assert settings.get("cache.prefix") == "agent"
+        assert settings.get("cache.near_ttl") == 5
+
+        result = parser.parse_args(["--cache-url", "memcached://127.0.0.1:11211"])
+        with self.assertRaises(argparse.ArgsParseError):
+            group.get_settings(result)
+
     async def test_general_settings_file(self):
         """Test file argument parsing."""
 
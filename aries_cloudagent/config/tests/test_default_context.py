@@ -3,9 +3,12 @@ from tempfile import NamedTemporaryFile
 from asynctest import TestCase as AsyncTestCase
 
 from ...cache.base import BaseCache
+from ...cache.in_memory import InMemoryCache
+from ...cache.redis import RedisCache
 from ...core.profile import ProfileManager
 from ...core.protocol_registry import ProtocolRegistry
 from ...transport.wire_format import BaseWireFormat
+from ...wallet.crypto_pool import CryptoWorkerPool
 
 from ..default_context import DefaultContextBuilder
 from ..injection_context import InjectionContext
@@ -26,6 +29,7 @@ class TestDefaultContext(AsyncTestCase):
             ProtocolRegistry,
         ):
             assert isinstance(result.inject(cls), cls)
+        assert isinstance(result.inject(BaseCache), InMemoryCache)
 
         builder = DefaultContextBuilder(
             settings={
@@ -36,3 +40,30 @@ class TestDefaultContext(AsyncTestCase):
         )
         result = await builder.build_context()
         assert isinstance(result, InjectionContext)
+
+    async def test_build_context_shared_cache(self):
+        """Test context init with a shared cache server."""
+
+        builder = DefaultContextBuilder(
+            settings={"cache.url": "redis://127.0.0.1:6379", "cache.near_ttl": 5}
+        )
+        result = await builder.build_context()
+        assert isinstance(result.inject(BaseCache), RedisCache)
+
+    async def test_build_context_crypto_pool(self):
+        """Test context init with a crypto worker pool."""
+
+        builder = DefaultContextBuilder()
+        result = await builder.build_context()
+        assert result.inject(CryptoWorkerPool, required=False) is None
+
+        builder = DefaultContextBuilder(
+            settings={
+                "transport.crypto_workers": 2,
+                "transport.crypto_worker_processes": True,
+            }
+        )
+        result = await builder.build_context()
+        pool = result.inject(CryptoWorkerPool)
+        assert pool.max_workers == 2
+        assert pool.use_processes
@@ -12,8 +12,12 @@ import hashlib
 import json
 import logging
 
+from typing import Callable, Optional
+
 from ..admin.base_server import BaseAdminServer
 from ..admin.server import AdminResponder, AdminServer
+from ..admin.webhooks import WebhookDispatcher
+from ..cache.base import BaseCache
 from ..config.default_context import ContextBuilder
 from ..config.injection_context import InjectionContext
 from ..config.ledger import get_genesis_transactions, ledger_config
@@ -45,6 +49,7 @@ from ..transport.wire_format import BaseWireFormat
 from ..utils.stats import Collector
 from ..utils.task_queue import CompletedTask, TaskQueue
 from ..wallet.base import DIDInfo
+from ..wallet.crypto_pool import CryptoWorkerPool
 from .dispatcher import Dispatcher
 
 LOGGER = logging.getLogger(__name__)
@@ -76,6 +81,7 @@ class Conductor:
         self.root_profile: Profile = None
         self.setup_public_did: DIDInfo = None
         self.outbound_queue: BaseOutboundQueue = None
+        self.webhook_dispatcher: WebhookDispatcher = None
 
     @property
     def context(self) -> InjectionContext:
@@ -108,10 +114,18 @@ class Conductor:
 
         # Register all outbound transports
         self.outbound_transport_manager = OutboundTransportManager(
-            context, self.handle_not_delivered
+            context, self.handle_not_delivered, self.root_profile
         )
         await self.outbound_transport_manager.setup()
 
+        # Deliver webhooks separately from agent messages, if enabled
+        if context.settings.get("admin.webhook_concurrency"):
+            self.webhook_dispatcher = WebhookDispatcher(
+                context.settings["admin.webhook_concurrency"],
+                context.settings.get("admin.webhook_batch_urls"),
+                queue_limit=context.settings.get("admin.webhook_queue_limit") or 10000,
+            )
+
         # Initialize dispatcher
         self.dispatcher = Dispatcher(self.root_profile)
         await self.dispatcher.setup()
@@ -145,8 +159,13 @@ class Conductor:
                 )
                 webhook_urls = context.settings.get("admin.webhook_urls")
                 if webhook_urls:
+                    topic_filters = (
+                        context.settings.get("admin.webhook_topic_filters") or {}
+                    )
                     for url in webhook_urls:
-                        self.admin_server.add_webhook_target(url)
+                        self.admin_server.add_webhook_target(
+                            url, topic_filter=topic_filters.get(url)
+                        )
                 context.injector.bind_instance(BaseAdminServer, self.admin_server)
             except Exception:
                 LOGGER.exception("Unable to register admin server")
@@ -190,6 +209,8 @@ class Conductor:
         except Exception:
             LOGGER.exception("Unable to start outbound transports")
             raise
+        if self.webhook_dispatcher:
+            await self.webhook_dispatcher.start()
 
         # Start up Admin server
         if self.admin_server:
@@ -342,6 +363,20 @@ class Conductor:
             except Exception:
                 LOGGER.exception("Error accepting mediation invitation")
 
+        # Open the profiles of frequently used subwallets ahead of their use
+        prewarm_wallets = context.settings.get("multitenant.prewarm_wallets")
+        if prewarm_wallets:
+            multitenant_mgr = context.inject(MultitenantManager, required=False)
+            if multitenant_mgr:
+                errors = await multitenant_mgr.prewarm_profiles(
+                    prewarm_wallets,
+                    context.settings.get("multitenant.prewarm_concurrency"),
+                )
+                LOGGER.info(
+                    "Pre-warmed %d subwallet profiles",
+                    len(set(prewarm_wallets)) - len(errors),
+                )
+
     async def stop(self, timeout=1.0):
         """Stop the agent."""
         shutdown = TaskQueue()
@@ -353,18 +388,30 @@ class Conductor:
             shutdown.run(self.inbound_transport_manager.stop())
         if self.outbound_transport_manager:
             shutdown.run(self.outbound_transport_manager.stop())
+        if self.webhook_dispatcher:
+            shutdown.run(self.webhook_dispatcher.stop())
 
         # close multitenant profiles
         multitenant_mgr = self.context.inject(MultitenantManager, required=False)
         if multitenant_mgr:
+            # finish closing evicted profiles before the root profile is closed
+            await multitenant_mgr._instances.wait_closed(timeout=timeout)
             for profile in multitenant_mgr._instances.values():
                 shutdown.run(profile.close())
 
         if self.root_profile:
             shutdown.run(self.root_profile.close())
 
+        cache = self.context.inject(BaseCache, required=False)
+        if cache:
+            shutdown.run(cache.close())
+
         await shutdown.complete(timeout)
 
+        crypto_pool = self.context.inject(CryptoWorkerPool, required=False)
+        if crypto_pool:
+            crypto_pool.shutdown(wait=False)
+
     def inbound_message_router(
         self,
         profile: Profile,
@@ -390,15 +437,26 @@ class Conductor:
         # Note: at this point we could send the message to a shared queue
         # if this pod is too busy to process it
 
+        # keep a subwallet profile open until the message has been handled
+        release_profile = self.hold_profile(profile)
+
+        def complete(completed: CompletedTask):
+            """Release the profile and handle completion of message dispatch."""
+            if release_profile:
+                release_profile()
+            self.dispatch_complete(message, completed)
+
         try:
             self.dispatcher.queue_message(
                 profile,
                 message,
                 self.outbound_message_router,
                 self.admin_server and self.admin_server.send_webhook,
-                lambda completed: self.dispatch_complete(message, completed),
+                complete,
             )
         except (LedgerConfigError, LedgerTransactionError) as e:
+            if release_profile:
+                release_profile()
             LOGGER.error("Shutdown on ledger error %s", str(e))
             if self.admin_server:
                 self.admin_server.notify_fatal_error()
@@ -444,6 +502,9 @@ class Conductor:
                 stats["out_encode"] += 1
             if m.state == QueuedOutboundMessage.STATE_DELIVER:
                 stats["out_deliver"] += 1
+        stats["out_lanes"] = dict(self.outbound_transport_manager.lane_stats)
+        if self.webhook_dispatcher:
+            stats["webhooks"] = dict(self.webhook_dispatcher.stats)
         return stats
 
     async def outbound_message_router(
@@ -540,11 +601,21 @@ class Conductor:
                     outbound.payload, target.endpoint
                 )
 
+    def hold_profile(self, profile: Profile) -> Optional[Callable[[], None]]:
+        """Keep a subwallet profile from being closed while it is in use."""
+        multitenant_mgr = self.context.inject(MultitenantManager, required=False)
+        return multitenant_mgr and multitenant_mgr.hold_profile(profile)
+
     def _queue_internal(self, profile: Profile, outbound: OutboundMessage):
         """Save the message to an internal outbound queue."""
+        release_profile = self.hold_profile(profile)
         try:
-            self.outbound_transport_manager.enqueue_message(profile, outbound)
+            self.outbound_transport_manager.enqueue_message(
+                profile, outbound, release_profile
+            )
         except OutboundDeliveryError:
+            if release_profile:
+                release_profile()
             LOGGER.warning("Cannot queue message for delivery, no supported transport")
             self.handle_not_delivered(profile, outbound)
 
@@ -570,6 +641,11 @@ class Conductor:
             max_attempts: The maximum number of attempts
             metadata: Additional metadata associated with the payload
         """
+        if self.webhook_dispatcher:
+            self.webhook_dispatcher.enqueue(
+                topic, payload, endpoint, max_attempts, metadata
+            )
+            return
         try:
             self.outbound_transport_manager.enqueue_webhook(
                 topic, payload, endpoint, max_attempts, metadata
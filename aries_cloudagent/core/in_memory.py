@@ -1,6 +1,7 @@
 """Manage in-memory profile interaction."""
 
 from collections import OrderedDict
+from itertools import count
 from typing import Any, Mapping, Type
 
 from ..config.injection_context import InjectionContext
@@ -30,8 +31,16 @@ class InMemoryProfile(Profile):
         super().__init__(context=context, name=name, created=True)
         self.keys = {}
         self.local_dids = {}
+        # verkey -> local DID, maintained by the in-memory wallet
+        self.local_did_verkeys = {}
         self.pair_dids = {}
         self.records = OrderedDict()
+        # indexes over records, maintained by the in-memory storage:
+        # record type -> {record id: insertion sequence}
+        self.record_types = {}
+        # (record type, tag name, tag value) -> {record id, ...}
+        self.record_tags = {}
+        self.record_seq = count()
 
     def session(self, context: InjectionContext = None) -> "ProfileSession":
         """Start a new interactive session with no transaction support requested."""
@@ -20,6 +20,7 @@ from ...protocols.coordinate_mediation.v1_0.models.mediation_record import (
     MediationRecord,
 )
 from ...multitenant.manager import MultitenantManager
+from ...multitenant.profile_pool import ProfilePool
 from ...transport.inbound.message import InboundMessage
 from ...transport.inbound.receipt import MessageReceipt
 from ...transport.outbound.base import OutboundDeliveryError
@@ -177,6 +178,9 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
                 async_mock.MagicMock(state=QueuedOutboundMessage.STATE_ENCODE),
                 async_mock.MagicMock(state=QueuedOutboundMessage.STATE_DELIVER),
             ]
+            mock_outbound_mgr.return_value.lane_stats = {
+                "http://example": {"state": "open"}
+            }
 
             await conductor.setup()
 
@@ -193,6 +197,7 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
                     "task_pending",
                 ]
             )
+            assert stats["out_lanes"] == {"http://example": {"state": "open"}}
 
     async def test_inbound_message_handler(self):
         builder: ContextBuilder = StubContextBuilder(self.test_settings)
@@ -219,6 +224,47 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
             assert mock_dispatch_q.call_args[0][3] is None  # admin webhook router
             assert callable(mock_dispatch_q.call_args[0][4])
 
+    async def test_inbound_message_handler_holds_profile(self):
+        builder: ContextBuilder = StubContextBuilder(
+            {**self.test_settings, "multitenant.enabled": True}
+        )
+        conductor = test_module.Conductor(builder)
+
+        await conductor.setup()
+
+        multitenant_mgr = conductor.context.inject(MultitenantManager)
+        multitenant_mgr._instances = ProfilePool(capacity=1)
+        profiles = [
+            async_mock.MagicMock(
+                settings={"wallet.id": f"test{i}"}, close=async_mock.CoroutineMock()
+            )
+            for i in (0, 1)
+        ]
+        multitenant_mgr._instances.put("test0", profiles[0])
+
+        with async_mock.patch.object(
+            conductor.dispatcher, "queue_message", autospec=True
+        ) as mock_dispatch_q, async_mock.patch.object(
+            conductor, "dispatch_complete", autospec=True
+        ) as mock_dispatch_complete:
+            message = InboundMessage("{}", MessageReceipt())
+            conductor.inbound_message_router(profiles[0], message)
+
+            # the profile is not evicted while the message is being dispatched
+            multitenant_mgr._instances.put("test1", profiles[1])
+            await multitenant_mgr._instances.wait_closed()
+            assert "test0" in multitenant_mgr._instances
+            profiles[0].close.assert_not_called()
+
+            completed = async_mock.MagicMock(exc_info=None)
+            mock_dispatch_q.call_args[0][4](completed)
+            mock_dispatch_complete.assert_called_once_with(message, completed)
+
+            multitenant_mgr._instances.put("test1", profiles[1])
+            await multitenant_mgr._instances.wait_closed()
+            assert "test0" not in multitenant_mgr._instances
+            profiles[0].close.assert_awaited_once_with()
+
     async def test_inbound_message_handler_ledger_x(self):
         builder: ContextBuilder = StubContextBuilder(self.test_settings_admin)
         conductor = test_module.Conductor(builder)
@@ -288,7 +334,7 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
             await conductor.outbound_message_router(conductor.context, message)
 
             mock_outbound_mgr.return_value.enqueue_message.assert_called_once_with(
-                conductor.context, message
+                conductor.context, message, None
             )
 
     async def test_outbound_message_handler_with_connection(self):
@@ -318,7 +364,7 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
             )
 
             mock_outbound_mgr.return_value.enqueue_message.assert_called_once_with(
-                conductor.root_profile, message
+                conductor.root_profile, message, None
             )
 
     async def test_outbound_message_handler_with_verkey_no_target(self):
@@ -345,7 +391,7 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
             )
 
             mock_outbound_mgr.return_value.enqueue_message.assert_called_once_with(
-                conductor.context, message
+                conductor.context, message, None
             )
 
     async def test_handle_nots(self):
@@ -864,6 +910,22 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
                 test_topic, test_payload, test_endpoint, test_attempts, None
             )
 
+    async def test_webhook_router_dispatcher(self):
+        builder: ContextBuilder = StubContextBuilder(self.test_settings)
+        builder.update_settings({"admin.webhook_concurrency": 2})
+        conductor = test_module.Conductor(builder)
+
+        await conductor.setup()
+        assert conductor.webhook_dispatcher.concurrency == 2
+        with async_mock.patch.object(
+            conductor.webhook_dispatcher, "enqueue"
+        ) as mock_enqueue, async_mock.patch.object(
+            conductor.outbound_transport_manager, "enqueue_webhook"
+        ) as mock_outbound:
+            conductor.webhook_router("topic", {}, "http://example", 2)
+            mock_enqueue.assert_called_once_with("topic", {}, "http://example", 2, None)
+            mock_outbound.assert_not_called()
+
     async def test_shutdown_multitenant_profiles(self):
         builder: ContextBuilder = StubContextBuilder(
             {**self.test_settings, "multitenant.enabled": True}
@@ -882,12 +944,15 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
 
             multitenant_mgr = conductor.context.inject(MultitenantManager)
 
-            multitenant_mgr._instances = {
-                "test1": async_mock.MagicMock(close=async_mock.CoroutineMock()),
-                "test2": async_mock.MagicMock(close=async_mock.CoroutineMock()),
-            }
+            multitenant_mgr._instances = ProfilePool(capacity=2)
+            profiles = [
+                async_mock.MagicMock(close=async_mock.CoroutineMock()) for _ in range(3)
+            ]
+            for idx, profile in enumerate(profiles):
+                multitenant_mgr._instances.put(f"test{idx}", profile)
 
             await conductor.stop()
 
-            multitenant_mgr._instances["test1"].close.assert_called_once_with()
-            multitenant_mgr._instances["test2"].close.assert_called_once_with()
+            # the evicted profile is closed along with the open ones
+            for profile in profiles:
+                profile.close.assert_awaited_once_with()
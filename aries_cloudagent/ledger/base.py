@@ -5,7 +5,7 @@ import re
 from abc import ABC, abstractmethod, ABCMeta
 from collections import namedtuple
 from enum import Enum
-from typing import Sequence, Tuple, Union
+from typing import Mapping, Sequence, Tuple, Union
 
 from ..indy.issuer import IndyIssuer
 from ..utils import sentinel
@@ -245,6 +245,31 @@ class BaseLedger(ABC, metaclass=ABCMeta):
 
         """
 
+    async def get_schemas(self, schema_ids: Sequence[str]) -> Mapping[str, dict]:
+        """
+        Get several schemas, keyed by schema id.
+
+        Args:
+            schema_ids: The schema ids (or stringified sequence numbers) to retrieve
+
+        """
+        return {schema_id: await self.get_schema(schema_id) for schema_id in schema_ids}
+
+    async def get_credential_definitions(
+        self, credential_definition_ids: Sequence[str]
+    ) -> Mapping[str, dict]:
+        """
+        Get several credential definitions, keyed by credential definition id.
+
+        Args:
+            credential_definition_ids: The credential definition ids to retrieve
+
+        """
+        return {
+            cred_def_id: await self.get_credential_definition(cred_def_id)
+            for cred_def_id in credential_definition_ids
+        }
+
     @abstractmethod
     async def get_revoc_reg_entry(self, revoc_reg_id: str, timestamp: int):
         """Get revocation registry entry by revocation registry ID and timestamp."""
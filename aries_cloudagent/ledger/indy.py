@@ -9,7 +9,7 @@ from datetime import datetime, date
 from hashlib import sha256
 from os import path
 from time import time
-from typing import Sequence, Tuple
+from typing import Mapping, Sequence, Tuple
 
 import indy.ledger
 import indy.pool
@@ -552,6 +552,35 @@ class IndySdkLedger(BaseLedger):
         else:
             return await self.fetch_schema_by_id(schema_id)
 
+    async def get_schemas(self, schema_ids: Sequence[str]) -> Mapping[str, dict]:
+        """
+        Get several schemas, keyed by schema id.
+
+        Cached schemas are looked up together; the rest are fetched from the ledger.
+
+        Args:
+            schema_ids: The schema ids (or stringified sequence numbers) to retrieve
+
+        """
+        results = {}
+        if self.pool.cache:
+            cached = await self.pool.cache.get_many(
+                [f"schema::{schema_id}" for schema_id in schema_ids]
+            )
+            results = {
+                schema_id: cached[f"schema::{schema_id}"]
+                for schema_id in schema_ids
+                if cached[f"schema::{schema_id}"]
+            }
+        for schema_id in schema_ids:
+            if schema_id not in results:
+                results[schema_id] = (
+                    await self.fetch_schema_by_seq_no(int(schema_id))
+                    if schema_id.isdigit()
+                    else await self.fetch_schema_by_id(schema_id)
+                )
+        return results
+
     async def fetch_schema_by_id(self, schema_id: str) -> dict:
         """
         Get schema from ledger.
@@ -774,6 +803,37 @@ class IndySdkLedger(BaseLedger):
 
         return await self.fetch_credential_definition(credential_definition_id)
 
+    async def get_credential_definitions(
+        self, credential_definition_ids: Sequence[str]
+    ) -> Mapping[str, dict]:
+        """
+        Get several credential definitions, keyed by credential definition id.
+
+        Cached credential definitions are looked up together; the rest are
+        fetched from the ledger.
+
+        Args:
+            credential_definition_ids: The credential definition ids to retrieve
+
+        """
+        results = {}
+        if self.pool.cache:
+            cached = await self.pool.cache.get_many(
+                [
+                    f"credential_definition::{cd_id}"
+                    for cd_id in credential_definition_ids
+                ]
+            )
+            results = {
+                cd_id: cached[f"credential_definition::{cd_id}"]
+                for cd_id in credential_definition_ids
+                if cached[f"credential_definition::{cd_id}"]
+            }
+        for cd_id in credential_definition_ids:
+            if cd_id not in results:
+                results[cd_id] = await self.fetch_credential_definition(cd_id)
+        return results
+
     async def fetch_credential_definition(self, credential_definition_id: str) -> dict:
         """
         Get a credential definition from the ledger by id.
@@ -863,6 +863,33 @@ class TestIndySdkLedger(AsyncTestCase):
             response == await ledger.get_schema("schema_id")  # cover get-from-cache
             assert response == json.loads(mock_parse_get_schema_resp.return_value[1])
 
+    @async_mock.patch("aries_cloudagent.ledger.indy.IndySdkLedgerPool.context_open")
+    @async_mock.patch("aries_cloudagent.ledger.indy.IndySdkLedgerPool.context_close")
+    @async_mock.patch("aries_cloudagent.ledger.indy.IndySdkLedger.fetch_schema_by_id")
+    async def test_get_schemas(
+        self,
+        mock_fetch_schema_by_id,
+        mock_close,
+        mock_open,
+    ):
+        mock_wallet = async_mock.MagicMock()
+        mock_fetch_schema_by_id.return_value = {"attrNames": ["a", "b"]}
+
+        cache = InMemoryCache()
+        await cache.set("schema::cached_id", {"attrNames": ["c"]})
+        ledger = IndySdkLedger(
+            IndySdkLedgerPool("name", checked=True, cache=cache), mock_wallet
+        )
+
+        async with ledger:
+            response = await ledger.get_schemas(["cached_id", "schema_id"])
+
+            mock_fetch_schema_by_id.assert_called_once_with("schema_id")
+            assert response == {
+                "cached_id": {"attrNames": ["c"]},
+                "schema_id": {"attrNames": ["a", "b"]},
+            }
+
     @async_mock.patch("aries_cloudagent.ledger.indy.IndySdkLedgerPool.context_open")
     @async_mock.patch("aries_cloudagent.ledger.indy.IndySdkLedgerPool.context_close")
     @async_mock.patch("aries_cloudagent.ledger.indy.IndySdkLedger._submit")
@@ -1644,6 +1671,37 @@ class TestIndySdkLedger(AsyncTestCase):
                     issuer, schema_id, None, tag
                 )
 
+    @async_mock.patch("aries_cloudagent.ledger.indy.IndySdkLedgerPool.context_open")
+    @async_mock.patch("aries_cloudagent.ledger.indy.IndySdkLedgerPool.context_close")
+    @async_mock.patch(
+        "aries_cloudagent.ledger.indy.IndySdkLedger.fetch_credential_definition"
+    )
+    async def test_get_credential_definitions(
+        self,
+        mock_fetch_cred_def,
+        mock_close,
+        mock_open,
+    ):
+        mock_wallet = async_mock.MagicMock()
+        mock_fetch_cred_def.return_value = {"value": "fetched"}
+
+        cache = InMemoryCache()
+        await cache.set("credential_definition::cached_id", {"value": "cached"})
+        ledger = IndySdkLedger(
+            IndySdkLedgerPool("name", checked=True, cache=cache), mock_wallet
+        )
+
+        async with ledger:
+            response = await ledger.get_credential_definitions(
+                ["cached_id", "cred_def_id"]
+            )
+
+            mock_fetch_cred_def.assert_called_once_with("cred_def_id")
+            assert response == {
+                "cached_id": {"value": "cached"},
+                "cred_def_id": {"value": "fetched"},
+            }
+
     @async_mock.patch("aries_cloudagent.ledger.indy.IndySdkLedgerPool.context_open")
     @async_mock.patch("aries_cloudagent.ledger.indy.IndySdkLedgerPool.context_close")
     @async_mock.patch("aries_cloudagent.ledger.indy.IndySdkLedger._submit")
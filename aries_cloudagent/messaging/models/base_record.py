@@ -5,14 +5,20 @@ import sys
 import uuid
 
 from datetime import datetime
-from typing import Any, Mapping, Sequence, Union
+from typing import Any, AsyncIterator, Callable, Mapping, Sequence, Union
 
 from marshmallow import fields
 
+from ...admin.base_server import BaseAdminServer
 from ...cache.base import BaseCache
 from ...config.settings import BaseSettings
 from ...core.profile import ProfileSession
-from ...storage.base import BaseStorage, StorageDuplicateError, StorageNotFoundError
+from ...storage.base import (
+    BaseStorage,
+    IterSearch,
+    StorageDuplicateError,
+    StorageNotFoundError,
+)
 from ...storage.record import StorageRecord
 
 from .base import BaseModel, BaseModelSchema
@@ -21,44 +27,53 @@ from ..util import datetime_to_str, time_now
 from ..valid import INDY_ISO8601_DATETIME
 
 
-def match_post_filter(
-    record: dict,
+def compile_post_filter(
     post_filter: dict,
     positive: bool = True,
     alt: bool = False,
-) -> bool:
-    """Determine if a record value matches the post-filter.
+) -> Callable[[dict], bool]:
+    """Compile a post-filter into a reusable predicate over record values.
 
     Args:
-        record: record to check
         post_filter: filter to apply (empty or None filter matches everything)
         positive: whether matching all filter criteria positively or negatively
         alt: set to match any (positive=True) value or miss all (positive=False)
             values in post_filter
     """
     if not post_filter:
-        return True
+        return lambda record: True
 
+    items = tuple(post_filter.items())
     if alt:
-        return (
-            positive
-            and all(
-                record.get(k) and record.get(k) in alts
-                for k, alts in post_filter.items()
-            )
-        ) or (
-            (not positive)
-            and all(
-                record.get(k) and record.get(k) not in alts
-                for k, alts in post_filter.items()
+        if positive:
+            return lambda record: all(
+                record.get(k) and record.get(k) in alts for k, alts in items
             )
+        return lambda record: all(
+            record.get(k) and record.get(k) not in alts for k, alts in items
         )
 
-    for k, v in post_filter.items():
-        if record.get(k) != v:
-            return not positive
+    if positive:
+        return lambda record: all(record.get(k) == v for k, v in items)
+    return lambda record: not all(record.get(k) == v for k, v in items)
+
+
+def match_post_filter(
+    record: dict,
+    post_filter: dict,
+    positive: bool = True,
+    alt: bool = False,
+) -> bool:
+    """Determine if a record value matches the post-filter.
 
-    return positive
+    Args:
+        record: record to check
+        post_filter: filter to apply (empty or None filter matches everything)
+        positive: whether matching all filter criteria positively or negatively
+        alt: set to match any (positive=True) value or miss all (positive=False)
+            values in post_filter
+    """
+    return compile_post_filter(post_filter, positive, alt)(record)
 
 
 class BaseRecord(BaseModel):
@@ -231,10 +246,11 @@ class BaseRecord(BaseModel):
             cls.prefix_tag_filter(tag_filter),
             options={"retrieveTags": False},
         )
+        match = compile_post_filter(post_filter, alt=False)
         found = None
         for record in rows:
             vals = json.loads(record.value)
-            if match_post_filter(vals, post_filter, alt=False):
+            if match(vals):
                 if found:
                     raise StorageDuplicateError(
                         "Multiple {} records located for {}{}".format(
@@ -261,6 +277,8 @@ class BaseRecord(BaseModel):
         post_filter_positive: dict = None,
         post_filter_negative: dict = None,
         alt: bool = False,
+        limit: int = None,
+        offset: int = None,
     ) -> Sequence["BaseRecord"]:
         """Query stored records.
 
@@ -271,29 +289,135 @@ class BaseRecord(BaseModel):
             post_filter_negative: Additional value filters to apply matching negatively
             alt: set to match any (positive=True) value or miss all (positive=False)
                 values in post_filter
+            limit: The maximum number of records to return
+            offset: The number of matching records to skip
         """
         storage = session.inject(BaseStorage)
-        rows = await storage.find_all_records(
+        match_positive = compile_post_filter(post_filter_positive, True, alt)
+        match_negative = compile_post_filter(post_filter_negative, False, alt)
+        result = []
+
+        if not (limit or offset):
+            rows = await storage.find_all_records(
+                cls.RECORD_TYPE,
+                cls.prefix_tag_filter(tag_filter),
+                options={"retrieveTags": False},
+            )
+            for record in rows:
+                vals = json.loads(record.value)
+                if match_positive(vals) and match_negative(vals):
+                    result.append(cls.from_storage(record.id, vals))
+            return result
+
+        if not (post_filter_positive or post_filter_negative):
+            rows = await storage.find_paginated_records(
+                cls.RECORD_TYPE,
+                cls.prefix_tag_filter(tag_filter),
+                limit=limit,
+                offset=offset,
+                options={"retrieveTags": False},
+            )
+            return [cls.from_storage(row.id, json.loads(row.value)) for row in rows]
+
+        # post-filters apply to record values, so scan until the page is filled
+        skip = offset or 0
+        records = cls.iter_query(
+            session,
+            tag_filter,
+            post_filter_positive=post_filter_positive,
+            post_filter_negative=post_filter_negative,
+            alt=alt,
+        )
+        try:
+            async for record in records:
+                if skip:
+                    skip -= 1
+                    continue
+                result.append(record)
+                if limit and len(result) >= limit:
+                    break
+        finally:
+            await records.aclose()
+        return result
+
+    @classmethod
+    async def iter_query(
+        cls,
+        session: ProfileSession,
+        tag_filter: dict = None,
+        *,
+        post_filter_positive: dict = None,
+        post_filter_negative: dict = None,
+        alt: bool = False,
+        page_size: int = None,
+    ) -> AsyncIterator["BaseRecord"]:
+        """Iterate over stored records, fetching them page by page.
+
+        The underlying search is closed when iteration completes or the
+        generator is closed early.
+
+        Args:
+            session: The profile session to use
+            tag_filter: An optional dictionary of tag filter clauses
+            post_filter_positive: Additional value filters to apply matching positively
+            post_filter_negative: Additional value filters to apply matching negatively
+            alt: set to match any (positive=True) value or miss all (positive=False)
+                values in post_filter
+            page_size: The number of records to fetch from storage at once
+        """
+        storage = session.inject(BaseStorage)
+        match_positive = compile_post_filter(post_filter_positive, True, alt)
+        match_negative = compile_post_filter(post_filter_negative, False, alt)
+        search = storage.search_records(
             cls.RECORD_TYPE,
             cls.prefix_tag_filter(tag_filter),
+            page_size=page_size,
             options={"retrieveTags": False},
         )
-        result = []
-        for record in rows:
-            vals = json.loads(record.value)
-            if match_post_filter(
-                vals,
-                post_filter_positive,
-                positive=True,
-                alt=alt,
-            ) and match_post_filter(
-                vals,
-                post_filter_negative,
-                positive=False,
-                alt=alt,
-            ):
-                result.append(cls.from_storage(record.id, vals))
-        return result
+        try:
+            async for record in IterSearch(search, page_size):
+                vals = json.loads(record.value)
+                if match_positive(vals) and match_negative(vals):
+                    yield cls.from_storage(record.id, vals)
+        finally:
+            await search.close()
+
+    @classmethod
+    async def count(
+        cls,
+        session: ProfileSession,
+        tag_filter: dict = None,
+        *,
+        post_filter_positive: dict = None,
+        post_filter_negative: dict = None,
+        alt: bool = False,
+    ) -> int:
+        """Count stored records matching a query.
+
+        Args:
+            session: The profile session to use
+            tag_filter: An optional dictionary of tag filter clauses
+            post_filter_positive: Additional value filters to apply matching positively
+            post_filter_negative: Additional value filters to apply matching negatively
+            alt: set to match any (positive=True) value or miss all (positive=False)
+                values in post_filter
+        """
+        storage = session.inject(BaseStorage)
+        if not (post_filter_positive or post_filter_negative):
+            return await storage.count_records(
+                cls.RECORD_TYPE, cls.prefix_tag_filter(tag_filter)
+            )
+
+        count = 0
+        async for _ in cls.iter_query(
+            session,
+            tag_filter,
+            post_filter_positive=post_filter_positive,
+            post_filter_negative=post_filter_negative,
+            alt=alt,
+        ):
+            count += 1
+        return count
 
     async def save(
         self,
@@ -341,6 +465,51 @@ class BaseRecord(BaseModel):
 
         return self._id
 
+    @classmethod
+    async def save_records(
+        cls,
+        session: ProfileSession,
+        records: Sequence["BaseRecord"],
+        *,
+        reason: str = None,
+        webhook: bool = None,
+    ):
+        """Persist several records to storage using bulk writes.
+
+        Args:
+            session: The profile session to use
+            records: The records to save
+            reason: A reason to add to the log
+            webhook: Flag to override whether the webhooks are sent
+        """
+        storage = session.inject(BaseStorage)
+        updated_at = time_now()
+        new_ids = set()
+        for record in records:
+            record.updated_at = updated_at
+            if not record._id:
+                record._id = str(uuid.uuid4())
+                record.created_at = updated_at
+                new_ids.add(record._id)
+        storage_records = [record.storage_record for record in records]
+        await storage.add_records([r for r in storage_records if r.id in new_ids])
+        await storage.update_records(
+            [r for r in storage_records if r.id not in new_ids]
+        )
+
+        for record in records:
+            new_record = record._id in new_ids
+            log_reason = reason or (
+                "Created record" if new_record else "Updated record"
+            )
+            record.log_state(
+                log_reason,
+                {record.RECORD_TYPE: record.serialize()},
+                settings=session.settings,
+            )
+            await record.post_save(session, new_record, record._last_state, webhook)
+            record._last_state = record.state
+
     async def post_save(
         self,
         session: ProfileSession,
@@ -359,10 +528,15 @@ class BaseRecord(BaseModel):
         webhook_topic = self.webhook_topic
         if webhook is None:
             webhook = bool(webhook_topic) and (new_record or (last_state != self.state))
-        if webhook:
-            await self.send_webhook(
-                session, self.webhook_payload, topic=self.webhook_topic
+        # avoid serializing the record when no one listens for the topic
+        if webhook and self.webhook_subscribed(session, webhook_topic):
+            compact_topics = session.settings.get("admin.webhook_compact_topics")
+            payload = (
+                self.compact_webhook_payload
+                if compact_topics and webhook_topic in compact_topics
+                else self.webhook_payload
             )
+            await self.send_webhook(session, payload, topic=webhook_topic)
 
     async def delete_record(self, session: ProfileSession):
         """Remove the stored record.
@@ -375,16 +549,49 @@ class BaseRecord(BaseModel):
             await storage.delete_record(self.storage_record)
         # FIXME - update state and send webhook?
 
+    @classmethod
+    async def delete_records(
+        cls, session: ProfileSession, records: Sequence["BaseRecord"]
+    ):
+        """Remove several stored records using a bulk delete.
+
+        Args:
+            session: The profile session to use
+            records: The records to remove
+        """
+        storage = session.inject(BaseStorage)
+        await storage.delete_records(
+            [record.storage_record for record in records if record._id]
+        )
+
     @property
     def webhook_payload(self):
         """Return a JSON-serialized version of the record for the webhook."""
         return self.serialize()
 
+    @property
+    def compact_webhook_payload(self) -> dict:
+        """Return the tags and state of the record for the webhook."""
+        # built from the tags, without serializing the record value
+        payload = self.strip_tag_prefix(self.tags)
+        payload[self.RECORD_ID_NAME] = self._id
+        payload["state"] = self.state
+        payload["updated_at"] = self.updated_at
+        return payload
+
     @property
     def webhook_topic(self):
         """Return the webhook topic value."""
         return self.WEBHOOK_TOPIC
 
+    @staticmethod
+    def webhook_subscribed(session: ProfileSession, topic: str) -> bool:
+        """Check whether any webhook target may receive a topic."""
+        admin_server = session.inject(BaseAdminServer, required=False)
+        return not admin_server or admin_server.webhook_subscribed(
+            session.profile, topic
+        )
+
     async def send_webhook(
         self, session: ProfileSession, payload: Any, topic: str = None
     ):
@@ -0,0 +1,105 @@
+"""Support for paginated admin list requests over stored records."""
+
+from typing import Mapping, Optional, Sequence, Tuple, Type
+
+from marshmallow import fields, validate
+
+from ...core.profile import ProfileSession
+
+from .base_record import BaseRecord
+from .openapi import OpenAPISchema
+
+
+class PaginatedQuerySchema(OpenAPISchema):
+    """
+    Parameters and validators for paginated list request query strings.
+
+    Pages follow the order in which the storage backend returns the records,
+    and are not sorted.
+    """
+
+    limit = fields.Int(
+        description="Maximum number of records to return",
+        required=False,
+        validate=validate.Range(min=1),
+        example=100,
+    )
+    offset = fields.Int(
+        description="Number of matching records to skip",
+        required=False,
+        validate=validate.Range(min=0),
+        example=0,
+    )
+    include_total = fields.Boolean(
+        description="Include the total number of matching records",
+        required=False,
+    )
+
+
+class PaginatedListSchema(OpenAPISchema):
+    """Result schema for paginated record lists."""
+
+    total = fields.Int(
+        description="Total number of matching records, if requested",
+        required=False,
+        example=250,
+    )
+
+
+def get_paginated_query_params(
+    query: Mapping[str, str]
+) -> Tuple[Optional[int], Optional[int], bool]:
+    """
+    Read the pagination parameters from a list request query string.
+
+    Args:
+        query: The request query string parameters
+
+    Returns:
+        A tuple of the limit, offset and whether to include the total count
+
+    """
+    limit = int(query["limit"]) if query.get("limit") else None
+    offset = int(query["offset"]) if query.get("offset") else None
+    include_total = query.get("include_total", "").lower() in ("true", "1")
+    return limit, offset, include_total
+
+
+def is_paginated(query: Mapping[str, str]) -> bool:
+    """Check whether a list request query string asks for a page of records."""
+    limit, offset, _ = get_paginated_query_params(query)
+    return limit is not None or bool(offset)
+
+
+async def paginated_query(
+    session: ProfileSession,
+    record_cls: Type[BaseRecord],
+    query: Mapping[str, str],
+    tag_filter: dict = None,
+    **kwargs,
+) -> Tuple[Sequence[BaseRecord], Optional[int]]:
+    """
+    Query a page of stored records as requested by a list request query string.
+
+    Args:
+        session: The profile session to use
+        record_cls: The record class to query
+        query: The request query string parameters
+        tag_filter: An optional dictionary of tag filter clauses
+        kwargs: Post-filter arguments passed to `BaseRecord.query`
+
+    Returns:
+        A tuple of the matching records and the total count, if requested
+
+    """
+    limit, offset, include_total = get_paginated_query_params(query)
+    records = await record_cls.query(
+        session, tag_filter, limit=limit, offset=offset, **kwargs
+    )
+    total = None
+    if include_total:
+        if limit is None and not offset:
+            total = len(records)
+        else:
+            total = await record_cls.count(session, tag_filter, **kwargs)
+    return records, total
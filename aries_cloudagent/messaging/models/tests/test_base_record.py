@@ -3,14 +3,21 @@ import json
 from asynctest import TestCase as AsyncTestCase, mock as async_mock
 from marshmallow import EXCLUDE, fields
 
+from ....admin.base_server import BaseAdminServer
 from ....cache.base import BaseCache
 from ....core.in_memory import InMemoryProfile
 from ....storage.base import BaseStorage, StorageDuplicateError, StorageRecord
+from ....storage.in_memory import InMemoryStorage
 
 from ...responder import BaseResponder, MockResponder
 from ...util import time_now
 
-from ..base_record import BaseRecord, BaseRecordSchema
+from ..base_record import (
+    BaseRecord,
+    BaseRecordSchema,
+    compile_post_filter,
+    match_post_filter,
+)
 
 
 class BaseRecordImpl(BaseRecord):
@@ -151,6 +158,27 @@ class TestBaseRecord(AsyncTestCase):
             with self.assertRaises(ZeroDivisionError):
                 await rec.save(session)
 
+    async def test_save_delete_records(self):
+        session = InMemoryProfile.test_session()
+        existing = ARecordImpl(a="1", b="0", code="one")
+        await existing.save(session)
+        existing.b = "1"
+        records = [existing] + [ARecordImpl(a="1", b="2", code="two")]
+        with async_mock.patch.object(
+            ARecordImpl, "post_save", async_mock.CoroutineMock()
+        ) as post_save:
+            await ARecordImpl.save_records(session, records, webhook=False)
+            assert [call[0][1] for call in post_save.call_args_list] == [False, True]
+        assert records[1]._id
+        found = await ARecordImpl.query(session)
+        assert sorted((rec.b, rec.code) for rec in found) == [
+            ("1", "one"),
+            ("2", "two"),
+        ]
+
+        await ARecordImpl.delete_records(session, records + [ARecordImpl(a="", b="")])
+        assert not await ARecordImpl.query(session)
+
     async def test_neq(self):
         a_rec = ARecordImpl(a="1", b="0", code="one")
         b_rec = BaseRecordImpl()
@@ -234,6 +262,72 @@ class TestBaseRecord(AsyncTestCase):
         )
         assert not result
 
+    async def test_query_paginated(self):
+        session = InMemoryProfile.test_session()
+        records = []
+        for i in range(6):
+            records.append(ARecordImpl(a=str(i % 2), b=str(i), code="one"))
+            await records[i].save(session)
+
+        found = await ARecordImpl.query(session, {"code": "one"}, limit=2, offset=1)
+        assert [rec.b for rec in found] == ["1", "2"]
+        found = await ARecordImpl.query(
+            session, {"code": "one"}, post_filter_positive={"a": "0"}, limit=2, offset=1
+        )
+        assert [rec.b for rec in found] == ["2", "4"]
+        found = await ARecordImpl.query(
+            session, post_filter_negative={"a": "0"}, offset=2
+        )
+        assert [rec.b for rec in found] == ["5"]
+
+        assert await ARecordImpl.count(session, {"code": "one"}) == 6
+        assert await ARecordImpl.count(session, post_filter_positive={"a": "1"}) == 3
+
+    async def test_iter_query(self):
+        session = InMemoryProfile.test_session()
+        for i in range(5):
+            await ARecordImpl(a=str(i % 2), b=str(i), code="one").save(session)
+
+        found = [
+            rec.b
+            async for rec in ARecordImpl.iter_query(
+                session, {"code": "one"}, post_filter_positive={"a": "0"}, page_size=2
+            )
+        ]
+        assert found == ["0", "2", "4"]
+
+        mock_search = async_mock.MagicMock(
+            fetch=async_mock.CoroutineMock(
+                return_value=[
+                    StorageRecord(
+                        ARecordImpl.RECORD_TYPE, json.dumps({"a": "1", "b": "0"})
+                    )
+                ]
+            ),
+            close=async_mock.CoroutineMock(),
+        )
+        with async_mock.patch.object(
+            InMemoryStorage, "search_records", async_mock.MagicMock()
+        ) as mock_search_records:
+            mock_search_records.return_value = mock_search
+            records = ARecordImpl.iter_query(session)
+            async for rec in records:
+                break
+            await records.aclose()
+            mock_search.close.assert_called_once()
+
+    def test_compile_post_filter(self):
+        record = {"a": "one", "b": "two"}
+        assert compile_post_filter(None)(record)
+        assert compile_post_filter({"a": "one"})(record)
+        assert not compile_post_filter({"a": "one", "b": "three"})(record)
+        assert compile_post_filter({"b": "three"}, positive=False)(record)
+        assert not compile_post_filter({"a": "one"}, positive=False)(record)
+        assert compile_post_filter({"a": ["one", "two"]}, alt=True)(record)
+        assert compile_post_filter({"a": ["two"]}, positive=False, alt=True)(record)
+        assert not compile_post_filter({"c": ["two"]}, positive=False, alt=True)(record)
+        assert match_post_filter(record, {"a": "one"})
+
     @async_mock.patch("builtins.print")
     def test_log_state(self, mock_print):
         test_param = "test.log"
@@ -266,6 +360,58 @@ class TestBaseRecord(AsyncTestCase):
         await record.send_webhook(session, payload, topic=topic)
         assert mock_responder.webhooks == [(topic, payload)]
 
+    async def test_webhook_not_subscribed(self):
+        session = InMemoryProfile.test_session()
+        mock_responder = MockResponder()
+        session.context.injector.bind_instance(BaseResponder, mock_responder)
+        admin_server = async_mock.MagicMock(
+            BaseAdminServer, webhook_subscribed=async_mock.MagicMock(return_value=False)
+        )
+        session.context.injector.bind_instance(BaseAdminServer, admin_server)
+        record = ARecordImpl(a="1", b="2", state="active")
+        record.WEBHOOK_TOPIC = "topic"
+
+        with async_mock.patch.object(
+            ARecordImpl, "serialize", async_mock.MagicMock()
+        ) as mock_serialize:
+            await record.post_save(session, True, None)
+            mock_serialize.assert_not_called()
+        admin_server.webhook_subscribed.assert_called_once_with(
+            session.profile, "topic"
+        )
+        assert mock_responder.webhooks == []
+
+    async def test_webhook_compact(self):
+        session = InMemoryProfile.test_session(
+            {"admin.webhook_compact_topics": ["topic"]}
+        )
+        mock_responder = MockResponder()
+        session.context.injector.bind_instance(BaseResponder, mock_responder)
+        record = ARecordImpl(ident="id", a="1", b="2", code="c", state="active")
+        record.WEBHOOK_TOPIC = "topic"
+
+        with async_mock.patch.object(
+            ARecordImpl,
+            "record_tags",
+            async_mock.PropertyMock(return_value={"~conn_id": "conn", "code": "c"}),
+        ), async_mock.patch.object(
+            ARecordImpl, "record_value", async_mock.PropertyMock()
+        ) as mock_record_value:
+            await record.post_save(session, True, None)
+            mock_record_value.assert_not_called()
+        assert mock_responder.webhooks == [
+            (
+                "topic",
+                {
+                    "conn_id": "conn",
+                    "code": "c",
+                    "ident": "id",
+                    "state": "active",
+                    "updated_at": None,
+                },
+            )
+        ]
+
     async def test_tag_prefix(self):
         tags = {"~x": "a", "y": "b"}
         assert UnencTestImpl.strip_tag_prefix(tags) == {"x": "a", "y": "b"}
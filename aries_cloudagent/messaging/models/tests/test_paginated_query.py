@@ -0,0 +1,54 @@
+from asynctest import TestCase as AsyncTestCase, mock as async_mock
+
+from ..paginated_query import (
+    get_paginated_query_params,
+    is_paginated,
+    paginated_query,
+)
+
+
+class TestPaginatedQuery(AsyncTestCase):
+    def test_get_params(self):
+        assert get_paginated_query_params({}) == (None, None, False)
+        assert get_paginated_query_params(
+            {"limit": "10", "offset": "20", "include_total": "True"}
+        ) == (10, 20, True)
+        assert get_paginated_query_params({"limit": "", "include_total": "false"}) == (
+            None,
+            None,
+            False,
+        )
+
+    def test_is_paginated(self):
+        assert not is_paginated({})
+        assert not is_paginated({"offset": "0", "include_total": "true"})
+        assert is_paginated({"limit": "10"})
+        assert is_paginated({"offset": "5"})
+
+    async def test_paginated_query(self):
+        session = async_mock.MagicMock()
+        record_cls = async_mock.MagicMock(
+            query=async_mock.CoroutineMock(return_value=["a", "b"]),
+            count=async_mock.CoroutineMock(return_value=12),
+        )
+
+        records, total = await paginated_query(
+            session, record_cls, {"limit": "2"}, {"tag": "x"}, alt=True
+        )
+        assert (records, total) == (["a", "b"], None)
+        record_cls.query.assert_called_once_with(
+            session, {"tag": "x"}, limit=2, offset=None, alt=True
+        )
+
+        records, total = await paginated_query(
+            session, record_cls, {"offset": "4", "include_total": "true"}
+        )
+        assert total == 12
+        record_cls.count.assert_called_once_with(session, None)
+
+        record_cls.count.reset_mock()
+        records, total = await paginated_query(
+            session, record_cls, {"include_total": "true"}
+        )
+        assert total == 2
+        record_cls.count.assert_not_called()
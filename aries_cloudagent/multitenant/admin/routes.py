@@ -14,6 +14,12 @@ from ...admin.request_context import AdminRequestContext
 from ...messaging.valid import JSONWebToken, UUIDFour
 from ...messaging.models.base import BaseModelError
 from ...messaging.models.openapi import OpenAPISchema
+from ...messaging.models.paginated_query import (
+    PaginatedListSchema,
+    PaginatedQuerySchema,
+    is_paginated,
+    paginated_query,
+)
 from ...storage.error import StorageError, StorageNotFoundError
 from ...wallet.models.wallet_record import WalletRecord, WalletRecordSchema
 from ...wallet.error import WalletSettingsError
@@ -196,7 +202,33 @@ class CreateWalletTokenResponseSchema(OpenAPISchema):
     )
 
 
-class WalletListSchema(OpenAPISchema):
+class PrewarmWalletsRequestSchema(OpenAPISchema):
+    """Request schema for pre-warming subwallets."""
+
+    wallet_ids = fields.List(
+        fields.Str(description="Subwallet identifier", example=UUIDFour.EXAMPLE),
+        required=True,
+        description="Identifiers of the subwallets to open",
+    )
+    concurrency = fields.Int(
+        description="Maximum number of subwallets to open in parallel",
+        required=False,
+        validate=validate.Range(min=1),
+        example=10,
+    )
+
+
+class PrewarmWalletsResponseSchema(OpenAPISchema):
+    """Response schema for pre-warming subwallets."""
+
+    errors = fields.Dict(
+        keys=fields.Str(description="Subwallet identifier"),
+        values=fields.Str(description="Reason the subwallet could not be opened"),
+        description="Subwallets which could not be opened",
+    )
+
+
+class WalletListSchema(PaginatedListSchema):
     """Result schema for wallet list."""
 
     results = fields.List(
@@ -205,7 +237,7 @@ class WalletListSchema(OpenAPISchema):
     )
 
 
-class WalletListQueryStringSchema(OpenAPISchema):
+class WalletListQueryStringSchema(PaginatedQuerySchema):
     """Parameters and validators for wallet list request query string."""
 
     wallet_name = fields.Str(description="Wallet name", example="MyNewWallet")
@@ -218,6 +250,8 @@ async def wallets_list(request: web.BaseRequest):
     """
     Request handler for listing all internal subwallets.
 
+    Without limit and offset, the subwallets are returned sorted by creation time.
+
     Args:
         request: aiohttp request object
     """
@@ -231,13 +265,20 @@ async def wallets_list(request: web.BaseRequest):
 
     async with context.session() as session:
         try:
-            records = await WalletRecord.query(session, tag_filter=query)
+            records, total = await paginated_query(
+                session, WalletRecord, request.query, query
+            )
             results = [format_wallet_record(record) for record in records]
-            results.sort(key=lambda w: w["created_at"])
+            # sorting a page would not give a consistent order across pages
+            if not is_paginated(request.query):
+                results.sort(key=lambda w: w["created_at"])
         except (StorageError, BaseModelError) as err:
             raise web.HTTPBadRequest(reason=err.roll_up) from err
 
-    return web.json_response({"results": results})
+    response = {"results": results}
+    if total is not None:
+        response["total"] = total
+    return web.json_response(response)
 
 
 @docs(tags=["multitenancy"], summary="Get a single subwallet")
@@ -465,6 +506,29 @@ async def wallet_remove(request: web.BaseRequest):
     return web.json_response({})
 
 
+@docs(tags=["multitenancy"], summary="Open subwallets ahead of their use")
+@request_schema(PrewarmWalletsRequestSchema())
+@response_schema(PrewarmWalletsResponseSchema(), 200, description="")
+async def wallets_prewarm(request: web.BaseRequest):
+    """
+    Request handler for opening the profiles of several subwallets.
+
+    Args:
+        request: aiohttp request object
+
+    """
+    context: AdminRequestContext = request["context"]
+    body = await request.json()
+
+    async with context.session() as session:
+        multitenant_mgr = session.inject(MultitenantManager)
+    errors = await multitenant_mgr.prewarm_profiles(
+        body.get("wallet_ids") or [], body.get("concurrency")
+    )
+
+    return web.json_response({"errors": errors})
+
+
 # MTODO: add wallet import route
 # MTODO: add wallet export route
 # MTODO: add rotate wallet key route
@@ -476,6 +540,7 @@ async def register(app: web.Application):
     app.add_routes(
         [
             web.get("/multitenancy/wallets", wallets_list, allow_head=False),
+            web.post("/multitenancy/wallets/prewarm", wallets_prewarm),
             web.post("/multitenancy/wallet", wallet_create),
             web.get("/multitenancy/wallet/{wallet_id}", wallet_get, allow_head=False),
             web.put("/multitenancy/wallet/{wallet_id}", wallet_update),
@@ -612,6 +612,25 @@ class TestMultitenantRoutes(AsyncTestCase):
                 )
                 await test_module.wallet_remove(self.request)
 
+    async def test_wallets_prewarm(self):
+        self.request.json = async_mock.CoroutineMock(
+            return_value={"wallet_ids": ["dummy", "other"], "concurrency": 2}
+        )
+        mock_multitenant_mgr = self.session_inject[MultitenantManager]
+        mock_multitenant_mgr.prewarm_profiles = async_mock.CoroutineMock(
+            return_value={"other": "Record not found"}
+        )
+
+        with async_mock.patch.object(test_module.web, "json_response") as mock_response:
+            await test_module.wallets_prewarm(self.request)
+
+            mock_multitenant_mgr.prewarm_profiles.assert_called_once_with(
+                ["dummy", "other"], 2
+            )
+            mock_response.assert_called_once_with(
+                {"errors": {"other": "Record not found"}}
+            )
+
     async def test_register(self):
         mock_app = async_mock.MagicMock()
         mock_app.add_routes = async_mock.MagicMock()
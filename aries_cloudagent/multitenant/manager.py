@@ -1,9 +1,16 @@
 """Manager for multitenancy."""
 
+import asyncio
+import hashlib
 import logging
+import time
 import jwt
-from typing import List, Optional, cast
 
+from collections import OrderedDict
+from functools import partial
+from typing import Callable, List, Mapping, Optional, Sequence, Tuple, cast
+
+from ..cache.base import BaseCache
 from ..core.profile import (
     Profile,
     ProfileSession,
@@ -14,17 +21,18 @@ from ..config.injection_context import InjectionContext
 from ..wallet.models.wallet_record import WalletRecord
 from ..wallet.base import BaseWallet
 from ..core.error import BaseError
-from ..protocols.routing.v1_0.manager import RouteNotFoundError, RoutingManager
+from ..protocols.routing.v1_0.manager import RoutingManager
 from ..protocols.routing.v1_0.models.route_record import RouteRecord
 from ..transport.wire_format import BaseWireFormat
 from ..storage.base import BaseStorage
-from ..storage.error import StorageNotFoundError
+from ..storage.error import StorageDuplicateError, StorageNotFoundError
 from ..protocols.coordinate_mediation.v1_0.manager import (
     MediationManager,
     MediationRecord,
 )
 
 from .error import WalletKeyMissingError
+from .profile_pool import ProfilePool
 
 LOGGER = logging.getLogger(__name__)
 
@@ -36,6 +44,17 @@ class MultitenantManagerError(BaseError):
 class MultitenantManager:
     """Class for handling multitenancy."""
 
+    # number of subwallet profiles opened in parallel when pre-warming
+    PREWARM_CONCURRENCY = 10
+
+    # lifetime and number of verified admin tokens retained
+    TOKEN_CACHE_TTL = 300
+    TOKEN_CACHE_MAX_ENTRIES = 10000
+
+    # lifetime of recipient key to wallet id index entries
+    ROUTE_CACHE_TTL = 3600
+    ROUTE_MISS_CACHE_TTL = 30
+
     def __init__(self, profile: Profile):
         """Initialize multitenant Manager.
 
@@ -46,7 +65,14 @@ class MultitenantManager:
         if not profile:
             raise MultitenantManagerError("Missing profile")
 
-        self._instances: dict[str, Profile] = {}
+        self._instances = ProfilePool(
+            profile.settings.get("multitenant.profile_capacity"),
+            profile.settings.get("multitenant.profile_idle_timeout"),
+        )
+        # pending subwallet profile opens, by wallet id
+        self._opening: dict = {}
+        # verified admin tokens by digest, from least to most recently used
+        self._verified_tokens = OrderedDict()
 
     async def get_default_mediator(self) -> Optional[MediationRecord]:
         """Retrieve the default mediator used for subwallet routing.
@@ -142,37 +168,148 @@ class MultitenantManager:
 
         """
         wallet_id = wallet_record.wallet_id
-        if wallet_id not in self._instances:
-            # Extend base context
-            context = base_context.copy()
-
-            # Settings we don't want to use from base wallet
-            reset_settings = {
-                "wallet.recreate": False,
-                "wallet.seed": None,
-                "wallet.rekey": None,
-                "wallet.name": None,
-                "wallet.type": None,
-                "mediation.open": None,
-                "mediation.invite": None,
-                "mediation.default_id": None,
-                "mediation.clear": None,
-            }
-            extra_settings["admin.webhook_urls"] = self.get_webhook_urls(
-                base_context, wallet_record
-            )
+        profile = self._instances.lookup(wallet_id)
+        if profile:
+            return profile
 
-            context.settings = (
-                context.settings.extend(reset_settings)
-                .extend(wallet_record.settings)
-                .extend(extra_settings)
+        # wait for a concurrent open of the same wallet instead of repeating it
+        opening = self._opening.get(wallet_id)
+        if opening:
+            return await asyncio.shield(opening)
+
+        opening = asyncio.get_event_loop().create_future()
+        self._opening[wallet_id] = opening
+        try:
+            # the wallet cannot be opened again until an evicted profile is closed
+            await self._instances.wait_closed(wallet_id)
+            profile = await self._open_wallet_profile(
+                base_context, wallet_record, extra_settings, provision=provision
             )
+            self._instances.put(wallet_id, profile)
+            opening.set_result(profile)
+        except Exception as err:
+            opening.set_exception(err)
+            # mark the exception as retrieved when there are no other waiters
+            opening.exception()
+            raise
+        finally:
+            if not opening.done():
+                opening.cancel()
+            del self._opening[wallet_id]
+
+        return profile
+
+    async def _open_wallet_profile(
+        self,
+        base_context: InjectionContext,
+        wallet_record: WalletRecord,
+        extra_settings: dict,
+        *,
+        provision=False,
+    ) -> Profile:
+        """Open the profile for a wallet record."""
+        # Extend base context
+        context = base_context.copy()
+
+        # Settings we don't want to use from base wallet
+        reset_settings = {
+            "wallet.recreate": False,
+            "wallet.seed": None,
+            "wallet.rekey": None,
+            "wallet.name": None,
+            "wallet.type": None,
+            "mediation.open": None,
+            "mediation.invite": None,
+            "mediation.default_id": None,
+            "mediation.clear": None,
+        }
+        extra_settings["admin.webhook_urls"] = self.get_webhook_urls(
+            base_context, wallet_record
+        )
+
+        context.settings = (
+            context.settings.extend(reset_settings)
+            .extend(wallet_record.settings)
+            .extend(extra_settings)
+        )
+
+        # MTODO: add ledger config
+        profile, _ = await wallet_config(context, provision=provision)
+        return profile
+
+    async def prewarm_profiles(
+        self, wallet_ids: Sequence[str], concurrency: int = None
+    ) -> Mapping[str, str]:
+        """Open the profiles of several subwallets ahead of their use.
+
+        Wallets are opened in parallel, up to the given concurrency. Unmanaged
+        wallets cannot be opened without their key and are skipped.
+
+        Args:
+            wallet_ids: The wallet ids of the subwallets to open
+            concurrency: The maximum number of wallets to open at once
+
+        Returns:
+            A mapping from each wallet id that could not be opened to the reason
+
+        """
+        limit = asyncio.Semaphore(concurrency or self.PREWARM_CONCURRENCY)
+        errors = {}
+
+        async def prewarm(wallet_id: str):
+            async with limit:
+                try:
+                    async with self._profile.session() as session:
+                        wallet_record = await WalletRecord.retrieve_by_id(
+                            session, wallet_id
+                        )
+                    if wallet_record.requires_external_key:
+                        raise WalletKeyMissingError("Missing key to open wallet")
+                    await self.get_wallet_profile(self._profile.context, wallet_record)
+                except BaseError as err:
+                    LOGGER.warning("Unable to pre-warm wallet %s: %s", wallet_id, err)
+                    errors[wallet_id] = err.roll_up
+
+        await asyncio.gather(*(prewarm(wallet_id) for wallet_id in set(wallet_ids)))
+        return errors
+
+    @property
+    def profile_stats(self) -> dict:
+        """Accessor for the open subwallet profile counters."""
+        return dict(self._instances.stats)
+
+    def acquire_profile(self, wallet_id: str):
+        """Mark an open subwallet profile as in use, preventing its eviction.
+
+        Args:
+            wallet_id: The wallet id of the profile
+        """
+        self._instances.acquire(wallet_id)
+
+    def release_profile(self, wallet_id: str):
+        """Release a subwallet profile previously marked as in use.
+
+        Args:
+            wallet_id: The wallet id of the profile
+        """
+        self._instances.release(wallet_id)
+
+    def hold_profile(self, profile: Profile) -> Optional[Callable[[], None]]:
+        """Keep an open subwallet profile from being evicted while work is pending.
+
+        Args:
+            profile: The profile used by the pending work
 
-            # MTODO: add ledger config
-            profile, _ = await wallet_config(context, provision=provision)
-            self._instances[wallet_id] = profile
+        Returns:
+            A callable releasing the profile, or `None` if the profile is not an
+            open subwallet profile
 
-        return self._instances[wallet_id]
+        """
+        wallet_id = profile.settings.get("wallet.id")
+        if not wallet_id or self._instances.get(wallet_id) is not profile:
+            return None
+        self._instances.acquire(wallet_id)
+        return partial(self._instances.release, wallet_id)
 
     async def create_wallet(
         self,
@@ -256,6 +393,7 @@ class MultitenantManager:
             wallet_record = await WalletRecord.retrieve_by_id(session, wallet_id)
             wallet_record.update_settings(new_settings)
             await wallet_record.save(session)
+        self._clear_verified_tokens(wallet_id)
 
         # update profile only if loaded
         if wallet_id in self._instances:
@@ -304,12 +442,22 @@ class MultitenantManager:
             await profile.remove()
 
             # Remove all routing records associated with wallet
+            routes = await RouteRecord.query(session, {"wallet_id": wallet.wallet_id})
             storage = session.inject(BaseStorage)
             await storage.delete_all_records(
                 RouteRecord.RECORD_TYPE, {"wallet_id": wallet.wallet_id}
             )
+            cache = session.inject(BaseCache, required=False)
+            if cache:
+                await cache.clear_many(
+                    [
+                        RouteRecord.wallet_cache_key(route.recipient_key)
+                        for route in routes
+                    ]
+                )
 
             await wallet.delete_record(session)
+        self._clear_verified_tokens(wallet_id)
 
     async def add_key(
         self, wallet_id: str, recipient_key: str, *, skip_if_exists: bool = False
@@ -344,6 +492,14 @@ class MultitenantManager:
         await routing_mgr.create_route_record(
             recipient_key=recipient_key, internal_wallet_id=wallet_id
         )
+        async with self._profile.session() as session:
+            cache = session.inject(BaseCache, required=False)
+            if cache:
+                await cache.set(
+                    RouteRecord.wallet_cache_key(recipient_key),
+                    wallet_id,
+                    self.ROUTE_CACHE_TTL,
+                )
 
         # External mediation
         if mediation_record:
@@ -403,9 +559,43 @@ class MultitenantManager:
             Profile associated with the token
 
         """
-        jwt_secret = self._profile.context.settings.get("multitenant.jwt_secret")
         extra_settings = {}
+        wallet, wallet_key = await self._verify_token(token)
+
+        if wallet.requires_external_key:
+            if not wallet_key:
+                raise WalletKeyMissingError()
+
+            extra_settings["wallet.key"] = wallet_key
+
+        profile = await self.get_wallet_profile(context, wallet, extra_settings)
+
+        return profile
+
+    async def _verify_token(self, token: str) -> Tuple[WalletRecord, Optional[str]]:
+        """Verify a JWT header token and load the wallet record it refers to.
+
+        Verified tokens are retained by digest until the token expires, up to
+        `TOKEN_CACHE_TTL` seconds, or the wallet is updated or removed.
+
+        Args:
+            token: The token
+
+        Returns:
+            A tuple of the wallet record and the wallet key in the token, if any
 
+        """
+        digest = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        now = time.time()
+        entry = self._verified_tokens.get(digest)
+        if entry:
+            expires, wallet, wallet_key = entry
+            if expires > now:
+                self._verified_tokens.move_to_end(digest)
+                return wallet, wallet_key
+            del self._verified_tokens[digest]
+
+        jwt_secret = self._profile.context.settings.get("multitenant.jwt_secret")
         token_body = jwt.decode(token, jwt_secret, algorithms=["HS256"])
 
         wallet_id = token_body.get("wallet_id")
@@ -414,15 +604,59 @@ class MultitenantManager:
         async with self._profile.session() as session:
             wallet = await WalletRecord.retrieve_by_id(session, wallet_id)
 
-            if wallet.requires_external_key:
-                if not wallet_key:
-                    raise WalletKeyMissingError()
+        expires = now + self.TOKEN_CACHE_TTL
+        if "exp" in token_body:
+            expires = min(expires, token_body["exp"])
+        self._verified_tokens[digest] = (expires, wallet, wallet_key)
+        while len(self._verified_tokens) > self.TOKEN_CACHE_MAX_ENTRIES:
+            self._verified_tokens.popitem(last=False)
+
+        return wallet, wallet_key
+
+    def _clear_verified_tokens(self, wallet_id: str):
+        """Forget the verified tokens for a wallet."""
+        self._verified_tokens = OrderedDict(
+            (digest, entry)
+            for digest, entry in self._verified_tokens.items()
+            if entry[1].wallet_id != wallet_id
+        )
 
-                extra_settings["wallet.key"] = wallet_key
+    async def _get_wallet_id_by_key(
+        self, session: ProfileSession, recipient_key: str
+    ) -> Optional[str]:
+        """Resolve the id of the wallet a recipient key is routed to, if any.
 
-            profile = await self.get_wallet_profile(context, wallet, extra_settings)
+        Lookups are indexed in the cache, including keys without a route, so
+        that most inbound messages are routed without a storage query. Route
+        record changes clear the affected entries.
 
-            return profile
+        Args:
+            session: The profile session to use
+            recipient_key: The recipient key
+        Returns:
+            The wallet id associated with the recipient key
+        """
+        cache = session.inject(BaseCache, required=False)
+        cache_key = RouteRecord.wallet_cache_key(recipient_key)
+        if cache:
+            # routes without a wallet are cached as an empty string
+            wallet_id = await cache.get(cache_key)
+            if wallet_id is not None:
+                return wallet_id or None
+
+        try:
+            route = await RouteRecord.retrieve_by_recipient_key(session, recipient_key)
+        except (StorageNotFoundError, StorageDuplicateError):
+            route = None
+        wallet_id = route and route.wallet_id
+
+        if cache:
+            await cache.set(
+                cache_key,
+                wallet_id or "",
+                self.ROUTE_CACHE_TTL if route else self.ROUTE_MISS_CACHE_TTL,
+            )
+        return wallet_id
 
     async def _get_wallet_by_key(self, recipient_key: str) -> Optional[WalletRecord]:
         """Get the wallet record associated with the recipient key.
@@ -432,18 +666,10 @@ class MultitenantManager:
         Returns:
             Wallet record associated with the recipient key
         """
-        routing_mgr = RoutingManager(self._profile)
-
-        try:
-            routing_record = await routing_mgr.get_recipient(recipient_key)
-            async with self._profile.session() as session:
-                wallet = await WalletRecord.retrieve_by_id(
-                    session, routing_record.wallet_id
-                )
-
-            return wallet
-        except (RouteNotFoundError):
-            pass
+        async with self._profile.session() as session:
+            wallet_id = await self._get_wallet_id_by_key(session, recipient_key)
+            if wallet_id:
+                return await WalletRecord.retrieve_by_id(session, wallet_id)
 
     async def get_wallets_by_message(
         self, message_body, wire_format: BaseWireFormat = None
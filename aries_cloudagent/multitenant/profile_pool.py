@@ -0,0 +1,194 @@
+"""Bounded pool of open subwallet profiles."""
+
+import asyncio
+import logging
+import time
+
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from functools import partial
+from typing import Dict, Iterator, Mapping, Optional
+
+from ..core.profile import Profile
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ProfilePool(MutableMapping):
+    """
+    Pool of open subwallet profiles, indexed by wallet id.
+
+    When a capacity or idle timeout is configured, the least recently used
+    profiles are evicted and closed in the background. Profiles which have
+    been acquired are never evicted until they are released.
+    """
+
+    def __init__(self, capacity: int = None, idle_timeout: float = None):
+        """
+        Initialize a `ProfilePool` instance.
+
+        Args:
+            capacity: the maximum number of profiles to keep open
+            idle_timeout: the number of seconds after which an unused profile
+                is closed
+
+        """
+        self.capacity = capacity
+        self.idle_timeout = idle_timeout
+        # ordered from least to most recently used
+        self._profiles = OrderedDict()
+        self._last_used = {}
+        self._refs = {}
+        # background closes of evicted profiles, by wallet id
+        self._closing: Dict[str, asyncio.Task] = {}
+        self._stats = {"hits": 0, "opens": 0, "evictions": 0}
+
+    @property
+    def stats(self) -> Mapping[str, float]:
+        """Accessor for open, hit and eviction counters."""
+        lookups = self._stats["hits"] + self._stats["opens"]
+        return {
+            **self._stats,
+            "open": len(self._profiles),
+            "in_use": len(self._refs),
+            "hit_ratio": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+    def lookup(self, wallet_id: str) -> Optional[Profile]:
+        """
+        Look up an open profile, marking it as recently used.
+
+        Args:
+            wallet_id: the wallet id of the profile
+
+        Returns:
+            The open profile, or `None` if it must be opened
+
+        """
+        self._evict_idle()
+        profile = self._profiles.get(wallet_id)
+        if profile is not None:
+            self._stats["hits"] += 1
+            self._touch(wallet_id)
+        return profile
+
+    def put(self, wallet_id: str, profile: Profile):
+        """
+        Add a newly opened profile, evicting others if over capacity.
+
+        Args:
+            wallet_id: the wallet id of the profile
+            profile: the open profile
+
+        """
+        self._stats["opens"] += 1
+        self[wallet_id] = profile
+
+    def acquire(self, wallet_id: str):
+        """Mark a profile as in use, preventing its eviction."""
+        if wallet_id in self._profiles:
+            self._refs[wallet_id] = self._refs.get(wallet_id, 0) + 1
+
+    def release(self, wallet_id: str):
+        """Release a profile previously acquired."""
+        refs = self._refs.get(wallet_id, 0) - 1
+        if refs > 0:
+            self._refs[wallet_id] = refs
+        elif wallet_id in self._refs:
+            del self._refs[wallet_id]
+            self._touch(wallet_id)
+            self._evict()
+
+    def _touch(self, wallet_id: str):
+        """Update the usage order of a profile."""
+        if wallet_id in self._profiles:
+            self._profiles.move_to_end(wallet_id)
+            self._last_used[wallet_id] = time.perf_counter()
+
+    def _evict_profile(self, wallet_id: str):
+        """Remove a profile from the pool and close it in the background."""
+        profile = self._profiles.pop(wallet_id)
+        del self._last_used[wallet_id]
+        self._stats["evictions"] += 1
+        LOGGER.debug("Closing evicted profile for wallet %s", wallet_id)
+        task = asyncio.ensure_future(profile.close())
+        self._closing[wallet_id] = task
+        task.add_done_callback(partial(self._closed, wallet_id))
+
+    def _closed(self, wallet_id: str, task: asyncio.Task):
+        """Handle completion of a background profile close."""
+        if self._closing.get(wallet_id) is task:
+            del self._closing[wallet_id]
+        if not task.cancelled() and task.exception():
+            LOGGER.warning("Error closing evicted profile: %s", task.exception())
+
+    def _evict(self):
+        """Evict the least recently used idle profiles until within capacity."""
+        if not self.capacity:
+            return
+        excess = len(self._profiles) - self.capacity
+        # never evict the most recently used profile
+        for wallet_id in list(self._profiles)[:-1]:
+            if excess <= 0:
+                break
+            if wallet_id not in self._refs:
+                self._evict_profile(wallet_id)
+                excess -= 1
+
+    def _evict_idle(self):
+        """Evict profiles which have not been used within the idle timeout."""
+        if not self.idle_timeout:
+            return
+        expired = time.perf_counter() - self.idle_timeout
+        for wallet_id in list(self._profiles):
+            if self._last_used[wallet_id] > expired:
+                break
+            if wallet_id not in self._refs:
+                self._evict_profile(wallet_id)
+
+    async def wait_closed(self, wallet_id: str = None, timeout: float = None):
+        """
+        Wait for the background close of evicted profiles to complete.
+
+        Args:
+            wallet_id: only wait for the close of this wallet's profile
+            timeout: the maximum number of seconds to wait
+
+        """
+        if wallet_id:
+            tasks = [self._closing[wallet_id]] if wallet_id in self._closing else []
+        else:
+            tasks = list(self._closing.values())
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+
+    def __getitem__(self, wallet_id: str) -> Profile:
+        """Get an open profile without updating the usage order."""
+        return self._profiles[wallet_id]
+
+    def __setitem__(self, wallet_id: str, profile: Profile):
+        """Add an open profile, evicting others if over capacity."""
+        self._profiles[wallet_id] = profile
+        self._touch(wallet_id)
+        self._evict_idle()
+        self._evict()
+
+    def __delitem__(self, wallet_id: str):
+        """Remove a profile from the pool without closing it."""
+        del self._profiles[wallet_id]
+        del self._last_used[wallet_id]
+        self._refs.pop(wallet_id, None)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the wallet ids of the open profiles."""
+        return iter(self._profiles)
+
+    def __len__(self) -> int:
+        """Get the number of open profiles."""
+        return len(self._profiles)
+
+    def __repr__(self) -> str:
+        """Human readable representation of this instance."""
+        return "<{}(capacity={}, idle_timeout={}, open={})>".format(
+            self.__class__.__name__, self.capacity, self.idle_timeout, len(self)
+        )
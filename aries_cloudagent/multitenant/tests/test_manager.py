@@ -1,8 +1,12 @@
+import asyncio
+
 from asynctest import TestCase as AsyncTestCase
 from asynctest import mock as async_mock
 
 import jwt
 
+from ...cache.base import BaseCache
+from ...cache.in_memory import InMemoryCache
 from ...core.in_memory import InMemoryProfile
 from ...config.base import InjectionError
 from ...messaging.responder import BaseResponder
@@ -311,6 +315,168 @@ class TestMultitenantManager(AsyncTestCase):
 
         assert isinstance(wallet, WalletRecord)
 
+    async def test_get_wallet_by_key_indexed(self):
+        cache = InMemoryCache()
+        self.context.injector.bind_instance(BaseCache, cache)
+        recipient_key = "test-recipient-key"
+
+        wallet_record = WalletRecord(settings={})
+        async with self.profile.session() as session:
+            await wallet_record.save(session)
+
+        # negative lookups are cached until a route is stored
+        assert await self.manager._get_wallet_by_key(recipient_key) is None
+        assert await cache.get(RouteRecord.wallet_cache_key(recipient_key)) == ""
+
+        route_record = RouteRecord(
+            wallet_id=wallet_record.wallet_id, recipient_key=recipient_key
+        )
+        async with self.profile.session() as session:
+            await route_record.save(session)
+        assert await cache.get(RouteRecord.wallet_cache_key(recipient_key)) is None
+
+        wallet = await self.manager._get_wallet_by_key(recipient_key)
+        assert wallet.wallet_id == wallet_record.wallet_id
+
+        with async_mock.patch.object(
+            RouteRecord, "retrieve_by_recipient_key"
+        ) as retrieve_by_recipient_key:
+            wallet = await self.manager._get_wallet_by_key(recipient_key)
+            assert wallet.wallet_id == wallet_record.wallet_id
+            retrieve_by_recipient_key.assert_not_called()
+
+        async with self.profile.session() as session:
+            await route_record.delete_record(session)
+        assert await self.manager._get_wallet_by_key(recipient_key) is None
+
+    async def test_add_key_indexed(self):
+        cache = InMemoryCache()
+        self.context.injector.bind_instance(BaseCache, cache)
+
+        await self.manager.add_key("wallet_id", "recipient_key")
+        assert (
+            await cache.get(RouteRecord.wallet_cache_key("recipient_key"))
+            == "wallet_id"
+        )
+
+    async def test_get_wallet_profile_pooled(self):
+        self.profile.settings["multitenant.profile_capacity"] = 1
+        manager = MultitenantManager(self.profile)
+        wallet_records = [
+            WalletRecord(wallet_id=f"test{i}", settings={}) for i in (0, 1)
+        ]
+        profiles = [
+            async_mock.MagicMock(close=async_mock.CoroutineMock()) for _ in (0, 1)
+        ]
+
+        with async_mock.patch(
+            "aries_cloudagent.multitenant.manager.wallet_config"
+        ) as wallet_config:
+            wallet_config.side_effect = [(profile, None) for profile in profiles]
+            assert (
+                await manager.get_wallet_profile(self.context, wallet_records[0])
+                is profiles[0]
+            )
+            manager.acquire_profile("test0")
+            assert (
+                await manager.get_wallet_profile(self.context, wallet_records[1])
+                is profiles[1]
+            )
+            assert (
+                await manager.get_wallet_profile(self.context, wallet_records[0])
+                is profiles[0]
+            )
+            manager.release_profile("test0")
+            await manager._instances.wait_closed()
+
+        profiles[1].close.assert_awaited_once_with()
+        assert manager.profile_stats["opens"] == 2
+        assert manager.profile_stats["hits"] == 1
+
+    async def test_get_wallet_profile_waits_for_close(self):
+        self.profile.settings["multitenant.profile_capacity"] = 1
+        manager = MultitenantManager(self.profile)
+        wallet_records = [
+            WalletRecord(wallet_id=f"test{i}", settings={}) for i in (0, 1)
+        ]
+        closing = asyncio.Event()
+        profiles = [
+            async_mock.MagicMock(close=async_mock.CoroutineMock()) for _ in (0, 1, 2)
+        ]
+        profiles[0].close.side_effect = closing.wait
+
+        with async_mock.patch(
+            "aries_cloudagent.multitenant.manager.wallet_config"
+        ) as wallet_config:
+            wallet_config.side_effect = [(profile, None) for profile in profiles]
+            await manager.get_wallet_profile(self.context, wallet_records[0])
+            await manager.get_wallet_profile(self.context, wallet_records[1])
+
+            # the evicted wallet is not reopened until its close completes
+            reopen = asyncio.ensure_future(
+                manager.get_wallet_profile(self.context, wallet_records[0])
+            )
+            await asyncio.sleep(0.01)
+            assert not reopen.done()
+            assert wallet_config.call_count == 2
+
+            closing.set()
+            assert await reopen is profiles[2]
+            profiles[0].close.assert_awaited_once_with()
+
+    async def test_get_wallet_profile_single_flight(self):
+        wallet_record = WalletRecord(wallet_id="test", settings={})
+        profile = async_mock.MagicMock()
+        opened = asyncio.Event()
+
+        async def open_wallet(*args, **kwargs):
+            await opened.wait()
+            return profile, None
+
+        with async_mock.patch(
+            "aries_cloudagent.multitenant.manager.wallet_config"
+        ) as wallet_config:
+            wallet_config.side_effect = open_wallet
+            pending = [
+                asyncio.ensure_future(
+                    self.manager.get_wallet_profile(self.context, wallet_record)
+                )
+                for _ in range(3)
+            ]
+            await asyncio.sleep(0)
+            opened.set()
+            assert await asyncio.gather(*pending) == [profile] * 3
+            wallet_config.assert_called_once()
+            assert not self.manager._opening
+
+            # failures are reported to every waiter and the open can be retried
+            self.manager._instances.clear()
+            wallet_config.side_effect = WalletKeyMissingError("bad key")
+            with self.assertRaises(WalletKeyMissingError):
+                await self.manager.get_wallet_profile(self.context, wallet_record)
+            assert not self.manager._opening
+
+    async def test_prewarm_profiles(self):
+        managed = WalletRecord(
+            key_management_mode=WalletRecord.MODE_MANAGED, settings={}
+        )
+        unmanaged = WalletRecord(
+            key_management_mode=WalletRecord.MODE_UNMANAGED,
+            settings={"wallet.type": "indy"},
+        )
+        async with self.profile.session() as session:
+            await managed.save(session)
+            await unmanaged.save(session)
+
+        with async_mock.patch.object(
+            MultitenantManager, "get_wallet_profile", async_mock.CoroutineMock()
+        ) as get_wallet_profile:
+            errors = await self.manager.prewarm_profiles(
+                [managed.wallet_id, unmanaged.wallet_id, "missing"], 2
+            )
+            get_wallet_profile.assert_called_once_with(self.context, managed)
+        assert set(errors) == {unmanaged.wallet_id, "missing"}
+
     async def test_create_wallet_removes_key_only_unmanaged_mode(self):
         with async_mock.patch.object(
             MultitenantManager, "get_wallet_profile"
@@ -651,6 +817,44 @@ class TestMultitenantManager(AsyncTestCase):
 
             assert profile == mock_profile
 
+    async def test_get_profile_for_token_cached(self):
+        self.profile.settings["multitenant.jwt_secret"] = "very_secret_jwt"
+        wallet_record = WalletRecord(
+            key_management_mode=WalletRecord.MODE_MANAGED,
+            settings={"wallet.type": "indy", "wallet.key": "wallet_key"},
+        )
+        async with self.profile.session() as session:
+            await wallet_record.save(session)
+
+        token = jwt.encode(
+            {"wallet_id": wallet_record.wallet_id}, "very_secret_jwt", algorithm="HS256"
+        ).decode()
+        expiring_token = jwt.encode(
+            {"wallet_id": wallet_record.wallet_id, "exp": 1},
+            "very_secret_jwt",
+            algorithm="HS256",
+        ).decode()
+
+        with async_mock.patch.object(
+            MultitenantManager, "get_wallet_profile", async_mock.CoroutineMock()
+        ), async_mock.patch.object(
+            WalletRecord, "retrieve_by_id", async_mock.CoroutineMock()
+        ) as retrieve_by_id:
+            retrieve_by_id.return_value = wallet_record
+            await self.manager.get_profile_for_token(self.profile.context, token)
+            await self.manager.get_profile_for_token(self.profile.context, token)
+            assert retrieve_by_id.call_count == 1
+
+            # updating the wallet forgets the verified tokens
+            await self.manager.update_wallet(wallet_record.wallet_id, {})
+            await self.manager.get_profile_for_token(self.profile.context, token)
+            assert retrieve_by_id.call_count == 3
+
+            with self.assertRaises(jwt.ExpiredSignatureError):
+                await self.manager.get_profile_for_token(
+                    self.profile.context, expiring_token
+                )
+
     async def test_get_profile_for_token_unmanaged_wallet(self):
         self.profile.settings["multitenant.jwt_secret"] = "very_secret_jwt"
         wallet_record = WalletRecord(
@@ -0,0 +1,100 @@
+import asyncio
+
+from asynctest import TestCase as AsyncTestCase
+from asynctest import mock as async_mock
+
+from ..profile_pool import ProfilePool
+
+
+class TestProfilePool(AsyncTestCase):
+    def make_profile(self):
+        return async_mock.MagicMock(close=async_mock.CoroutineMock())
+
+    async def test_unbounded(self):
+        pool = ProfilePool()
+        profiles = [self.make_profile() for _ in range(3)]
+        for idx, profile in enumerate(profiles):
+            assert pool.lookup(str(idx)) is None
+            pool.put(str(idx), profile)
+        assert len(pool) == 3
+        assert pool.lookup("0") is profiles[0]
+        assert pool.stats == {
+            "hits": 1,
+            "opens": 3,
+            "evictions": 0,
+            "open": 3,
+            "in_use": 0,
+            "hit_ratio": 0.25,
+        }
+
+    async def test_capacity_lru(self):
+        pool = ProfilePool(capacity=2)
+        profiles = [self.make_profile() for _ in range(3)]
+        pool.put("0", profiles[0])
+        pool.put("1", profiles[1])
+        pool.lookup("0")
+        pool.put("2", profiles[2])
+        await pool.wait_closed()
+
+        assert set(pool) == {"0", "2"}
+        profiles[1].close.assert_awaited_once_with()
+        assert pool.stats["evictions"] == 1
+
+    async def test_acquired_not_evicted(self):
+        pool = ProfilePool(capacity=1)
+        profiles = [self.make_profile() for _ in range(2)]
+        pool.put("0", profiles[0])
+        pool.acquire("0")
+        pool.put("1", profiles[1])
+        assert set(pool) == {"0", "1"}
+        assert pool.stats["in_use"] == 1
+
+        # releasing the last reference restores the capacity bound
+        pool.release("0")
+        await pool.wait_closed()
+        assert set(pool) == {"0"}
+        profiles[1].close.assert_awaited_once_with()
+        profiles[0].close.assert_not_called()
+
+    async def test_idle_timeout(self):
+        pool = ProfilePool(idle_timeout=10)
+        profiles = [self.make_profile() for _ in range(2)]
+        with async_mock.patch("time.perf_counter") as mock_time:
+            mock_time.return_value = 100
+            pool.put("0", profiles[0])
+            pool.put("1", profiles[1])
+            mock_time.return_value = 105
+            pool.lookup("1")
+            mock_time.return_value = 112
+            assert pool.lookup("0") is None
+            assert pool.lookup("1") is profiles[1]
+        await pool.wait_closed()
+        profiles[0].close.assert_awaited_once_with()
+
+    async def test_wait_closed_wallet(self):
+        pool = ProfilePool(capacity=1)
+        closing = asyncio.Event()
+        profiles = [self.make_profile() for _ in range(2)]
+        profiles[0].close = async_mock.CoroutineMock(side_effect=closing.wait)
+        pool.put("0", profiles[0])
+        pool.put("1", profiles[1])
+
+        waiter = asyncio.ensure_future(pool.wait_closed("0"))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        await pool.wait_closed("1")
+
+        closing.set()
+        await waiter
+        profiles[0].close.assert_awaited_once_with()
+        assert not pool._closing
+
+    async def test_delete_without_close(self):
+        pool = ProfilePool(capacity=1)
+        profile = self.make_profile()
+        pool["0"] = profile
+        pool.acquire("0")
+        del pool["0"]
+        assert not pool and pool.stats["in_use"] == 0
+        profile.close.assert_not_called()
+        assert "capacity=1" in repr(pool)
@@ -17,6 +17,12 @@ from ....admin.request_context import AdminRequestContext
 from ....connections.models.conn_record import ConnRecord, ConnRecordSchema
 from ....messaging.models.base import BaseModelError
 from ....messaging.models.openapi import OpenAPISchema
+from ....messaging.models.paginated_query import (
+    PaginatedListSchema,
+    PaginatedQuerySchema,
+    is_paginated,
+    paginated_query,
+)
 from ....messaging.valid import (
     ENDPOINT,
     INDY_DID,
@@ -38,7 +44,7 @@ class ConnectionModuleResponseSchema(OpenAPISchema):
     """Response schema for connection module."""
 
 
-class ConnectionListSchema(OpenAPISchema):
+class ConnectionListSchema(PaginatedListSchema):
     """Result schema for connection list."""
 
     results = fields.List(
@@ -161,7 +167,7 @@ class ConnectionStaticResultSchema(OpenAPISchema):
     record = fields.Nested(ConnRecordSchema, required=True)
 
 
-class ConnectionsListQueryStringSchema(OpenAPISchema):
+class ConnectionsListQueryStringSchema(PaginatedQuerySchema):
     """Parameters and validators for connections list request query string."""
 
     alias = fields.Str(
@@ -303,6 +309,8 @@ async def connections_list(request: web.BaseRequest):
     """
     Request handler for searching connection records.
 
+    Without limit and offset, the connections are returned sorted.
+
     Args:
         request: aiohttp request object
 
@@ -336,15 +344,25 @@ async def connections_list(request: web.BaseRequest):
 
     session = await context.session()
     try:
-        records = await ConnRecord.query(
-            session, tag_filter, post_filter_positive=post_filter, alt=True
+        records, total = await paginated_query(
+            session,
+            ConnRecord,
+            request.query,
+            tag_filter,
+            post_filter_positive=post_filter,
+            alt=True,
         )
         results = [record.serialize() for record in records]
-        results.sort(key=connection_sort_key)
+        # sorting a page would not give a consistent order across pages
+        if not is_paginated(request.query):
+            results.sort(key=connection_sort_key)
     except (StorageError, BaseModelError) as err:
         raise web.HTTPBadRequest(reason=err.roll_up) from err
 
-    return web.json_response({"results": results})
+    response = {"results": results}
+    if total is not None:
+        response["total"] = total
+    return web.json_response(response)
 
 
 @docs(tags=["connection"], summary="Fetch a single connection record")
@@ -96,6 +96,38 @@ class TestConnectionRoutes(AsyncTestCase):
                     }  # sorted
                 )
 
+    async def test_connections_list_paginated(self):
+        self.request.query = {"limit": "2", "offset": "4", "include_total": "true"}
+
+        with async_mock.patch.object(
+            test_module, "ConnRecord", autospec=True
+        ) as mock_conn_rec, async_mock.patch.object(
+            test_module.web, "json_response"
+        ) as mock_response:
+            serialized = [
+                {"state": "active", "created_at": "2"},
+                {"state": "active", "created_at": "1"},
+            ]
+            mock_conn_rec.query = async_mock.CoroutineMock(
+                return_value=[
+                    async_mock.MagicMock(serialize=async_mock.MagicMock(return_value=c))
+                    for c in serialized
+                ]
+            )
+            mock_conn_rec.count = async_mock.CoroutineMock(return_value=5)
+
+            await test_module.connections_list(self.request)
+            mock_conn_rec.query.assert_called_once_with(
+                async_mock.ANY,
+                {},
+                limit=2,
+                offset=4,
+                post_filter_positive={},
+                alt=True,
+            )
+            # a page keeps the storage order
+            mock_response.assert_called_once_with({"results": serialized, "total": 5})
+
     async def test_connections_list_x(self):
         self.request.query = {
             "their_role": ConnRecord.Role.REQUESTER.rfc160,
@@ -572,10 +572,10 @@ class MediationManager:
                     record = records[0]
                     to_remove.append(record)
 
-        for record_for_saving in to_save:
-            await record_for_saving.save(session, reason="Route successfully added.")
-        for record_for_removal in to_remove:
-            await record_for_removal.delete_record(session)
+        await RouteRecord.save_records(
+            session, to_save, reason="Route successfully added."
+        )
+        await RouteRecord.delete_records(session, to_remove)
 
     async def get_my_keylist(
         self, connection_id: Optional[str] = None
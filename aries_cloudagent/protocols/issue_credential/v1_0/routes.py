@@ -18,6 +18,11 @@ from ....indy.issuer import IndyIssuerError
 from ....ledger.error import LedgerError
 from ....messaging.credential_definitions.util import CRED_DEF_TAGS
 from ....messaging.models.base import BaseModelError, OpenAPISchema
+from ....messaging.models.paginated_query import (
+    PaginatedListSchema,
+    PaginatedQuerySchema,
+    paginated_query,
+)
 from ....messaging.valid import (
     INDY_CRED_DEF_ID,
     INDY_DID,
@@ -53,7 +58,7 @@ class IssueCredentialModuleResponseSchema(OpenAPISchema):
     """Response schema for Issue Credential Module."""
 
 
-class V10CredentialExchangeListQueryStringSchema(OpenAPISchema):
+class V10CredentialExchangeListQueryStringSchema(PaginatedQuerySchema):
     """Parameters and validators for credential exchange list query."""
 
     connection_id = fields.UUID(
@@ -90,7 +95,7 @@ class V10CredentialExchangeListQueryStringSchema(OpenAPISchema):
     )
 
 
-class V10CredentialExchangeListResultSchema(OpenAPISchema):
+class V10CredentialExchangeListResultSchema(PaginatedListSchema):
     """Result schema for Aries#0036 v1.0 credential exchange query."""
 
     results = fields.List(
@@ -301,16 +306,21 @@ async def credential_exchange_list(request: web.BaseRequest):
 
     try:
         async with context.session() as session:
-            records = await V10CredentialExchange.query(
-                session=session,
-                tag_filter=tag_filter,
+            records, total = await paginated_query(
+                session,
+                V10CredentialExchange,
+                request.query,
+                tag_filter,
                 post_filter_positive=post_filter,
             )
         results = [record.serialize() for record in records]
     except (StorageError, BaseModelError) as err:
         raise web.HTTPBadRequest(reason=err.roll_up) from err
 
-    return web.json_response({"results": results})
+    response = {"results": results}
+    if total is not None:
+        response["total"] = total
+    return web.json_response(response)
 
 
 @docs(
@@ -20,6 +20,11 @@ from ....indy.issuer import IndyIssuerError
 from ....ledger.error import LedgerError
 from ....messaging.decorators.attach_decorator import AttachDecorator
 from ....messaging.models.base import BaseModelError, OpenAPISchema
+from ....messaging.models.paginated_query import (
+    PaginatedListSchema,
+    PaginatedQuerySchema,
+    paginated_query,
+)
 from ....messaging.valid import (
     INDY_CRED_DEF_ID,
     INDY_DID,
@@ -52,7 +57,7 @@ class V20IssueCredentialModuleResponseSchema(OpenAPISchema):
     """Response schema for v2.0 Issue Credential Module."""
 
 
-class V20CredExRecordListQueryStringSchema(OpenAPISchema):
+class V20CredExRecordListQueryStringSchema(PaginatedQuerySchema):
     """Parameters and validators for credential exchange record list query."""
 
     connection_id = fields.UUID(
@@ -107,7 +112,7 @@ class V20CredExRecordDetailSchema(OpenAPISchema):
     )
 
 
-class V20CredExRecordListResultSchema(OpenAPISchema):
+class V20CredExRecordListResultSchema(PaginatedListSchema):
     """Result schema for credential exchange record list query."""
 
     results = fields.List(
@@ -337,9 +342,11 @@ async def credential_exchange_list(request: web.BaseRequest):
 
     try:
         async with context.session() as session:
-            cred_ex_records = await V20CredExRecord.query(
-                session=session,
-                tag_filter=tag_filter,
+            cred_ex_records, total = await paginated_query(
+                session,
+                V20CredExRecord,
+                request.query,
+                tag_filter,
                 post_filter_positive=post_filter,
             )
 
@@ -365,7 +372,10 @@ async def credential_exchange_list(request: web.BaseRequest):
     except (StorageError, BaseModelError) as err:
         raise web.HTTPBadRequest(reason=err.roll_up) from err
 
-    return web.json_response({"results": results})
+    response = {"results": results}
+    if total is not None:
+        response["total"] = total
+    return web.json_response(response)
 
 
 @docs(
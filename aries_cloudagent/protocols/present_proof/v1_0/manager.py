@@ -521,34 +521,24 @@ class PresentationManager:
         indy_proof_request = presentation_exchange_record.presentation_request
         indy_proof = presentation_exchange_record.presentation
 
-        schema_ids = []
-        credential_definition_ids = []
-
-        schemas = {}
-        credential_definitions = {}
         rev_reg_defs = {}
         rev_reg_entries = {}
 
         identifiers = indy_proof["identifiers"]
+        schema_ids = list(dict.fromkeys(ident["schema_id"] for ident in identifiers))
+        credential_definition_ids = list(
+            dict.fromkeys(ident["cred_def_id"] for ident in identifiers)
+        )
+
         ledger = self._profile.inject(BaseLedger)
         async with ledger:
-            for identifier in identifiers:
-                schema_ids.append(identifier["schema_id"])
-                credential_definition_ids.append(identifier["cred_def_id"])
-
-                # Build schemas for anoncreds
-                if identifier["schema_id"] not in schemas:
-                    schemas[identifier["schema_id"]] = await ledger.get_schema(
-                        identifier["schema_id"]
-                    )
-
-                if identifier["cred_def_id"] not in credential_definitions:
-                    credential_definitions[
-                        identifier["cred_def_id"]
-                    ] = await ledger.get_credential_definition(
-                        identifier["cred_def_id"]
-                    )
+            # Build schemas and cred defs for anoncreds, looking up all at once
+            schemas = await ledger.get_schemas(schema_ids)
+            credential_definitions = await ledger.get_credential_definitions(
+                credential_definition_ids
+            )
 
+            for identifier in identifiers:
                 if identifier.get("rev_reg_id"):
                     if identifier["rev_reg_id"] not in rev_reg_defs:
                         rev_reg_defs[
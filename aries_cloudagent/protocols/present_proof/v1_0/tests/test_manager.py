@@ -90,6 +90,12 @@ class TestPresentationManager(AsyncTestCase):
         self.ledger.get_credential_definition = async_mock.CoroutineMock(
             return_value={"value": {"revocation": {"...": "..."}}}
         )
+        self.ledger.get_schemas = async_mock.CoroutineMock(
+            return_value={S_ID: async_mock.MagicMock()}
+        )
+        self.ledger.get_credential_definitions = async_mock.CoroutineMock(
+            return_value={CD_ID: {"value": {"revocation": {"...": "..."}}}}
+        )
         self.ledger.get_revoc_reg_def = async_mock.CoroutineMock(
             return_value={
                 "ver": "1.0",
@@ -981,6 +987,8 @@ class TestPresentationManager(AsyncTestCase):
             save_ex.assert_called_once()
 
             assert exchange_out.state == (V10PresentationExchange.STATE_VERIFIED)
+            self.ledger.get_schemas.assert_called_once_with([S_ID])
+            self.ledger.get_credential_definitions.assert_called_once_with([CD_ID])
 
     async def test_verify_presentation_with_revocation(self):
         exchange_in = V10PresentationExchange()
@@ -532,34 +532,22 @@ class V20PresManager:
         indy_proof_request = pres_request_msg.attachment(V20PresFormat.Format.INDY)
         indy_proof = pres_ex_record.by_format["pres"][V20PresFormat.Format.INDY.api]
 
-        schema_ids = []
-        cred_def_ids = []
-
-        schemas = {}
-        cred_defs = {}
         rev_reg_defs = {}
         rev_reg_entries = {}
 
         identifiers = indy_proof["identifiers"]
+        schema_ids = list(dict.fromkeys(ident["schema_id"] for ident in identifiers))
+        cred_def_ids = list(
+            dict.fromkeys(ident["cred_def_id"] for ident in identifiers)
+        )
+
         ledger = self._profile.inject(BaseLedger)
         async with ledger:
-            for identifier in identifiers:
-                schema_ids.append(identifier["schema_id"])
-                cred_def_ids.append(identifier["cred_def_id"])
-
-                # Build schemas for anoncreds
-                if identifier["schema_id"] not in schemas:
-                    schemas[identifier["schema_id"]] = await ledger.get_schema(
-                        identifier["schema_id"]
-                    )
-
-                if identifier["cred_def_id"] not in cred_defs:
-                    cred_defs[
-                        identifier["cred_def_id"]
-                    ] = await ledger.get_credential_definition(
-                        identifier["cred_def_id"]
-                    )
+            # Build schemas and cred defs for anoncreds, looking up all at once
+            schemas = await ledger.get_schemas(schema_ids)
+            cred_defs = await ledger.get_credential_definitions(cred_def_ids)
 
+            for identifier in identifiers:
                 if identifier.get("rev_reg_id"):
                     if identifier["rev_reg_id"] not in rev_reg_defs:
                         rev_reg_defs[
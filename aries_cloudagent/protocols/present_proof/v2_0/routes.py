@@ -22,6 +22,11 @@ from ....ledger.error import LedgerError
 from ....messaging.decorators.attach_decorator import AttachDecorator
 from ....messaging.models.base import BaseModelError
 from ....messaging.models.openapi import OpenAPISchema
+from ....messaging.models.paginated_query import (
+    PaginatedListSchema,
+    PaginatedQuerySchema,
+    paginated_query,
+)
 from ....messaging.valid import (
     INDY_EXTRA_WQL,
     NUM_STR_NATURAL,
@@ -53,7 +58,7 @@ class V20PresentProofModuleResponseSchema(OpenAPISchema):
     """Response schema for Present Proof Module."""
 
 
-class V20PresExRecordListQueryStringSchema(OpenAPISchema):
+class V20PresExRecordListQueryStringSchema(PaginatedQuerySchema):
     """Parameters and validators for presentation exchange list query."""
 
     connection_id = fields.UUID(
@@ -90,7 +95,7 @@ class V20PresExRecordListQueryStringSchema(OpenAPISchema):
     )
 
 
-class V20PresExRecordListSchema(OpenAPISchema):
+class V20PresExRecordListSchema(PaginatedListSchema):
     """Result schema for a presentation exchange query."""
 
     results = fields.List(
@@ -363,16 +368,21 @@ async def present_proof_list(request: web.BaseRequest):
 
     try:
         async with context.session() as session:
-            records = await V20PresExRecord.query(
-                session=session,
-                tag_filter=tag_filter,
+            records, total = await paginated_query(
+                session,
+                V20PresExRecord,
+                request.query,
+                tag_filter,
                 post_filter_positive=post_filter,
             )
         results = [record.serialize() for record in records]
     except (StorageError, BaseModelError) as err:
         raise web.HTTPBadRequest(reason=err.roll_up) from err
 
-    return web.json_response({"results": results})
+    response = {"results": results}
+    if total is not None:
+        response["total"] = total
+    return web.json_response(response)
 
 
 @docs(
@@ -92,6 +92,12 @@ class TestV20PresManager(AsyncTestCase):
         self.ledger.get_credential_definition = async_mock.CoroutineMock(
             return_value={"value": {"revocation": {"...": "..."}}}
         )
+        self.ledger.get_schemas = async_mock.CoroutineMock(
+            return_value={S_ID: async_mock.MagicMock()}
+        )
+        self.ledger.get_credential_definitions = async_mock.CoroutineMock(
+            return_value={CD_ID: {"value": {"revocation": {"...": "..."}}}}
+        )
         self.ledger.get_revoc_reg_def = async_mock.CoroutineMock(
             return_value={
                 "ver": "1.0",
@@ -1034,6 +1040,8 @@ class TestV20PresManager(AsyncTestCase):
             save_ex.assert_called_once()
 
             assert px_rec_out.state == (V20PresExRecord.STATE_DONE)
+            self.ledger.get_schemas.assert_called_once_with([S_ID])
+            self.ledger.get_credential_definitions.assert_called_once_with([CD_ID])
 
     async def test_verify_pres_with_revocation(self):
         indy_proof_req = await PRES_PREVIEW.indy_proof_request(
@@ -37,6 +37,24 @@ class Forward(AgentMessage):
             msg = json.loads(msg)
         self.msg = msg
 
+    @classmethod
+    def encode_packed(cls, to: str, packed: Union[str, bytes]) -> str:
+        """
+        Serialize a forward message wrapping an already packed message.
+
+        The packed message is embedded verbatim rather than being decoded and
+        re-encoded along with the forward message.
+
+        Args:
+            to: Recipient verkey
+            packed: The packed message JSON
+        """
+        if isinstance(packed, bytes):
+            packed = packed.decode("utf-8")
+        envelope = cls(to=to, msg={}).serialize()
+        del envelope["msg"]
+        return json.dumps(envelope)[:-1] + ', "msg": ' + packed + "}"
+
 
 class ForwardSchema(AgentMessageSchema):
     """Forward message schema used in serialization/deserialization."""
@@ -38,6 +38,16 @@ class TestForward(TestCase):
 
         assert message_dict is message_schema_dump.return_value
 
+    def test_encode_packed(self):
+        packed = json.dumps({"protected": "abc", "ciphertext": "def"})
+        for value in (packed, packed.encode("utf-8")):
+            encoded = Forward.encode_packed(self.to, value)
+            data = json.loads(encoded)
+            assert data["@type"] == DIDCommPrefix.qualify_current(FORWARD)
+            assert data["to"] == self.to
+            assert data["msg"] == json.loads(packed)
+            assert Forward.deserialize(data).msg == json.loads(packed)
+
 
 class TestForwardSchema(TestCase):
     def test_make_model(self):
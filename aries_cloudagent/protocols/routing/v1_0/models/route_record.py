@@ -1,5 +1,7 @@
 """An object for containing information on an individual route."""
 
+from typing import Sequence
+
 from marshmallow import EXCLUDE, fields, validates_schema, ValidationError
 
 from .....core.profile import ProfileSession
@@ -28,7 +30,7 @@ class RouteRecord(BaseRecord):
         connection_id: str = None,
         wallet_id: str = None,
         recipient_key: str = None,
-        **kwargs
+        **kwargs,
     ):
         """Initialize route record.
 
@@ -61,6 +63,47 @@ class RouteRecord(BaseRecord):
         """Get record ID."""
         return self._id
 
+    @staticmethod
+    def wallet_cache_key(recipient_key: str) -> str:
+        """Get the cache key for the wallet id routed to a recipient key."""
+        return f"route_wallet::{recipient_key}"
+
+    async def post_save(self, session: ProfileSession, *args, **kwargs):
+        """Perform post-save actions.
+
+        Args:
+            session: The active profile session
+        """
+        await super().post_save(session, *args, **kwargs)
+
+        # clear cache key set by multitenant manager
+        await self.clear_cached_key(session, self.wallet_cache_key(self.recipient_key))
+
+    async def delete_record(self, session: ProfileSession):
+        """Remove the stored record.
+
+        Args:
+            session: The active profile session
+        """
+        await super().delete_record(session)
+        await self.clear_cached_key(session, self.wallet_cache_key(self.recipient_key))
+
+    @classmethod
+    async def delete_records(
+        cls, session: ProfileSession, records: Sequence["RouteRecord"]
+    ):
+        """Remove several stored records using a bulk delete.
+
+        Args:
+            session: The active profile session
+            records: The records to remove
+        """
+        await super().delete_records(session, records)
+        for record in records:
+            await cls.clear_cached_key(
+                session, cls.wallet_cache_key(record.recipient_key)
+            )
+
     @classmethod
     async def retrieve_by_recipient_key(
         cls, session: ProfileSession, recipient_key: str
@@ -74,6 +74,42 @@ class BaseStorage(ABC):
 
         """
 
+    async def add_records(self, records: Sequence[StorageRecord]):
+        """
+        Add several new records to the store.
+
+        Backends should override this to write the records in a single
+        transaction, or concurrently where transactions are not available.
+
+        Args:
+            records: `StorageRecord` instances to be stored
+
+        """
+        for record in records:
+            await self.add_record(record)
+
+    async def update_records(self, records: Sequence[StorageRecord]):
+        """
+        Update the value and tags of several existing stored records.
+
+        Args:
+            records: `StorageRecord` instances holding the new values and tags
+
+        """
+        for record in records:
+            await self.update_record(record, record.value, record.tags)
+
+    async def delete_records(self, records: Sequence[StorageRecord]):
+        """
+        Delete several existing records.
+
+        Args:
+            records: `StorageRecord` instances to delete
+
+        """
+        for record in records:
+            await self.delete_record(record)
+
     async def find_record(
         self, type_filter: str, tag_query: Mapping = None, options: Mapping = None
     ) -> StorageRecord:
@@ -103,6 +139,60 @@ class BaseStorage(ABC):
     ):
         """Retrieve all records matching a particular type filter and tag query."""
 
+    async def find_paginated_records(
+        self,
+        type_filter: str,
+        tag_query: Mapping = None,
+        limit: int = None,
+        offset: int = None,
+        options: Mapping = None,
+    ) -> Sequence[StorageRecord]:
+        """
+        Retrieve a page of records matching a type filter and tag query.
+
+        Pages follow the order in which the backend returns matching records.
+
+        Args:
+            type_filter: Filter string
+            tag_query: Tags to query
+            limit: The maximum number of records to return, or `None` for all
+            offset: The number of matching records to skip
+            options: Dictionary of backend-specific options
+
+        """
+        results = []
+        skip = offset or 0
+        scan = self.search_records(type_filter, tag_query, options=options)
+        try:
+            while limit is None or len(results) < limit:
+                rows = await scan.fetch()
+                if not rows:
+                    break
+                if skip:
+                    skipped = min(skip, len(rows))
+                    rows = rows[skipped:]
+                    skip -= skipped
+                results.extend(rows)
+        finally:
+            await scan.close()
+        return results[:limit] if limit is not None else results
+
+    async def count_records(self, type_filter: str, tag_query: Mapping = None) -> int:
+        """
+        Count the records matching a type filter and tag query.
+
+        Args:
+            type_filter: Filter string
+            tag_query: Tags to query
+
+        """
+        count = 0
+        async for _ in self.search_records(
+            type_filter, tag_query, options={"retrieveTags": False}
+        ):
+            count += 1
+        return count
+
     @abstractmethod
     async def delete_all_records(
         self,
@@ -180,6 +270,10 @@ class IterSearch:
         self._page_size = page_size
         self._search = search
 
+    def __aiter__(self):
+        """Async iterator magic method."""
+        return self
+
     async def __anext__(self):
         """Async iterator magic method."""
         if not self._buffer:
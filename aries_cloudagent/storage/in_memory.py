@@ -1,6 +1,10 @@
 """Basic in-memory storage implementation (non-wallet)."""
 
-from typing import Mapping, Sequence
+import re
+
+from functools import lru_cache
+from itertools import count
+from typing import Callable, Iterator, Mapping, Optional, Pattern, Sequence, Set
 
 from ..core.in_memory import InMemoryProfile
 
@@ -48,6 +52,10 @@ class InMemoryStorage(BaseStorage, BaseStorageSearch):
         if record.id in self.profile.records:
             raise StorageDuplicateError("Duplicate record")
         self.profile.records[record.id] = record
+        self.profile.record_types.setdefault(record.type, {})[record.id] = next(
+            self.profile.record_seq
+        )
+        _index_tags(self.profile, record)
 
     async def get_record(
         self, record_type: str, record_id: str, options: Mapping = None
@@ -90,7 +98,10 @@ class InMemoryStorage(BaseStorage, BaseStorageSearch):
         oldrec = self.profile.records.get(record.id)
         if not oldrec:
             raise StorageNotFoundError("Record not found: {}".format(record.id))
-        self.profile.records[record.id] = oldrec._replace(value=value, tags=tags)
+        newrec = oldrec._replace(value=value, tags=tags)
+        _unindex_tags(self.profile, oldrec)
+        self.profile.records[record.id] = newrec
+        _index_tags(self.profile, newrec)
 
     async def delete_record(self, record: StorageRecord):
         """
@@ -106,7 +117,69 @@ class InMemoryStorage(BaseStorage, BaseStorageSearch):
         validate_record(record, delete=True)
         if record.id not in self.profile.records:
             raise StorageNotFoundError("Record not found: {}".format(record.id))
-        del self.profile.records[record.id]
+        _remove_record(self.profile, record.id)
+
+    async def add_records(self, records: Sequence[StorageRecord]):
+        """
+        Add several new records to the store.
+
+        No records are added if any of them is invalid or already present.
+
+        Args:
+            records: `StorageRecord` instances to be stored
+
+        Raises:
+            StorageDuplicateError: If a record ID is already present
+
+        """
+        ids = set()
+        for record in records:
+            validate_record(record)
+            if record.id in self.profile.records or record.id in ids:
+                raise StorageDuplicateError("Duplicate record")
+            ids.add(record.id)
+        for record in records:
+            await self.add_record(record)
+
+    async def update_records(self, records: Sequence[StorageRecord]):
+        """
+        Update the value and tags of several existing stored records.
+
+        No records are updated if any of them is invalid or not found.
+
+        Args:
+            records: `StorageRecord` instances holding the new values and tags
+
+        Raises:
+            StorageNotFoundError: If a record is not found
+
+        """
+        for record in records:
+            validate_record(record)
+            if record.id not in self.profile.records:
+                raise StorageNotFoundError("Record not found: {}".format(record.id))
+        for record in records:
+            await self.update_record(record, record.value, record.tags)
+
+    async def delete_records(self, records: Sequence[StorageRecord]):
+        """
+        Delete several existing records.
+
+        No records are deleted if any of them is invalid or not found.
+
+        Args:
+            records: `StorageRecord` instances to delete
+
+        Raises:
+            StorageNotFoundError: If a record is not found
+
+        """
+        for record in records:
+            validate_record(record, delete=True)
+            if record.id not in self.profile.records:
+                raise StorageNotFoundError("Record not found: {}".format(record.id))
+        for record_id in {record.id for record in records}:
+            _remove_record(self.profile, record_id)
 
     async def find_all_records(
         self,
@@ -115,24 +188,59 @@ class InMemoryStorage(BaseStorage, BaseStorageSearch):
         options: Mapping = None,
     ):
         """Retrieve all records matching a particular type filter and tag query."""
+        match = compile_tag_query(tag_query)
         results = []
-        for record in self.profile.records.values():
-            if record.type == type_filter and tag_query_match(record.tags, tag_query):
+        for record_id in _find_candidate_ids(self.profile, type_filter, tag_query):
+            record = self.profile.records[record_id]
+            if match(record.tags):
                 results.append(record)
         return results
 
+    async def find_paginated_records(
+        self,
+        type_filter: str,
+        tag_query: Mapping = None,
+        limit: int = None,
+        offset: int = None,
+        options: Mapping = None,
+    ) -> Sequence[StorageRecord]:
+        """Retrieve a page of records matching a type filter and tag query."""
+        match = compile_tag_query(tag_query)
+        results = []
+        skip = offset or 0
+        for record_id in _find_candidate_ids(self.profile, type_filter, tag_query):
+            if limit is not None and len(results) >= limit:
+                break
+            record = self.profile.records[record_id]
+            if match(record.tags):
+                if skip:
+                    skip -= 1
+                else:
+                    results.append(record)
+        return results
+
+    async def count_records(self, type_filter: str, tag_query: Mapping = None) -> int:
+        """Count the records matching a type filter and tag query."""
+        match = compile_tag_query(tag_query)
+        return sum(
+            1
+            for record_id in _find_candidate_ids(self.profile, type_filter, tag_query)
+            if match(self.profile.records[record_id].tags)
+        )
+
     async def delete_all_records(
         self,
         type_filter: str,
         tag_query: Mapping = None,
     ):
         """Remove all records matching a particular type filter and tag query."""
+        match = compile_tag_query(tag_query)
         ids = []
-        for record_id, record in self.profile.records.items():
-            if record.type == type_filter and tag_query_match(record.tags, tag_query):
+        for record_id in _find_candidate_ids(self.profile, type_filter, tag_query):
+            if match(self.profile.records[record_id].tags):
                 ids.append(record_id)
         for record_id in ids:
-            del self.profile.records[record_id]
+            _remove_record(self.profile, record_id)
 
     def search_records(
         self,
@@ -159,73 +267,248 @@ class InMemoryStorage(BaseStorage, BaseStorageSearch):
         )
 
 
-def tag_value_match(value: str, match: dict) -> bool:
-    """Match a single tag against a tag subquery.
+def _index_tags(profile: InMemoryProfile, record: StorageRecord):
+    """Add a record's string tag values to the tag index."""
+    for name, value in record.tags.items():
+        if isinstance(value, str):
+            profile.record_tags.setdefault((record.type, name, value), set()).add(
+                record.id
+            )
+
+
+def _unindex_tags(profile: InMemoryProfile, record: StorageRecord):
+    """Remove a record's tag values from the tag index."""
+    for name, value in record.tags.items():
+        if isinstance(value, str):
+            key = (record.type, name, value)
+            ids = profile.record_tags.get(key)
+            if ids is not None:
+                ids.discard(record.id)
+                if not ids:
+                    del profile.record_tags[key]
+
+
+def _remove_record(profile: InMemoryProfile, record_id: str):
+    """Remove a record and its index entries."""
+    record = profile.records.pop(record_id)
+    _unindex_tags(profile, record)
+    type_ids = profile.record_types[record.type]
+    del type_ids[record_id]
+    if not type_ids:
+        del profile.record_types[record.type]
+
+
+def _plan_tag_query(
+    profile: InMemoryProfile, type_filter: str, tag_query: Mapping
+) -> Optional[Set[str]]:
+    """
+    Find the candidate record ids for a tag query using the tag index.
 
-    TODO: What type coercion is needed? (support int or float values?)
+    Equality, `$in` and `$or` clauses are resolved by intersecting or merging
+    posting sets. Returns `None` when no clause can be resolved from the
+    index, in which case every record of the type is a candidate. Candidates
+    must still be checked against the full query.
     """
+    if not tag_query or not isinstance(tag_query, dict):
+        return None
+    result = None
+    for k, v in tag_query.items():
+        ids = None
+        if k == "$or":
+            if isinstance(v, list):
+                branches = [_plan_tag_query(profile, type_filter, opt) for opt in v]
+                if all(branch is not None for branch in branches):
+                    ids = set().union(*branches)
+        elif k[0] == "$":
+            pass
+        elif isinstance(v, str):
+            ids = profile.record_tags.get((type_filter, k, v), set())
+        elif isinstance(v, dict) and len(v) == 1 and isinstance(v.get("$in"), list):
+            ids = set().union(
+                *(
+                    profile.record_tags.get((type_filter, k, val), ())
+                    for val in v["$in"]
+                    if isinstance(val, str)
+                )
+            )
+        if ids is not None:
+            result = set(ids) if result is None else result & ids
+            if not result:
+                break
+    return result
+
+
+def _find_candidate_ids(
+    profile: InMemoryProfile, type_filter: str, tag_query: Mapping
+) -> Sequence[str]:
+    """List the ids of records possibly matching a query, in insertion order."""
+    type_ids = profile.record_types.get(type_filter)
+    if not type_ids:
+        return []
+    candidates = _plan_tag_query(profile, type_filter, tag_query)
+    if candidates is None:
+        return list(type_ids)
+    return sorted(candidates, key=type_ids.__getitem__)
+
+
+@lru_cache(maxsize=256)
+def _like_regex(pattern: str) -> Pattern:
+    """Translate a SQL-style `$like` pattern into a compiled regular expression."""
+    return re.compile(
+        "".join(
+            ".*" if ch == "%" else "." if ch == "_" else re.escape(ch) for ch in pattern
+        ),
+        re.DOTALL,
+    )
+
+
+def _value_op_shape(match: dict, params: list) -> str:
+    """Validate a tag subquery, collecting its comparison value."""
     if len(match) != 1:
         raise StorageSearchError("Unsupported subquery: {}".format(match))
-    if value is None:
-        return False
-    op = list(match.keys())[0]
-    cmp_val = match[op]
+    op, cmp_val = next(iter(match.items()))
     if op == "$in":
         if not isinstance(cmp_val, list):
             raise StorageSearchError("Expected list for $in value")
-        chk = value in cmp_val
+        try:
+            params.append(frozenset(cmp_val))
+        except TypeError:
+            params.append(tuple(cmp_val))
+        return op
+    if not isinstance(cmp_val, str):
+        raise StorageSearchError("Expected string for filter value")
+    if op == "$neq":
+        params.append(cmp_val)
+    elif op in ("$gt", "$gte", "$lt", "$lte"):
+        try:
+            params.append(float(cmp_val))
+        except ValueError:
+            raise StorageSearchError(f"Expected numeric string for {op} value")
+    elif op == "$like":
+        params.append(_like_regex(cmp_val))
     else:
-        if not isinstance(cmp_val, str):
-            raise StorageSearchError("Expected string for filter value")
-        if op == "$neq":
-            chk = value != cmp_val
-        elif op == "$gt":
-            chk = float(value) > float(cmp_val)
-        elif op == "$gte":
-            chk = float(value) >= float(cmp_val)
-        elif op == "$lt":
-            chk = float(value) < float(cmp_val)
-        elif op == "$lte":
-            chk = float(value) <= float(cmp_val)
-        # elif op == "$like":  NYI
-        else:
-            raise StorageSearchError(f"Unsupported match operator: {op}")
-    return chk
+        raise StorageSearchError(f"Unsupported match operator: {op}")
+    return op
+
+
+def _clause_shape(k: str, v, params: list) -> tuple:
+    """Validate a single tag query clause, collecting its comparison values."""
+    if k in ("$or", "$and"):
+        if not isinstance(v, list):
+            raise StorageSearchError(f"Expected list for {k} filter value")
+        return (k[1:], tuple(_query_shape(opt, params) for opt in v))
+    if k == "$not":
+        if not isinstance(v, dict):
+            raise StorageSearchError("Expected dict for $not filter value")
+        return ("not", _query_shape(v, params))
+    if k[0] == "$":
+        raise StorageSearchError("Unexpected filter operator: {}".format(k))
+    if isinstance(v, str):
+        params.append(v)
+        return ("$eq", k)
+    if isinstance(v, dict):
+        return (_value_op_shape(v, params), k)
+    raise StorageSearchError(
+        "Expected string or dict for filter value, got {}".format(v)
+    )
+
+
+def _query_shape(tag_query: dict, params: list) -> tuple:
+    """
+    Validate a tag query, separating its structure from its values.
+
+    Invalid clauses are kept as error nodes, raising only if they are evaluated.
+    """
+    clauses = []
+    for k, v in (tag_query or {}).items():
+        try:
+            clauses.append(_clause_shape(k, v, params))
+        except StorageSearchError as err:
+            clauses.append(("error", err.message))
+    return ("and", tuple(clauses))
+
+
+_VALUE_OPS = {
+    "$neq": lambda value, cmp_val: value != cmp_val,
+    "$gt": lambda value, cmp_val: float(value) > cmp_val,
+    "$gte": lambda value, cmp_val: float(value) >= cmp_val,
+    "$lt": lambda value, cmp_val: float(value) < cmp_val,
+    "$lte": lambda value, cmp_val: float(value) <= cmp_val,
+    "$like": lambda value, cmp_val: cmp_val.fullmatch(value) is not None,
+}
+
+
+def _build_matcher(node: tuple, index: Iterator[int]) -> Callable:
+    """Build a predicate over (tags, params) for a validated query structure."""
+    kind = node[0]
+    if kind in ("and", "or"):
+        children = tuple(_build_matcher(child, index) for child in node[1])
+        if len(children) == 1:
+            return children[0]
+        if kind == "and":
+            return lambda tags, params: all(chk(tags, params) for chk in children)
+        return lambda tags, params: any(chk(tags, params) for chk in children)
+    if kind == "not":
+        child = _build_matcher(node[1], index)
+        return lambda tags, params: not child(tags, params)
+    if kind == "error":
+        message = node[1]
+
+        def fail(tags: dict, params: Sequence) -> bool:
+            raise StorageSearchError(message)
+
+        return fail
+
+    name = node[1]
+    pos = next(index)
+    if kind == "$eq":
+        return lambda tags, params: tags.get(name) == params[pos]
+    if kind == "$in":
+        return lambda tags, params: (
+            tags.get(name) is not None and tags.get(name) in params[pos]
+        )
+    value_op = _VALUE_OPS[kind]
+
+    def match(tags: dict, params: Sequence) -> bool:
+        value = tags.get(name)
+        return value is not None and value_op(value, params[pos])
+
+    return match
+
+
+@lru_cache(maxsize=256)
+def _compile_shape(shape: tuple) -> Callable:
+    """Compile a query structure into a predicate, cached by structure."""
+    return _build_matcher(shape, count())
+
+
+def compile_tag_query(tag_query: dict) -> Callable[[dict], bool]:
+    """
+    Compile a WQL-style tag query into a reusable predicate over record tags.
+
+    The query is validated once. Queries differing only in their comparison
+    values share the same compiled predicate. As with `tag_query_match`, the
+    predicate raises `StorageSearchError` when it evaluates an invalid clause.
+
+    """
+    if not tag_query:
+        return lambda tags: True
+    params = []
+    matcher = _compile_shape(_query_shape(tag_query, params))
+    params = tuple(params)
+    return lambda tags: matcher(tags or {}, params)
+
+
+def tag_value_match(value: str, match: dict) -> bool:
+    """Match a single tag against a tag subquery."""
+    params = []
+    op = _value_op_shape(match, params)
+    return _compile_shape(("and", ((op, "value"),)))({"value": value}, params)
 
 
 def tag_query_match(tags: dict, tag_query: dict) -> bool:
     """Match simple tag filters (string values)."""
-    result = True
-    if not tags:
-        tags = {}
-    if tag_query:
-        for k, v in tag_query.items():
-            if k == "$or":
-                if not isinstance(v, list):
-                    raise StorageSearchError("Expected list for $or filter value")
-                chk = False
-                for opt in v:
-                    if tag_query_match(tags, opt):
-                        chk = True
-                        break
-            elif k == "$not":
-                if not isinstance(v, dict):
-                    raise StorageSearchError("Expected dict for $not filter value")
-                chk = not tag_query_match(tags, v)
-            elif k[0] == "$":
-                raise StorageSearchError("Unexpected filter operator: {}".format(k))
-            elif isinstance(v, str):
-                chk = tags.get(k) == v
-            elif isinstance(v, dict):
-                chk = tag_value_match(tags.get(k), v)
-            else:
-                raise StorageSearchError(
-                    "Expected string or dict for filter value, got {}".format(v)
-                )
-            if not chk:
-                result = False
-                break
-    return result
+    return compile_tag_query(tag_query)(tags)
 
 
 class InMemoryStorageSearch(BaseStorageSearchSession):
@@ -250,11 +533,15 @@ class InMemoryStorageSearch(BaseStorageSearchSession):
             options: Dictionary of backend-specific options
 
         """
-        self._cache = profile.records.copy()
+        self._cache = {
+            record_id: profile.records[record_id]
+            for record_id in _find_candidate_ids(profile, type_filter, tag_query)
+        }
         self._iter = iter(self._cache)
         self.page_size = page_size or DEFAULT_PAGE_SIZE
         self.tag_query = tag_query
         self.type_filter = type_filter
+        self._match = compile_tag_query(tag_query)
 
     async def fetch(self, max_count: int = None) -> Sequence[StorageRecord]:
         """
@@ -275,7 +562,6 @@ class InMemoryStorageSearch(BaseStorageSearchSession):
             raise StorageSearchError("Search query is complete")
 
         ret = []
-        check_type = self.type_filter
         i = max_count or self.page_size
 
         while i > 0:
@@ -284,9 +570,7 @@ class InMemoryStorageSearch(BaseStorageSearchSession):
             except StopIteration:
                 break
             record = self._cache[id]
-            if record.type == check_type and tag_query_match(
-                record.tags, self.tag_query
-            ):
+            if self._match(record.tags):
                 ret.append(record)
                 i -= 1
 
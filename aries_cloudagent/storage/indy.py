@@ -26,6 +26,9 @@ from ..indy.sdk.wallet_setup import IndyOpenWallet
 
 LOGGER = logging.getLogger(__name__)
 
+# maximum number of concurrent wallet operations issued by a bulk write
+BULK_CONCURRENCY = 10
+
 
 class IndySdkStorage(BaseStorage, BaseStorageSearch):
     """Indy Non-Secrets interface."""
@@ -168,6 +171,76 @@ class IndySdkStorage(BaseStorage, BaseStorageSearch):
                 raise StorageNotFoundError(f"Record not found: {record.id}")
             raise StorageError(str(x_indy))
 
+    async def _bulk(self, operation, records: Sequence[StorageRecord]):
+        """Apply a record operation concurrently, raising the first error."""
+        limit = asyncio.Semaphore(BULK_CONCURRENCY)
+
+        async def apply(record: StorageRecord):
+            async with limit:
+                await operation(record)
+
+        results = await asyncio.gather(
+            *(apply(record) for record in records), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+
+    async def add_records(self, records: Sequence[StorageRecord]):
+        """
+        Add several new records to the store.
+
+        The non-secrets API does not expose transactions, so the records are
+        written with bounded concurrency. All records are attempted even if
+        some of them fail.
+
+        Args:
+            records: `StorageRecord` instances to be stored
+
+        Raises:
+            StorageDuplicateError: If a record ID is already present
+            StorageError: If a libindy error occurs
+
+        """
+        for record in records:
+            validate_record(record)
+        await self._bulk(self.add_record, records)
+
+    async def update_records(self, records: Sequence[StorageRecord]):
+        """
+        Update the value and tags of several existing stored records.
+
+        Args:
+            records: `StorageRecord` instances holding the new values and tags
+
+        Raises:
+            StorageNotFoundError: If a record is not found
+            StorageError: If a libindy error occurs
+
+        """
+        for record in records:
+            validate_record(record)
+        await self._bulk(
+            lambda record: self.update_record(record, record.value, record.tags),
+            records,
+        )
+
+    async def delete_records(self, records: Sequence[StorageRecord]):
+        """
+        Delete several existing records.
+
+        Args:
+            records: `StorageRecord` instances to delete
+
+        Raises:
+            StorageNotFoundError: If a record is not found
+            StorageError: If a libindy error occurs
+
+        """
+        for record in records:
+            validate_record(record, delete=True)
+        await self._bulk(self.delete_record, records)
+
     async def find_all_records(
         self,
         type_filter: str,
@@ -185,16 +258,56 @@ class IndySdkStorage(BaseStorage, BaseStorageSearch):
                 break
         return results
 
+    async def count_records(self, type_filter: str, tag_query: Mapping = None) -> int:
+        """
+        Count the records matching a type filter and tag query.
+
+        The count is computed by the wallet without retrieving any records.
+
+        Args:
+            type_filter: Filter string
+            tag_query: Tags to query
+
+        """
+        options_json = json.dumps(
+            {
+                "retrieveRecords": False,
+                "retrieveTotalCount": True,
+                "retrieveType": False,
+                "retrieveValue": False,
+                "retrieveTags": False,
+            }
+        )
+        try:
+            handle = await non_secrets.open_wallet_search(
+                self._wallet.handle,
+                type_filter,
+                json.dumps(tag_query or {}),
+                options_json,
+            )
+            try:
+                result_json = await non_secrets.fetch_wallet_search_next_records(
+                    self._wallet.handle, handle, 1
+                )
+            finally:
+                await non_secrets.close_wallet_search(handle)
+        except IndyError as x_indy:
+            raise StorageSearchError(str(x_indy)) from x_indy
+        return json.loads(result_json).get("totalCount") or 0
+
     async def delete_all_records(
         self,
         type_filter: str,
         tag_query: Mapping = None,
     ):
         """Remove all records matching a particular type filter and tag query."""
-        async for row in self.search_records(
-            type_filter, tag_query, options={"retrieveTags": False}
-        ):
-            await self.delete_record(row)
+        rows = [
+            row
+            async for row in self.search_records(
+                type_filter, tag_query, options={"retrieveTags": False}
+            )
+        ]
+        await self.delete_records(rows)
 
     def search_records(
         self,
@@ -11,6 +11,7 @@ from ...storage.error import (
 )
 from ...storage.in_memory import (
     InMemoryStorage,
+    compile_tag_query,
     tag_value_match,
     tag_query_match,
 )
@@ -156,6 +157,137 @@ class TestInMemoryStorage:
         with pytest.raises(StorageNotFoundError):
             await store.find_record(record.type, {}, None)
 
+    @pytest.mark.asyncio
+    async def test_find_all_indexed(self, store):
+        records = [
+            test_record({"state": state, "role": role})
+            for state in ("a", "b", "c")
+            for role in ("x", "y")
+        ]
+        for record in records:
+            await store.add_record(record)
+        await store.add_record(
+            StorageRecord(type="OTHER", value="TEST", tags={"state": "a"})
+        )
+
+        async def ids(tag_query):
+            return [r.id for r in await store.find_all_records("TYPE", tag_query)]
+
+        assert await ids({"state": "a"}) == [records[0].id, records[1].id]
+        assert await ids({"state": "a", "role": "y"}) == [records[1].id]
+        assert await ids({"state": {"$in": ["b", "c"]}, "role": "x"}) == [
+            records[2].id,
+            records[4].id,
+        ]
+        assert await ids({"$or": [{"state": "c"}, {"role": "x"}]}) == [
+            records[0].id,
+            records[2].id,
+            records[4].id,
+            records[5].id,
+        ]
+        assert await ids({"state": {"$neq": "a"}, "role": "y"}) == [
+            records[3].id,
+            records[5].id,
+        ]
+        assert await ids({"$not": {"state": "a"}}) == [r.id for r in records[2:]]
+        assert await ids({"state": "z"}) == []
+        assert await store.find_all_records("NOT-MY-TYPE", {"state": "a"}) == []
+
+    @pytest.mark.asyncio
+    async def test_find_paginated(self, store):
+        records = [test_record({"parity": str(i % 2)}) for i in range(7)]
+        for record in records:
+            await store.add_record(record)
+        await store.add_record(test_missing_record())
+
+        found = await store.find_paginated_records("TYPE", limit=3)
+        assert [r.id for r in found] == [r.id for r in records[:3]]
+        found = await store.find_paginated_records("TYPE", limit=3, offset=5)
+        assert [r.id for r in found] == [r.id for r in records[5:]]
+        found = await store.find_paginated_records("TYPE", {"parity": "0"}, 2, 1)
+        assert [r.id for r in found] == [records[2].id, records[4].id]
+        assert not await store.find_paginated_records("TYPE", offset=10)
+
+        assert await store.count_records("TYPE") == 7
+        assert await store.count_records("TYPE", {"parity": "1"}) == 3
+        assert await store.count_records("NOT-MY-TYPE") == 0
+
+    @pytest.mark.asyncio
+    async def test_bulk(self, store):
+        records = [test_record({"state": "a"}) for _ in range(3)]
+        await store.add_records(records)
+        await store.add_records([])
+        found = await store.find_all_records("TYPE", {"state": "a"})
+        assert {r.id for r in found} == {r.id for r in records}
+
+        with pytest.raises(StorageDuplicateError):
+            await store.add_records([records[0]])
+
+        await store.update_records(
+            [r._replace(value="UPDATED", tags={"state": "b"}) for r in records[:2]]
+        )
+        found = await store.find_all_records("TYPE", {"state": "b"})
+        assert {r.id for r in found} == {r.id for r in records[:2]}
+        assert all(r.value == "UPDATED" for r in found)
+
+        with pytest.raises(StorageNotFoundError):
+            await store.update_records([test_record()])
+
+        await store.delete_records(records[1:])
+        with pytest.raises(StorageNotFoundError):
+            await store.delete_records(records[1:])
+        found = await store.find_all_records("TYPE")
+        assert [r.id for r in found] == [records[0].id]
+
+
+class TestInMemoryStorageIndexes:
+    @pytest.mark.asyncio
+    async def test_index_maintained(self, store):
+        record = test_record({"state": "a"})
+        other = test_record({"state": "a"})
+        await store.add_record(record)
+        await store.add_record(other)
+
+        await store.update_record(record, "TEST", {"state": "b"})
+        assert [r.id for r in await store.find_all_records("TYPE", {"state": "a"})] == [
+            other.id
+        ]
+        found = await store.find_all_records("TYPE", {"state": "b"})
+        assert [r.id for r in found] == [record.id]
+
+        # insertion order is retained after updating tags
+        await store.update_record(other, "TEST", {"state": "b"})
+        found = await store.find_all_records("TYPE", {"state": "b"})
+        assert [r.id for r in found] == [record.id, other.id]
+
+        await store.delete_record(record)
+        await store.delete_all_records("TYPE", {"state": "b"})
+        assert not store.profile.records
+        assert not store.profile.record_types
+        assert not store.profile.record_tags
+
+    @pytest.mark.asyncio
+    async def test_bulk_atomic(self, store):
+        record = test_record()
+        await store.add_record(record)
+
+        with pytest.raises(StorageDuplicateError):
+            await store.add_records([test_record(), record])
+        dupe = test_record()
+        with pytest.raises(StorageDuplicateError):
+            await store.add_records([dupe, dupe])
+        with pytest.raises(StorageError):
+            await store.add_records([test_record(), None])
+        assert list(store.profile.records) == [record.id]
+
+        with pytest.raises(StorageNotFoundError):
+            await store.update_records(
+                [record._replace(value="UPDATED"), test_missing_record()]
+            )
+        with pytest.raises(StorageNotFoundError):
+            await store.delete_records([record, test_missing_record()])
+        assert store.profile.records[record.id].value == "TEST"
+
 
 class TestInMemoryStorageSearch:
     @pytest.mark.asyncio
@@ -205,6 +337,17 @@ class TestInMemoryStorageSearch:
             count += 1
         assert count == 1
 
+    @pytest.mark.asyncio
+    async def test_search_indexed(self, store_search):
+        records = [test_record({"state": str(i % 2)}) for i in range(6)]
+        for record in records:
+            await store_search.add_record(record)
+        search = store_search.search_records("TYPE", {"state": "1"}, None)
+        rows = await search.fetch(2)
+        assert [r.id for r in rows] == [records[1].id, records[3].id]
+        rows = await search.fetch(2)
+        assert [r.id for r in rows] == [records[5].id]
+
     @pytest.mark.asyncio
     async def test_closed_search(self, store_search):
         search = store_search.search_records("TYPE", {}, None)
@@ -271,3 +414,51 @@ class TestInMemoryTagQuery:
         with pytest.raises(StorageSearchError) as excinfo:
             tag_query_match(TAGS, {"a": -1})
         assert "Expected string or dict for filter value" in str(excinfo.value)
+
+    @pytest.mark.asyncio
+    async def test_compile_tag_query(self):
+        TAGS = {"a": "aardvark", "b": "bear", "z": "0"}
+
+        assert compile_tag_query(None)(TAGS)
+        assert compile_tag_query({"a": {"$like": "aard%"}})(TAGS)
+        assert compile_tag_query({"a": {"$like": "_ardvar_"}})(TAGS)
+        assert not compile_tag_query({"a": {"$like": "aard"}})(TAGS)
+        assert not compile_tag_query({"a": {"$like": "a.*"}})(TAGS)
+        assert compile_tag_query({"$and": [{"a": "aardvark"}, {"b": "bear"}]})(TAGS)
+        assert not compile_tag_query({"$and": [{"a": "aardvark"}, {"b": "cat"}]})(TAGS)
+        assert compile_tag_query({"b": {"$in": ["bear", "cat"]}})(TAGS)
+        assert not compile_tag_query({"c": {"$in": ["bear", "cat"]}})(TAGS)
+        assert not compile_tag_query({"$or": []})(TAGS)
+
+        match = compile_tag_query(
+            {"$or": [{"a": "alligator"}, {"$not": {"z": {"$lte": "-1"}}}]}
+        )
+        assert match(TAGS)
+        assert not match({"a": "aardvark", "z": "-2"})
+        assert match(None)
+
+        with pytest.raises(StorageSearchError) as excinfo:
+            compile_tag_query({"z": {"$gt": "zero"}})(TAGS)
+        assert "Expected numeric string" in str(excinfo.value)
+
+        with pytest.raises(StorageSearchError) as excinfo:
+            compile_tag_query({"$and": {"a": "aardvark"}})(TAGS)
+        assert "Expected list" in str(excinfo.value)
+
+        # invalid clauses only raise when evaluated
+        assert not compile_tag_query({"a": "alligator", "b": None})(TAGS)
+
+    @pytest.mark.asyncio
+    async def test_compile_tag_query_shared_by_shape(self):
+        from ...storage import in_memory as test_module
+
+        test_module._compile_shape.cache_clear()
+        assert compile_tag_query({"a": "aardvark", "b": {"$neq": "x"}})(
+            {"a": "aardvark", "b": "bear"}
+        )
+        assert not compile_tag_query({"a": "alligator", "b": {"$neq": "y"}})(
+            {"a": "aardvark", "b": "bear"}
+        )
+        info = test_module._compile_shape.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
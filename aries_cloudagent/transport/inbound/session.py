@@ -2,6 +2,8 @@
 
 import asyncio
 import logging
+
+from functools import partial
 from typing import Callable, Sequence, Union
 
 from ...admin.server import AdminResponder
@@ -66,6 +68,7 @@ class InboundSession:
 
         self._can_respond = can_respond
         self._closed = False
+        self._relay_release = None
         self._reply_mode = None
         self._reply_verkeys = None
         self._reply_thread_ids = None
@@ -100,6 +103,10 @@ class InboundSession:
     def close(self):
         """Setter for the session closed state."""
         self._closed = True
+        if self._relay_release:
+            # allow the subwallet profile to be evicted again
+            self._relay_release()
+            self._relay_release = None
         self.response_event.set()  # end wait_response if blocked
         if self.close_handler:
             self.close_handler(self)
@@ -170,6 +177,10 @@ class InboundSession:
                 profile = await multitenant_mgr.get_wallet_profile(
                     self.profile.context, wallet
                 )
+                multitenant_mgr.acquire_profile(wallet.wallet_id)
+                self._relay_release = partial(
+                    multitenant_mgr.release_profile, wallet.wallet_id
+                )
 
                 base_responder: AdminResponder = profile.inject(BaseResponder)
 
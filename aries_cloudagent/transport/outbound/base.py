@@ -2,7 +2,7 @@
 
 import asyncio
 from abc import ABC, abstractmethod
-from typing import Union
+from typing import Mapping, Union
 
 from ...core.profile import Profile
 from ...utils.stats import Collector
@@ -39,6 +39,9 @@ class BaseOutboundTransport(ABC):
             self.logger.exception("Exception in outbound transport")
         await self.stop()
 
+    def configure(self, settings: Mapping[str, object]):
+        """Apply the agent settings before the transport is started."""
+
     @abstractmethod
     async def start(self):
         """Start the transport."""
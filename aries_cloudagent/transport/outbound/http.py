@@ -1,7 +1,7 @@
 """Http outbound transport."""
 
 import logging
-from typing import Union
+from typing import Mapping, Union
 
 from aiohttp import ClientSession, DummyCookieJar, TCPConnector
 
@@ -18,16 +18,46 @@ class HttpTransport(BaseOutboundTransport):
 
     schemes = ("http", "https")
 
-    def __init__(self) -> None:
-        """Initialize an `HttpTransport` instance."""
+    def __init__(
+        self,
+        limit: int = 200,
+        limit_per_host: int = 50,
+        keepalive_timeout: float = 15.0,
+    ) -> None:
+        """
+        Initialize an `HttpTransport` instance.
+
+        Args:
+            limit: the maximum number of open connections
+            limit_per_host: the maximum number of open connections to an endpoint
+            keepalive_timeout: the number of seconds to keep idle connections
+                open for reuse
+
+        """
         super().__init__()
         self.client_session: ClientSession = None
         self.connector: TCPConnector = None
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
         self.logger = logging.getLogger(__name__)
 
+    def configure(self, settings: Mapping[str, object]):
+        """Apply the connection pool settings."""
+        if settings.get("transport.http_limit"):
+            self.limit = settings["transport.http_limit"]
+        if settings.get("transport.http_limit_per_host"):
+            self.limit_per_host = settings["transport.http_limit_per_host"]
+        if settings.get("transport.http_keepalive_timeout"):
+            self.keepalive_timeout = settings["transport.http_keepalive_timeout"]
+
     async def start(self):
         """Start the transport."""
-        self.connector = TCPConnector(limit=200, limit_per_host=50)
+        self.connector = TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+        )
         session_args = {
             "cookie_jar": DummyCookieJar(),
             "connector": self.connector,
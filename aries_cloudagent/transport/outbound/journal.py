@@ -0,0 +1,240 @@
+"""Append-only journal of pending outbound messages."""
+
+import asyncio
+import json
+import logging
+import os
+
+from typing import List, Mapping, TextIO, Tuple, Union
+from uuid import uuid4
+
+from ...wallet.util import b64_to_bytes, bytes_to_b64
+
+LOGGER = logging.getLogger(__name__)
+
+
+class OutboundJournal:
+    """
+    Durable record of outbound messages awaiting delivery.
+
+    Enqueued messages, retries and final outcomes are appended to a log file
+    as JSON lines. Records are buffered and written in batches, each followed
+    by a single fsync, so that the cost of durability is shared between all
+    the messages enqueued in the meantime. When the agent restarts, the log is
+    read back to recover the messages which were not yet delivered.
+
+    The log is rewritten with only the pending messages once most of its
+    records refer to completed deliveries.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = 0.05,
+        compact_threshold: int = 10000,
+    ):
+        """
+        Initialize an `OutboundJournal` instance.
+
+        Args:
+            path: the path of the log file
+            flush_interval: the maximum delay in seconds before buffered records
+                are written
+            compact_threshold: the minimum number of records in the log before
+                it is compacted
+
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.compact_threshold = compact_threshold
+        self._buffer = []
+        self._file = None
+        self._flush_lock: asyncio.Lock = None
+        self._flush_task: asyncio.Task = None
+        self._pending = {}
+        self._records = 0
+        self._stats = {"flushes": 0, "records": 0, "compactions": 0}
+
+    @property
+    def stats(self) -> Mapping[str, int]:
+        """Accessor for flush and compaction counters."""
+        return {**self._stats, "pending": len(self._pending)}
+
+    async def open(self) -> List[dict]:
+        """
+        Open the log, recovering the messages pending delivery.
+
+        Messages recorded before the log is opened are kept and written to the
+        log, but are not returned as recovered.
+
+        Returns:
+            The entries of the undelivered messages, in the order enqueued
+
+        """
+        self._flush_lock = asyncio.Lock()
+        records, log = await asyncio.get_event_loop().run_in_executor(None, self._load)
+        appended, self._pending = self._pending, {}
+        for record in records:
+            self._apply(record)
+        self._records = len(records)
+        recovered = [
+            self._decode_entry(entry_id, entry)
+            for entry_id, entry in self._pending.items()
+        ]
+        self._pending.update(appended)
+        self._file = log
+        if self._buffer:
+            self._flush_task = asyncio.ensure_future(self._delayed_flush())
+        return recovered
+
+    def _load(self) -> Tuple[List[dict], TextIO]:
+        """Read back the records in the log and open it for appending."""
+        records = []
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as log:
+                for line in log:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        # the final record may be incomplete after a crash
+                        LOGGER.warning("Skipping invalid outbound journal record")
+        return records, open(self.path, "a", encoding="utf-8")
+
+    def _apply(self, record: dict):
+        """Update the pending messages according to a record."""
+        op = record.get("op")
+        if op == "enqueue":
+            self._pending[record["id"]] = record["entry"]
+        elif op == "retry":
+            if record["id"] in self._pending:
+                self._pending[record["id"]]["retries"] = record["retries"]
+        elif op == "done":
+            self._pending.pop(record["id"], None)
+
+    def _append(self, record: dict):
+        """Buffer a record and schedule the buffer to be written."""
+        self._apply(record)
+        self._buffer.append(record)
+        if self._file and not (self._flush_task and not self._flush_task.done()):
+            self._flush_task = asyncio.ensure_future(self._delayed_flush())
+
+    def record_enqueue(
+        self,
+        endpoint: str,
+        payload: Union[str, bytes],
+        transport_id: str,
+        retries: int,
+        metadata: dict = None,
+        api_key: str = None,
+    ) -> str:
+        """
+        Record a message pending delivery.
+
+        Returns:
+            The identifier of the journal entry
+
+        """
+        entry_id = str(uuid4())
+        binary = isinstance(payload, bytes)
+        entry = {
+            "endpoint": endpoint,
+            "payload": bytes_to_b64(payload) if binary else payload,
+            "binary": binary,
+            "transport_id": transport_id,
+            "retries": retries,
+            "metadata": metadata,
+            "api_key": api_key,
+        }
+        self._append({"op": "enqueue", "id": entry_id, "entry": entry})
+        return entry_id
+
+    def record_retry(self, entry_id: str, retries: int):
+        """Record a failed delivery attempt which will be retried."""
+        self._append({"op": "retry", "id": entry_id, "retries": retries})
+
+    def record_done(self, entry_id: str, failed: bool = False):
+        """Record the final outcome of a message delivery."""
+        self._append({"op": "done", "id": entry_id, "failed": failed})
+
+    @staticmethod
+    def _decode_entry(entry_id: str, entry: dict) -> dict:
+        """Restore the original payload of a journal entry."""
+        payload = entry["payload"]
+        return {
+            **entry,
+            "id": entry_id,
+            "payload": b64_to_bytes(payload) if entry.get("binary") else payload,
+        }
+
+    async def _delayed_flush(self):
+        """Wait for more records to accumulate, then write them."""
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    async def flush(self):
+        """Write all buffered records to the log."""
+        async with self._flush_lock:
+            await self._write_buffer()
+            # records appended during the write found this flush still running
+            if self._buffer and self._file:
+                task = self._flush_task
+                if not task or task.done() or task is asyncio.current_task():
+                    self._flush_task = asyncio.ensure_future(self._delayed_flush())
+
+    async def _write_buffer(self):
+        """Write the buffered records, compacting the log when needed."""
+        if not self._buffer or not self._file:
+            return
+        records, self._buffer = self._buffer, []
+        data = "".join(json.dumps(record) + "\n" for record in records)
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self._write, data)
+        self._records += len(records)
+        self._stats["flushes"] += 1
+        self._stats["records"] += len(records)
+        if (
+            self._records >= self.compact_threshold
+            and len(self._pending) * 4 < self._records
+        ):
+            # copy the pending entries, as records are applied concurrently
+            pending = [
+                (entry_id, dict(entry)) for entry_id, entry in self._pending.items()
+            ]
+            await loop.run_in_executor(None, self._compact, pending)
+
+    def _write(self, data: str):
+        """Append data to the log and make it durable."""
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _compact(self, pending: List[Tuple[str, dict]]):
+        """Rewrite the log with only the pending messages."""
+        temp_path = self.path + ".compact"
+        with open(temp_path, "w", encoding="utf-8") as log:
+            for entry_id, entry in pending:
+                record = {"op": "enqueue", "id": entry_id, "entry": entry}
+                log.write(json.dumps(record) + "\n")
+            log.flush()
+            os.fsync(log.fileno())
+        self._file.close()
+        os.replace(temp_path, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._records = len(pending)
+        self._stats["compactions"] += 1
+
+    async def close(self):
+        """Write any buffered records and close the log."""
+        if not self._file:
+            return
+        # waits for a flush in progress, so a write is never interrupted
+        async with self._flush_lock:
+            if self._flush_task and not self._flush_task.done():
+                self._flush_task.cancel()
+            await self._write_buffer()
+            self._file.close()
+            self._file = None
+
+    def __repr__(self) -> str:
+        """Human readable representation of this instance."""
+        return f"<{self.__class__.__name__} path={self.path}>"
@@ -0,0 +1,126 @@
+"""Per-endpoint delivery lanes with circuit breakers."""
+
+import time
+
+from collections import deque
+from typing import Mapping, Union
+from urllib.parse import urldefrag
+
+
+def lane_key(endpoint: str) -> str:
+    """Get the key of the delivery lane for an endpoint."""
+    return urldefrag(endpoint).url
+
+
+class EndpointLane:
+    """
+    Delivery lane for the messages sent to a single endpoint.
+
+    Limits the number of deliveries in progress to the endpoint, and tracks
+    recent failures with a circuit breaker. After too many consecutive
+    failures, the breaker opens and deliveries are held back until the reset
+    timeout has passed. A single trial delivery is then allowed (half-open):
+    if it succeeds the breaker closes, otherwise it opens again.
+    """
+
+    STATE_CLOSED = "closed"
+    STATE_OPEN = "open"
+    STATE_HALF_OPEN = "half-open"
+
+    def __init__(
+        self,
+        key: str,
+        max_active: int = 10,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        """
+        Initialize an `EndpointLane` instance.
+
+        Args:
+            key: the lane key, derived from the endpoint
+            max_active: the maximum number of deliveries in progress
+            failure_threshold: the number of consecutive failures which
+                opens the breaker
+            reset_timeout: the number of seconds before a trial delivery is
+                allowed when the breaker is open
+
+        """
+        self.key = key
+        self.max_active = max_active
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.active = 0
+        self.failures = 0
+        self.opened_at: float = None
+        self.state = self.STATE_CLOSED
+        # messages held back until a delivery slot is available
+        self.waiting = deque()
+
+    @property
+    def reopen_delay(self) -> float:
+        """Get the number of seconds until a trial delivery is allowed."""
+        if self.state != self.STATE_OPEN:
+            return 0.0
+        return max(self.opened_at + self.reset_timeout - time.perf_counter(), 0.0)
+
+    @property
+    def stats(self) -> Mapping[str, Union[str, int]]:
+        """Accessor for the breaker state and delivery counts."""
+        return {
+            "state": self.state,
+            "active": self.active,
+            "waiting": len(self.waiting),
+            "failures": self.failures,
+        }
+
+    def acquire(self) -> bool:
+        """
+        Claim a delivery slot, if one is available.
+
+        Returns:
+            Whether a delivery may be started
+
+        """
+        if self.state == self.STATE_OPEN:
+            if self.reopen_delay:
+                return False
+            self.state = self.STATE_HALF_OPEN
+        if self.state == self.STATE_HALF_OPEN:
+            # only a single trial delivery
+            if self.active:
+                return False
+        elif self.active >= self.max_active:
+            return False
+        self.active += 1
+        return True
+
+    def release(self, success: bool):
+        """Release a delivery slot, recording the outcome of the delivery."""
+        self.active = max(self.active - 1, 0)
+        if success:
+            self.failures = 0
+            self.state = self.STATE_CLOSED
+        else:
+            self.failures += 1
+            if (
+                self.state == self.STATE_HALF_OPEN
+                or self.failures >= self.failure_threshold
+            ):
+                self.state = self.STATE_OPEN
+                self.opened_at = time.perf_counter()
+
+    @property
+    def idle(self) -> bool:
+        """Check whether the lane has no deliveries and no recent failures."""
+        return not (self.active or self.waiting or self.failures)
+
+    def __repr__(self) -> str:
+        """Human readable representation of this instance."""
+        return "<{}(key={}, state={}, active={}, waiting={})>".format(
+            self.__class__.__name__,
+            self.key,
+            self.state,
+            self.active,
+            len(self.waiting),
+        )
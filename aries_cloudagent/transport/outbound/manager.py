@@ -1,21 +1,26 @@
 """Outbound transport manager."""
 
 import asyncio
+import heapq
 import json
 import logging
+import random
 import time
 
-from typing import Callable, Type, Union
+from collections import deque
+
+from typing import Callable, Dict, List, Mapping, Set, Type, Union
 from urllib.parse import urlparse
 
 from ...connections.models.connection_target import ConnectionTarget
 from ...config.injection_context import InjectionContext
 from ...core.profile import Profile
 from ...utils.classloader import ClassLoader, ModuleLoadError, ClassNotFoundError
+from ...utils.repeat import RepeatSequence
 from ...utils.stats import Collector
 from ...utils.task_queue import CompletedTask, TaskQueue, task_exc_info
 
-from ...utils.tracing import trace_event, get_timer
+from ...utils.tracing import trace_event
 
 from ..wire_format import BaseWireFormat
 
@@ -24,6 +29,8 @@ from .base import (
     OutboundDeliveryError,
     OutboundTransportRegistrationError,
 )
+from .journal import OutboundJournal
+from .lanes import EndpointLane, lane_key
 from .message import OutboundMessage
 
 LOGGER = logging.getLogger(__name__)
@@ -61,15 +68,28 @@ class QueuedOutboundMessage:
         self.transport_id: str = transport_id
         self.metadata: dict = None
         self.api_key: str = None
+        self.journal_id: str = None
+        self.attempts = 0
+        self.lane_key: str = None
+        self.release_profile: Callable[[], None] = None
 
 
 class OutboundTransportManager:
     """Outbound transport manager class."""
 
     MAX_RETRY_COUNT = 4
+    RETRY_DELAY = 10
+    RETRY_BACKOFF = 0.25
+    ENDPOINT_MAX_ACTIVE = 10
+    ENDPOINT_MAX_WAITING = 1000
+    BREAKER_FAILURE_THRESHOLD = 5
+    BREAKER_RESET_TIMEOUT = 30
 
     def __init__(
-        self, context: InjectionContext, handle_not_delivered: Callable = None
+        self,
+        context: InjectionContext,
+        handle_not_delivered: Callable = None,
+        profile: Profile = None,
     ):
         """
         Initialize a `OutboundTransportManager` instance.
@@ -77,21 +97,43 @@ class OutboundTransportManager:
         Args:
             context: The application context
             handle_not_delivered: An optional handler for undelivered messages
+            profile: The root profile, used to deliver messages recovered
+                from the outbound journal
 
         """
         self.context = context
+        self.profile = profile
         self.loop = asyncio.get_event_loop()
         self.handle_not_delivered = handle_not_delivered
-        self.outbound_buffer = []
+        # all messages in the queue which are not done
+        self.outbound_buffer: Set[QueuedOutboundMessage] = set()
         self.outbound_event = asyncio.Event()
         self.outbound_new = []
+        self.outbound_ready = deque()
+        # min-heap of (retry_at, sequence, message) for messages awaiting retry
+        self.outbound_retry: List[tuple] = []
         self.registered_schemes = {}
         self.registered_transports = {}
         self.running_transports = {}
         self.task_queue = TaskQueue(max_active=200)
         self._process_task: asyncio.Task = None
+        self._retry_count = 0
+        self._retry_timer: asyncio.TimerHandle = None
+        self.lanes: Dict[str, EndpointLane] = {}
         if self.context.settings.get("transport.max_outbound_retry"):
             self.MAX_RETRY_COUNT = self.context.settings["transport.max_outbound_retry"]
+        if self.context.settings.get("transport.endpoint_max_active"):
+            self.ENDPOINT_MAX_ACTIVE = self.context.settings[
+                "transport.endpoint_max_active"
+            ]
+        self.retry_sequence = RepeatSequence(
+            interval=self.RETRY_DELAY, backoff=self.RETRY_BACKOFF
+        )
+        self.journal: OutboundJournal = None
+        if self.context.settings.get("transport.outbound_journal"):
+            self.journal = OutboundJournal(
+                self.context.settings["transport.outbound_journal"]
+            )
 
     async def setup(self):
         """Perform setup operations."""
@@ -174,22 +216,66 @@ class OutboundTransportManager:
         """Start a registered transport."""
         transport = self.registered_transports[transport_id]()
         transport.collector = self.context.inject(Collector, required=False)
+        transport.configure(self.context.settings)
         await transport.start()
         self.running_transports[transport_id] = transport
 
     async def start(self):
         """Start all transports and feed messages from the queue."""
-        for transport_id in self.registered_transports:
+        tasks = [
             self.task_queue.run(self.start_transport(transport_id))
+            for transport_id in self.registered_transports
+        ]
+        if self.journal:
+            # recovered messages can only be delivered by running transports
+            if tasks:
+                await asyncio.wait(tasks)
+            await self.recover_journal()
+
+    async def recover_journal(self):
+        """Queue the messages left undelivered in the outbound journal."""
+        entries = await self.journal.open()
+        if entries:
+            LOGGER.info("Recovering %d undelivered outbound messages", len(entries))
+        for entry in entries:
+            transport_id = entry["transport_id"]
+            if transport_id not in self.running_transports:
+                try:
+                    transport_id = self.get_running_transport_for_endpoint(
+                        entry["endpoint"]
+                    )
+                except OutboundDeliveryError as err:
+                    LOGGER.error(
+                        "Dropping recovered outbound message to %s: %s",
+                        entry["endpoint"],
+                        err,
+                    )
+                    self.journal.record_done(entry["id"], failed=True)
+                    continue
+            queued = QueuedOutboundMessage(self.profile, None, None, transport_id)
+            queued.journal_id = entry["id"]
+            queued.endpoint = entry["endpoint"]
+            queued.payload = entry["payload"]
+            queued.metadata = entry["metadata"]
+            queued.api_key = entry["api_key"]
+            queued.retries = entry["retries"]
+            queued.state = QueuedOutboundMessage.STATE_PENDING
+            self.outbound_new.append(queued)
+        self.process_queued()
 
     async def stop(self, wait: bool = True):
         """Stop all running transports."""
         if self._process_task and not self._process_task.done():
             self._process_task.cancel()
+        if self._retry_timer:
+            self._retry_timer.cancel()
+            self._retry_timer = None
         await self.task_queue.complete(None if wait else 0)
         for transport in self.running_transports.values():
             await transport.stop()
         self.running_transports = {}
+        if self.journal:
+            await self.journal.close()
 
     def get_registered_transport_for_scheme(self, scheme: str) -> str:
         """Find the registered transport ID for a given scheme."""
@@ -234,13 +320,19 @@ class OutboundTransportManager:
         """Get an instance of a running transport by ID."""
         return self.running_transports[transport_id]
 
-    def enqueue_message(self, profile: Profile, outbound: OutboundMessage):
+    def enqueue_message(
+        self,
+        profile: Profile,
+        outbound: OutboundMessage,
+        release_profile: Callable[[], None] = None,
+    ):
         """
         Add an outbound message to the queue.
 
         Args:
             profile: The active profile for the request
             outbound: The outbound message to deliver
+            release_profile: Called once the message no longer needs the profile
         """
         targets = [outbound.target] if outbound.target else (outbound.target_list or [])
         transport_id = None
@@ -256,6 +348,7 @@ class OutboundTransportManager:
             raise OutboundDeliveryError("No supported transport for outbound message")
 
         queued = QueuedOutboundMessage(profile, outbound, target, transport_id)
+        queued.release_profile = release_profile
         queued.retries = self.MAX_RETRY_COUNT
         self.outbound_new.append(queued)
         self.process_queued()
@@ -294,6 +387,7 @@ class OutboundTransportManager:
         queued.payload = json.dumps(payload)
         queued.state = QueuedOutboundMessage.STATE_PENDING
         queued.retries = 4 if max_attempts is None else max_attempts - 1
+        self.journal_enqueue(queued)
         self.outbound_new.append(queued)
         self.process_queued()
 
@@ -328,34 +422,43 @@ class OutboundTransportManager:
 
         while True:
             self.outbound_event.clear()
-            loop_time = get_timer()
-            upd_buffer = []
-            retry_count = 0
-
-            for queued in self.outbound_buffer:
-                if queued.state == QueuedOutboundMessage.STATE_DONE:
-                    if queued.error:
-                        LOGGER.exception(
-                            "Outbound message could not be delivered to %s",
-                            queued.endpoint,
-                            exc_info=queued.error,
-                        )
-                        if self.handle_not_delivered and queued.message:
-                            self.handle_not_delivered(queued.profile, queued.message)
-                    continue  # remove from buffer
-
-                deliver = False
-
-                if queued.state == QueuedOutboundMessage.STATE_PENDING:
-                    deliver = True
-                elif queued.state == QueuedOutboundMessage.STATE_RETRY:
-                    if queued.retry_at < loop_time:
-                        queued.retry_at = None
-                        deliver = True
+
+            new_messages = self.outbound_new
+            self.outbound_new = []
+            for queued in new_messages:
+                self.outbound_buffer.add(queued)
+                if queued.state == QueuedOutboundMessage.STATE_NEW:
+                    if queued.message and queued.message.enc_payload:
+                        queued.payload = queued.message.enc_payload
+                        queued.state = QueuedOutboundMessage.STATE_PENDING
+                        self.journal_enqueue(queued)
+                        self._release_profile(queued)
                     else:
-                        retry_count += 1
+                        queued.state = QueuedOutboundMessage.STATE_ENCODE
+                    self.outbound_ready.append(queued)
+                elif queued.state == QueuedOutboundMessage.STATE_PENDING:
+                    self.outbound_ready.append(queued)
+                elif queued.state == QueuedOutboundMessage.STATE_RETRY:
+                    self.schedule_retry(queued)
 
-                if deliver:
+            while self.outbound_ready:
+                queued = self.outbound_ready.popleft()
+                if queued.state == QueuedOutboundMessage.STATE_ENCODE:
+                    p_time = trace_event(
+                        self.context.settings,
+                        queued.message if queued.message else queued.payload,
+                        outcome="OutboundTransportManager.ENCODE.START",
+                    )
+                    self.encode_queued_message(queued)
+                    trace_event(
+                        self.context.settings,
+                        queued.message if queued.message else queued.payload,
+                        outcome="OutboundTransportManager.ENCODE.END",
+                        perf_counter=p_time,
+                    )
+                elif queued.state == QueuedOutboundMessage.STATE_PENDING:
+                    if not self.acquire_lane(queued):
+                        continue  # held back by the endpoint lane
                     queued.state = QueuedOutboundMessage.STATE_DELIVER
                     p_time = trace_event(
                         self.context.settings,
@@ -372,46 +475,177 @@ class OutboundTransportManager:
                         perf_counter=p_time,
                     )
 
-                upd_buffer.append(queued)
+            if not self.outbound_buffer:
+                break
+            # sleep until a message is queued, finishes a step or is due for retry
+            await self.outbound_event.wait()
+
+    def schedule_retry(self, queued: QueuedOutboundMessage):
+        """Schedule the delivery of a message to be retried at its `retry_at`."""
+        self._retry_count += 1
+        heapq.heappush(
+            self.outbound_retry, (queued.retry_at, self._retry_count, queued)
+        )
+        if self.outbound_retry[0][2] is queued:
+            self._set_retry_timer()
+
+    def _set_retry_timer(self):
+        """Arm the timer for the earliest retry deadline."""
+        if self._retry_timer:
+            self._retry_timer.cancel()
+            self._retry_timer = None
+        if self.outbound_retry:
+            delay = max(self.outbound_retry[0][0] - time.perf_counter(), 0)
+            self._retry_timer = self.loop.call_later(delay, self._retry_due)
+
+    def _retry_due(self):
+        """Move the messages due for retry to the ready queue."""
+        self._retry_timer = None
+        now = time.perf_counter()
+        while self.outbound_retry and self.outbound_retry[0][0] <= now:
+            queued = heapq.heappop(self.outbound_retry)[2]
+            queued.retry_at = None
+            queued.state = QueuedOutboundMessage.STATE_PENDING
+            self.outbound_ready.append(queued)
+        self._set_retry_timer()
+        self.process_queued()
 
-            new_pending = 0
-            new_messages = self.outbound_new
-            self.outbound_new = []
+    @property
+    def lane_stats(self) -> Mapping[str, dict]:
+        """Accessor for the state of the endpoint lanes in use."""
+        return {key: lane.stats for key, lane in self.lanes.items()}
 
-            for queued in new_messages:
-                if queued.state == QueuedOutboundMessage.STATE_NEW:
-                    if queued.message and queued.message.enc_payload:
-                        queued.payload = queued.message.enc_payload
-                        queued.state = QueuedOutboundMessage.STATE_PENDING
-                        new_pending += 1
-                    else:
-                        queued.state = QueuedOutboundMessage.STATE_ENCODE
-                        p_time = trace_event(
-                            self.context.settings,
-                            queued.message if queued.message else queued.payload,
-                            outcome="OutboundTransportManager.ENCODE.START",
-                        )
-                        self.encode_queued_message(queued)
-                        trace_event(
-                            self.context.settings,
-                            queued.message if queued.message else queued.payload,
-                            outcome="OutboundTransportManager.ENCODE.END",
-                            perf_counter=p_time,
-                        )
-                else:
-                    new_pending += 1
+    def acquire_lane(self, queued: QueuedOutboundMessage) -> bool:
+        """
+        Claim a delivery slot in the lane for the endpoint of a message.
 
-                upd_buffer.append(queued)
+        Messages which cannot be delivered yet are held back in the lane, up to
+        `ENDPOINT_MAX_WAITING`. While the breaker of the lane is open, or when
+        the lane is full, messages are retried later, using up one of their
+        retries.
 
-            self.outbound_buffer = upd_buffer
-            if self.outbound_buffer:
-                if (not new_pending) and (not retry_count):
-                    await self.outbound_event.wait()
-                elif retry_count:
-                    # only retries - yield here so we don't hog resources
-                    await asyncio.sleep(0.05)
+        Returns:
+            Whether the message may be delivered now
+
+        """
+        if queued.lane_key:
+            # resumed from the lane with a delivery slot already claimed
+            return True
+        key = lane_key(queued.endpoint)
+        lane = self.lanes.get(key)
+        if not lane:
+            lane = self.lanes[key] = EndpointLane(
+                key,
+                self.ENDPOINT_MAX_ACTIVE,
+                self.BREAKER_FAILURE_THRESHOLD,
+                self.BREAKER_RESET_TIMEOUT,
+            )
+        if lane.waiting or not lane.acquire():
+            if lane.state == EndpointLane.STATE_OPEN:
+                self.hold_back(queued, lane, "circuit breaker is open")
+            elif len(lane.waiting) >= self.ENDPOINT_MAX_WAITING:
+                self.hold_back(queued, lane, "too many messages waiting")
             else:
-                break
+                lane.waiting.append(queued)
+            return False
+        queued.lane_key = key
+        return True
+
+    def release_lane(self, queued: QueuedOutboundMessage, success: bool):
+        """Release the delivery slot of a message and resume its lane."""
+        lane = self.lanes.get(queued.lane_key)
+        queued.lane_key = None
+        if not lane:
+            return
+        lane.release(success)
+        self._resume_lane(lane.key)
+
+    def hold_back(self, queued: QueuedOutboundMessage, lane: EndpointLane, reason: str):
+        """Retry a message which its lane cannot deliver or hold, if retries remain."""
+        LOGGER.debug("Holding back message for %s: %s", lane.key, reason)
+        queued.error = OutboundDeliveryError(
+            f"Delivery to {lane.key} held back: {reason}"
+        )
+        self.retry_or_finish(queued, lane.reopen_delay)
+
+    def _resume_lane(self, key: str):
+        """Return the messages held back by a lane to the ready queue.
+
+        A delivery slot is claimed for each message before it is returned.
+        """
+        lane = self.lanes.get(key)
+        if not lane:
+            return
+        if lane.idle:
+            del self.lanes[key]
+            return
+        if lane.state == EndpointLane.STATE_OPEN:
+            while lane.waiting:
+                self.hold_back(lane.waiting.popleft(), lane, "circuit breaker is open")
+            return
+        resumed = []
+        while lane.waiting and lane.acquire():
+            queued = lane.waiting.popleft()
+            queued.lane_key = key
+            resumed.append(queued)
+        if resumed:
+            # keep these ahead of later arrivals for the same lane
+            self.outbound_ready.extendleft(reversed(resumed))
+            self.process_queued()
+
+    def retry_or_finish(self, queued: QueuedOutboundMessage, min_delay: float = 0.0):
+        """Schedule a failed message to be retried, or finish it without retries."""
+        queued.attempts += 1
+        if queued.retries:
+            queued.retries -= 1
+            queued.state = QueuedOutboundMessage.STATE_RETRY
+            queued.retry_at = time.perf_counter() + max(
+                self.retry_delay(queued), min_delay
+            )
+            self.schedule_retry(queued)
+            if self.journal and queued.journal_id:
+                self.journal.record_retry(queued.journal_id, queued.retries)
+        else:
+            queued.state = QueuedOutboundMessage.STATE_DONE
+            if self.journal and queued.journal_id:
+                self.journal.record_done(queued.journal_id, failed=True)
+            self._finished(queued)
+
+    def retry_delay(self, queued: QueuedOutboundMessage) -> float:
+        """Calculate the jittered backoff delay before retrying a delivery."""
+        interval = self.retry_sequence.next_interval(queued.attempts)
+        return interval * random.uniform(0.5, 1.0)
+
+    def _release_profile(self, queued: QueuedOutboundMessage):
+        """Release the profile of a message which no longer needs to be encoded."""
+        if queued.release_profile:
+            queued.release_profile()
+            queued.release_profile = None
+
+    def _finished(self, queued: QueuedOutboundMessage):
+        """Remove a message which is done from the queue."""
+        self.outbound_buffer.discard(queued)
+        self._release_profile(queued)
+        if queued.error:
+            LOGGER.exception(
+                "Outbound message could not be delivered to %s",
+                queued.endpoint,
+                exc_info=queued.error,
+            )
+            if self.handle_not_delivered and queued.message:
+                self.handle_not_delivered(queued.profile, queued.message)
+
+    def journal_enqueue(self, queued: QueuedOutboundMessage):
+        """Record a queued message with an encoded payload in the journal."""
+        if self.journal and not queued.journal_id:
+            queued.journal_id = self.journal.record_enqueue(
+                queued.endpoint,
+                queued.payload,
+                queued.transport_id,
+                queued.retries,
+                queued.metadata,
+                queued.api_key,
+            )
 
     def encode_queued_message(self, queued: QueuedOutboundMessage) -> asyncio.Task:
         """Kick off encoding of a queued message."""
@@ -436,11 +670,15 @@ class OutboundTransportManager:
 
     def finished_encode(self, queued: QueuedOutboundMessage, completed: CompletedTask):
         """Handle completion of queued message encoding."""
+        self._release_profile(queued)
         if completed.exc_info:
             queued.error = completed.exc_info
             queued.state = QueuedOutboundMessage.STATE_DONE
+            self._finished(queued)
         else:
             queued.state = QueuedOutboundMessage.STATE_PENDING
+            self.journal_enqueue(queued)
+            self.outbound_ready.append(queued)
         queued.task = None
         self.process_queued()
 
@@ -461,9 +699,9 @@ class OutboundTransportManager:
 
     def finished_deliver(self, queued: QueuedOutboundMessage, completed: CompletedTask):
         """Handle completion of queued message delivery."""
+        self.release_lane(queued, not completed.exc_info)
         if completed.exc_info:
             queued.error = completed.exc_info
-
             if queued.retries:
                 if LOGGER.isEnabledFor(logging.DEBUG):
                     LOGGER.error(
@@ -485,18 +723,18 @@ class OutboundTransportManager:
                         queued.endpoint,
                         queued.error,
                     )
-                queued.retries -= 1
-                queued.state = QueuedOutboundMessage.STATE_RETRY
-                queued.retry_at = time.perf_counter() + 10
             else:
                 LOGGER.exception(
                     ">>> Outbound message failed to deliver, NOT Re-queued.",
                     exc_info=queued.error,
                 )
-                queued.state = QueuedOutboundMessage.STATE_DONE
+            self.retry_or_finish(queued)
         else:
             queued.error = None
             queued.state = QueuedOutboundMessage.STATE_DONE
+            if self.journal and queued.journal_id:
+                self.journal.record_done(queued.journal_id)
+            self._finished(queued)
         queued.task = None
         self.process_queued()
 
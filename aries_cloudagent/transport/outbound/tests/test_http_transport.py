@@ -122,6 +122,32 @@ class TestHttpTransport(AioHTTPTestCase):
             "outbound-http:POST": 1,
         }
 
+    @unittest_run_loop
+    async def test_configure_keepalive(self):
+        server_addr = f"http://localhost:{self.server.port}"
+        transport = HttpTransport()
+        transport.configure(
+            {
+                "transport.http_limit": 10,
+                "transport.http_limit_per_host": 2,
+                "transport.http_keepalive_timeout": 30,
+            }
+        )
+        transport.collector = Collector()
+
+        async def send_messages(transport, endpoint):
+            async with transport:
+                assert transport.connector.limit == 10
+                assert transport.connector.limit_per_host == 2
+                for _ in range(3):
+                    await transport.handle_message(self.profile, "{}", endpoint)
+
+        await asyncio.wait_for(send_messages(transport, server_addr), 5.0)
+        assert self.message_results == [{}, {}, {}]
+        results = transport.collector.extract()
+        assert results["count"]["outbound-http:connect"] == 1
+        assert results["count"]["outbound-http:POST"] == 3
+
     @unittest_run_loop
     async def test_transport_coverage(self):
         transport = HttpTransport()
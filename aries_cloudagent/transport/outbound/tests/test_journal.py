@@ -0,0 +1,179 @@
+import asyncio
+import json
+import os
+import threading
+
+from tempfile import TemporaryDirectory
+
+from asynctest import TestCase as AsyncTestCase
+
+from ..journal import OutboundJournal
+
+
+class TestOutboundJournal(AsyncTestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "outbound.log")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    async def test_recover_pending(self):
+        journal = OutboundJournal(self.path, flush_interval=0)
+        assert await journal.open() == []
+        delivered = journal.record_enqueue("http://a", "payload", "http", 4)
+        retried = journal.record_enqueue(
+            "http://b", b"\x00binary", "http", 4, {"x": 1}, "key"
+        )
+        journal.record_enqueue("http://c", "failed", "http", 0)
+        journal.record_done(delivered)
+        journal.record_retry(retried, 3)
+        await journal.close()
+
+        journal = OutboundJournal(self.path)
+        entries = await journal.open()
+        assert [entry["endpoint"] for entry in entries] == ["http://b", "http://c"]
+        assert entries[0]["id"] == retried
+        assert entries[0]["payload"] == b"\x00binary"
+        assert entries[0]["retries"] == 3
+        assert entries[0]["metadata"] == {"x": 1}
+        assert entries[0]["api_key"] == "key"
+        assert entries[1]["payload"] == "failed"
+        await journal.close()
+
+    async def test_group_commit(self):
+        journal = OutboundJournal(self.path, flush_interval=0.01)
+        await journal.open()
+        for i in range(10):
+            journal.record_enqueue(f"http://{i}", "payload", "http", 4)
+        await journal._flush_task
+        assert journal.stats["flushes"] == 1
+        assert journal.stats["records"] == 10
+        assert journal.stats["pending"] == 10
+        await journal.close()
+
+    async def test_skip_incomplete_record(self):
+        journal = OutboundJournal(self.path)
+        await journal.open()
+        journal.record_enqueue("http://a", "payload", "http", 4)
+        await journal.close()
+        with open(self.path, "a") as log:
+            log.write('{"op": "done", "id"')
+
+        journal = OutboundJournal(self.path)
+        assert len(await journal.open()) == 1
+        await journal.close()
+
+    async def test_compact(self):
+        journal = OutboundJournal(self.path, compact_threshold=10)
+        await journal.open()
+        for i in range(6):
+            entry_id = journal.record_enqueue(f"http://{i}", "payload", "http", 4)
+            journal.record_done(entry_id)
+        pending = journal.record_enqueue("http://pending", "payload", "http", 4)
+        await journal.flush()
+        assert journal.stats["compactions"] == 1
+        with open(self.path) as log:
+            records = [json.loads(line) for line in log]
+        assert [record["id"] for record in records] == [pending]
+
+        journal.record_done(pending)
+        await journal.close()
+        journal = OutboundJournal(self.path)
+        assert await journal.open() == []
+        await journal.close()
+
+    async def test_compact_concurrent_records(self):
+        journal = OutboundJournal(self.path, compact_threshold=10)
+        await journal.open()
+        for i in range(6):
+            entry_id = journal.record_enqueue(f"http://{i}", "payload", "http", 4)
+            journal.record_done(entry_id)
+        pending = journal.record_enqueue("http://pending", "payload", "http", 4)
+
+        compacting = threading.Event()
+        recorded = threading.Event()
+        compact = journal._compact
+
+        def wait_compact(entries):
+            compacting.set()
+            recorded.wait(5)
+            compact(entries)
+
+        journal._compact = wait_compact
+        flush = asyncio.ensure_future(journal.flush())
+        await asyncio.get_event_loop().run_in_executor(None, compacting.wait, 5)
+        for i in range(100):
+            journal.record_done(
+                journal.record_enqueue(f"http://{i}", "payload", "http", 4)
+            )
+        late = journal.record_enqueue("http://late", "payload", "http", 4)
+        journal.record_done(pending)
+        recorded.set()
+        await flush
+        await journal.close()
+
+        journal = OutboundJournal(self.path)
+        assert [entry["id"] for entry in await journal.open()] == [late]
+        await journal.close()
+
+    async def test_record_during_flush(self):
+        journal = OutboundJournal(self.path, flush_interval=0.01)
+        await journal.open()
+        first = journal.record_enqueue("http://a", "payload", "http", 4)
+
+        writing = threading.Event()
+        recorded = threading.Event()
+        write = journal._write
+
+        def wait_write(data):
+            writing.set()
+            recorded.wait(5)
+            write(data)
+
+        journal._write = wait_write
+        await asyncio.get_event_loop().run_in_executor(None, writing.wait, 5)
+        second = journal.record_enqueue("http://b", "payload", "http", 4)
+        recorded.set()
+
+        # the record is written by a follow-up flush, without waiting for close
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if not journal._buffer and journal._flush_task.done():
+                break
+        assert not journal._buffer
+        assert journal.stats["records"] == 2
+
+        # closing does not interrupt a write in progress
+        journal.record_enqueue("http://c", "payload", "http", 4)
+        recorded.clear()
+        writing.clear()
+        flush = asyncio.ensure_future(journal.flush())
+        await asyncio.get_event_loop().run_in_executor(None, writing.wait, 5)
+        close = asyncio.ensure_future(journal.close())
+        await asyncio.sleep(0.01)
+        assert not close.done()
+        recorded.set()
+        await asyncio.gather(flush, close)
+
+        journal = OutboundJournal(self.path)
+        recovered = [entry["id"] for entry in await journal.open()]
+        assert recovered[:2] == [first, second] and len(recovered) == 3
+        await journal.close()
+
+    async def test_record_before_open(self):
+        journal = OutboundJournal(self.path)
+        await journal.open()
+        recovered = journal.record_enqueue("http://a", "payload", "http", 4)
+        await journal.close()
+
+        journal = OutboundJournal(self.path)
+        early = journal.record_enqueue("http://b", "payload", "http", 4)
+        assert [entry["id"] for entry in await journal.open()] == [recovered]
+        assert journal.stats["pending"] == 2
+        await journal.close()
+
+        journal = OutboundJournal(self.path)
+        entries = await journal.open()
+        assert [entry["id"] for entry in entries] == [recovered, early]
+        await journal.close()
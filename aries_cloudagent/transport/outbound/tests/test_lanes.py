@@ -0,0 +1,48 @@
+from asynctest import TestCase as AsyncTestCase
+
+from ..lanes import EndpointLane, lane_key
+
+
+class TestEndpointLane(AsyncTestCase):
+    def test_lane_key(self):
+        assert (
+            lane_key("http://example:8080/topic/x/") == "http://example:8080/topic/x/"
+        )
+        assert lane_key("http://example:8080/#key") == "http://example:8080/"
+
+    def test_max_active(self):
+        lane = EndpointLane("http://example", max_active=2)
+        assert lane.acquire() and lane.acquire()
+        assert not lane.acquire()
+        lane.release(True)
+        assert lane.acquire()
+        assert lane.stats == {
+            "state": EndpointLane.STATE_CLOSED,
+            "active": 2,
+            "waiting": 0,
+            "failures": 0,
+        }
+
+    def test_breaker(self):
+        lane = EndpointLane("http://example", failure_threshold=2, reset_timeout=60)
+        for _ in range(2):
+            assert lane.acquire()
+            lane.release(False)
+        assert lane.state == EndpointLane.STATE_OPEN
+        assert not lane.acquire()
+        assert 59 < lane.reopen_delay <= 60
+        assert not lane.idle
+
+        lane.opened_at -= 60
+        assert lane.acquire()
+        assert lane.state == EndpointLane.STATE_HALF_OPEN
+        assert not lane.acquire()  # single trial
+        lane.release(False)
+        assert lane.state == EndpointLane.STATE_OPEN
+
+        lane.opened_at -= 60
+        assert lane.acquire()
+        lane.release(True)
+        assert lane.state == EndpointLane.STATE_CLOSED
+        assert lane.idle
+        assert repr(lane).startswith("<EndpointLane")
@@ -1,4 +1,9 @@
+import asyncio
 import json
+import os
+import time
+
+from tempfile import TemporaryDirectory
 
 from asynctest import TestCase as AsyncTestCase, mock as async_mock
 
@@ -86,8 +91,10 @@ class TestOutboundTransportManager(AsyncTestCase):
         setattr(
             send_profile, "session", async_mock.MagicMock(return_value=send_session)
         )
-        mgr.enqueue_message(send_profile, message)
+        release_profile = async_mock.MagicMock()
+        mgr.enqueue_message(send_profile, message, release_profile)
         await mgr.flush()
+        release_profile.assert_called_once_with()
 
         transport.wire_format.encode_message.assert_awaited_once_with(
             send_session,
@@ -182,7 +189,7 @@ class TestOutboundTransportManager(AsyncTestCase):
             mgr._process_done(mock_task)
 
     async def test_process_finished_x(self):
-        mock_queued = async_mock.MagicMock(retries=1)
+        mock_queued = async_mock.MagicMock(retries=1, attempts=0)
         mock_task = async_mock.MagicMock(
             exc_info=(KeyError, KeyError("nope"), None),
         )
@@ -196,43 +203,68 @@ class TestOutboundTransportManager(AsyncTestCase):
             mgr.finished_deliver(mock_queued, mock_task)
             mgr.finished_deliver(mock_queued, mock_task)
 
-    async def test_process_loop_retry_now(self):
-        mock_queued = async_mock.MagicMock(
-            state=QueuedOutboundMessage.STATE_RETRY,
-            retry_at=test_module.get_timer() - 1,
-        )
-
+    async def test_retry_due(self):
         context = InjectionContext()
-        mock_handle_not_delivered = async_mock.MagicMock()
-        mgr = OutboundTransportManager(context, mock_handle_not_delivered)
-        mgr.outbound_buffer.append(mock_queued)
+        mgr = OutboundTransportManager(context)
+        queued = QueuedOutboundMessage(None, None, None, "transport")
+        queued.endpoint = "http://1.2.3.4:8081"
+        queued.state = QueuedOutboundMessage.STATE_RETRY
+        queued.retry_at = time.perf_counter() - 1
+        mgr.outbound_buffer.add(queued)
 
         with async_mock.patch.object(
-            test_module, "trace_event", async_mock.MagicMock()
-        ) as mock_trace:
-            mock_trace.side_effect = KeyError()
-            with self.assertRaises(KeyError):  # cover retry logic and bail
-                await mgr._process_loop()
-            assert mock_queued.retry_at is None
+            mgr, "deliver_queued_message", async_mock.MagicMock()
+        ) as mock_deliver:
+            mgr.schedule_retry(queued)
+            assert mgr._retry_timer
+            await asyncio.sleep(0.01)
+            mock_deliver.assert_called_once_with(queued)
+        assert queued.retry_at is None
+        assert queued.state == QueuedOutboundMessage.STATE_DELIVER
+        assert not mgr.outbound_retry and not mgr._retry_timer
+        await mgr.stop()
 
-    async def test_process_loop_retry_later(self):
-        mock_queued = async_mock.MagicMock(
-            state=QueuedOutboundMessage.STATE_RETRY,
-            retry_at=test_module.get_timer() + 3600,
-        )
+    async def test_retry_later(self):
+        context = InjectionContext()
+        mgr = OutboundTransportManager(context)
+        later = async_mock.MagicMock(retry_at=time.perf_counter() + 3600)
+        sooner = async_mock.MagicMock(retry_at=time.perf_counter() + 1800)
+
+        mgr.schedule_retry(later)
+        timer = mgr._retry_timer
+        mgr.schedule_retry(sooner)
+        assert mgr._retry_timer is not timer
+        assert mgr.outbound_retry[0][2] is sooner
+        assert not mgr.outbound_ready
+
+        mgr._retry_due()
+        assert len(mgr.outbound_retry) == 2
+        assert not mgr.outbound_ready
+        await mgr.stop()
+        assert not mgr._retry_timer
 
+    async def test_deliver_retry(self):
         context = InjectionContext()
-        mock_handle_not_delivered = async_mock.MagicMock()
-        mgr = OutboundTransportManager(context, mock_handle_not_delivered)
-        mgr.outbound_buffer.append(mock_queued)
+        mgr = OutboundTransportManager(context)
+        mgr.retry_sequence.interval = 0
+        transport = async_mock.MagicMock(
+            schemes=["http"],
+            start=async_mock.CoroutineMock(),
+            stop=async_mock.CoroutineMock(),
+            handle_message=async_mock.CoroutineMock(
+                side_effect=[OutboundDeliveryError("offline"), None]
+            ),
+        )
+        mgr.register_class(
+            async_mock.MagicMock(schemes=["http"], return_value=transport), "http"
+        )
+        await mgr.start_transport("http")
 
-        with async_mock.patch.object(
-            test_module.asyncio, "sleep", async_mock.CoroutineMock()
-        ) as mock_sleep_x:
-            mock_sleep_x.side_effect = KeyError()
-            with self.assertRaises(KeyError):  # cover retry logic and bail
-                await mgr._process_loop()
-            assert mock_queued.retry_at is not None
+        mgr.enqueue_webhook("topic", {"test": "payload"}, "http://example")
+        await mgr.flush()
+        assert transport.handle_message.await_count == 2
+        assert not mgr.outbound_buffer and not mgr.outbound_retry
+        await mgr.stop()
 
     async def test_process_loop_new(self):
         context = InjectionContext()
@@ -243,6 +275,7 @@ class TestOutboundTransportManager(AsyncTestCase):
             async_mock.MagicMock(
                 state=test_module.QueuedOutboundMessage.STATE_NEW,
                 message=async_mock.MagicMock(enc_payload=b"encr"),
+                endpoint="http://1.2.3.4:8081",
             )
         ]
         with async_mock.patch.object(
@@ -280,7 +313,7 @@ class TestOutboundTransportManager(AsyncTestCase):
             with self.assertRaises(KeyError):
                 await mgr._process_loop()
 
-    async def test_process_loop_x(self):
+    async def test_finished_not_delivered(self):
         mock_queued = async_mock.MagicMock(
             state=QueuedOutboundMessage.STATE_DONE,
             error=KeyError(),
@@ -291,20 +324,24 @@ class TestOutboundTransportManager(AsyncTestCase):
         context = InjectionContext()
         mock_handle_not_delivered = async_mock.MagicMock()
         mgr = OutboundTransportManager(context, mock_handle_not_delivered)
-        mgr.outbound_buffer.append(mock_queued)
+        mgr.outbound_buffer.add(mock_queued)
 
-        await mgr._process_loop()
+        mgr._finished(mock_queued)
+        mock_handle_not_delivered.assert_called_once_with(
+            mock_queued.profile, mock_queued.message
+        )
+        assert not mgr.outbound_buffer
 
     async def test_finished_deliver_x_log_debug(self):
         mock_queued = async_mock.MagicMock(
-            state=QueuedOutboundMessage.STATE_DONE, retries=1
+            state=QueuedOutboundMessage.STATE_DONE, retries=1, attempts=0
         )
         mock_completed_x = async_mock.MagicMock(exc_info=KeyError("an error occurred"))
 
         context = InjectionContext()
         mock_handle_not_delivered = async_mock.MagicMock()
         mgr = OutboundTransportManager(context, mock_handle_not_delivered)
-        mgr.outbound_buffer.append(mock_queued)
+        mgr.outbound_buffer.add(mock_queued)
         with async_mock.patch.object(
             test_module.LOGGER, "exception", async_mock.MagicMock()
         ) as mock_logger_exception, async_mock.patch.object(
@@ -316,3 +353,168 @@ class TestOutboundTransportManager(AsyncTestCase):
         ) as mock_process:
             mock_logger_enabled.return_value = True  # cover debug logging
             mgr.finished_deliver(mock_queued, mock_completed_x)
+
+    async def test_journal_recover(self):
+        with TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "outbound.log")
+            context = InjectionContext()
+            context.update_settings({"transport.outbound_journal": path})
+            profile = InMemoryProfile.test_profile()
+
+            mgr = OutboundTransportManager(context, profile=profile)
+            transport = async_mock.MagicMock(
+                schemes=["http"],
+                start=async_mock.CoroutineMock(),
+                stop=async_mock.CoroutineMock(),
+                handle_message=async_mock.CoroutineMock(
+                    side_effect=OutboundDeliveryError("offline")
+                ),
+            )
+            mgr.register_class(
+                async_mock.MagicMock(schemes=["http"], return_value=transport),
+                "http",
+            )
+            await mgr.start()
+            mgr.enqueue_webhook("topic", {"test": "payload"}, "http://example")
+            queued = mgr.outbound_new[0]
+            assert queued.journal_id
+            await mgr.stop(wait=False)
+
+            mgr = OutboundTransportManager(context, profile=profile)
+            transport.handle_message = async_mock.CoroutineMock()
+            mgr.register_class(
+                async_mock.MagicMock(schemes=["http"], return_value=transport),
+                "http",
+            )
+            await mgr.start()
+            assert len(mgr.outbound_new) == 1
+            recovered = mgr.outbound_new[0]
+            assert recovered.journal_id == queued.journal_id
+            assert recovered.endpoint == "http://example/topic/topic/"
+            await mgr.flush()
+            transport.handle_message.assert_awaited_once_with(
+                profile, queued.payload, recovered.endpoint, None, None
+            )
+            await mgr.stop()
+
+            mgr = OutboundTransportManager(context, profile=profile)
+            await mgr.start()
+            assert not mgr.outbound_new
+            await mgr.stop()
+
+    async def test_endpoint_lane_breaker(self):
+        context = InjectionContext()
+        mgr = OutboundTransportManager(context)
+        mgr.ENDPOINT_MAX_ACTIVE = 1
+        mgr.BREAKER_FAILURE_THRESHOLD = 1
+        mgr.BREAKER_RESET_TIMEOUT = 0.01
+        mgr.retry_sequence.interval = 0
+        queued = []
+        for retries in (1, 1, 0):
+            message = QueuedOutboundMessage(None, None, None, "transport")
+            message.endpoint = "http://example/topic/a/"
+            message.retries = retries
+            queued.append(message)
+        first, second, third = queued
+
+        assert mgr.acquire_lane(first)
+        assert not mgr.acquire_lane(second)
+        lane = mgr.lanes["http://example/topic/a/"]
+        assert list(lane.waiting) == [second]
+        assert mgr.lane_stats["http://example/topic/a/"]["active"] == 1
+
+        with async_mock.patch.object(mgr, "process_queued", async_mock.MagicMock()):
+            # held messages are retried once the breaker opens
+            mgr.release_lane(first, False)
+            assert lane.state == lane.STATE_OPEN
+            assert not lane.waiting
+            assert second.state == QueuedOutboundMessage.STATE_RETRY
+            assert second.retries == 0
+            assert second.retry_at >= time.perf_counter()
+
+            # messages without retries fail while the breaker is open
+            assert not mgr.acquire_lane(third)
+            assert third.state == QueuedOutboundMessage.STATE_DONE
+            assert isinstance(third.error, OutboundDeliveryError)
+
+            await asyncio.sleep(0.02)
+            assert mgr.acquire_lane(second)
+            assert lane.state == lane.STATE_HALF_OPEN
+            mgr.release_lane(second, True)
+        assert "http://example/topic/a/" not in mgr.lanes
+        await mgr.stop()
+
+    async def test_endpoint_lane_max_waiting(self):
+        context = InjectionContext()
+        mgr = OutboundTransportManager(context)
+        mgr.ENDPOINT_MAX_ACTIVE = 1
+        mgr.ENDPOINT_MAX_WAITING = 1
+        queued = []
+        for _ in range(3):
+            message = QueuedOutboundMessage(None, None, None, "transport")
+            message.endpoint = "http://example"
+            message.retries = 1
+            queued.append(message)
+
+        assert mgr.acquire_lane(queued[0])
+        assert not mgr.acquire_lane(queued[1])
+        assert not mgr.acquire_lane(queued[2])
+        assert list(mgr.lanes["http://example"].waiting) == [queued[1]]
+        assert queued[2].state == QueuedOutboundMessage.STATE_RETRY
+        assert queued[2].retries == 0
+        await mgr.stop()
+
+    async def test_endpoint_lane_resume(self):
+        context = InjectionContext()
+        mgr = OutboundTransportManager(context)
+        mgr.ENDPOINT_MAX_ACTIVE = 1
+        queued = []
+        for _ in range(4):
+            message = QueuedOutboundMessage(None, None, None, "transport")
+            message.endpoint = "http://example"
+            queued.append(message)
+
+        assert mgr.acquire_lane(queued[0])
+        for message in queued[1:]:
+            assert not mgr.acquire_lane(message)
+        lane = mgr.lanes["http://example"]
+        assert list(lane.waiting) == queued[1:]
+
+        with async_mock.patch.object(mgr, "process_queued", async_mock.MagicMock()):
+            delivering = queued[0]
+            for message in queued[1:]:
+                mgr.release_lane(delivering, True)
+                assert list(mgr.outbound_ready) == [message]
+                assert lane.active == 1
+                delivering = mgr.outbound_ready.popleft()
+                # the resumed message already holds a delivery slot
+                assert mgr.acquire_lane(delivering)
+                assert lane.active == 1
+            assert not lane.waiting
+            mgr.release_lane(delivering, True)
+        assert "http://example" not in mgr.lanes
+        await mgr.stop()
+
+    async def test_retry_delay_backoff(self):
+        context = InjectionContext()
+        mgr = OutboundTransportManager(context)
+        queued = QueuedOutboundMessage(None, None, None, "transport")
+        queued.attempts = 1
+        assert 5 <= mgr.retry_delay(queued) <= 10
+        queued.attempts = 3
+        assert mgr.retry_delay(queued) > 10
+
+    async def test_start_transport_configure(self):
+        context = InjectionContext()
+        mgr = OutboundTransportManager(context)
+        transport = async_mock.MagicMock(
+            schemes=["http"],
+            start=async_mock.CoroutineMock(),
+            stop=async_mock.CoroutineMock(),
+        )
+        mgr.register_class(
+            async_mock.MagicMock(schemes=["http"], return_value=transport), "http"
+        )
+        await mgr.start_transport("http")
+        transport.configure.assert_called_once_with(context.settings)
+        await mgr.stop()
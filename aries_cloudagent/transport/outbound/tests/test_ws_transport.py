@@ -1,26 +1,34 @@
 import asyncio
 import json
 
+import pytest
+
 from aiohttp.test_utils import AioHTTPTestCase, unittest_run_loop
 from aiohttp import web, WSMsgType
 
 from ....core.in_memory import InMemoryProfile
 
-from ..ws import WsTransport
+from ..base import OutboundTransportError
+from ..ws import WsConnection, WsTransport
 
 
 class TestWsTransport(AioHTTPTestCase):
     async def setUpAsync(self):
         self.profile = InMemoryProfile.test_profile()
         self.message_results = []
+        self.connections = 0
+        self.close_after = None
 
     async def receive_message(self, request):
         ws = web.WebSocketResponse()
         await ws.prepare(request)
+        self.connections += 1
 
         async for msg in ws:
             if msg.type in (WSMsgType.TEXT, WSMsgType.BINARY):
                 self.message_results.append(json.loads(msg.data))
+                if self.close_after and len(self.message_results) >= self.close_after:
+                    await ws.close()
 
             elif msg.type == WSMsgType.ERROR:
                 raise Exception(ws.exception())
@@ -52,3 +60,98 @@ class TestWsTransport(AioHTTPTestCase):
             send_message(transport, b"{}", endpoint=server_addr), 5.0
         )
         assert self.message_results == [{}]
+
+    @unittest_run_loop
+    async def test_connection_reuse(self):
+        server_addr = f"ws://localhost:{self.server.port}"
+        transport = WsTransport()
+        transport.configure(
+            {"transport.ws_heartbeat": 10, "transport.ws_idle_timeout": 60}
+        )
+        assert transport.heartbeat == 10 and transport.idle_timeout == 60
+
+        async def send_messages(transport, endpoint: str):
+            async with transport:
+                for _ in range(3):
+                    await transport.handle_message(self.profile, "{}", endpoint)
+                await asyncio.sleep(0.05)
+
+        await asyncio.wait_for(send_messages(transport, server_addr), 5.0)
+        assert self.message_results == [{}, {}, {}]
+        assert self.connections == 1
+
+    @unittest_run_loop
+    async def test_reconnect(self):
+        server_addr = f"ws://localhost:{self.server.port}"
+        self.close_after = 1
+
+        async def send_messages(transport, endpoint: str):
+            async with transport:
+                await transport.handle_message(self.profile, "{}", endpoint)
+                connection = transport.get_connection(endpoint)
+                for _ in range(50):
+                    if connection.closed:
+                        break
+                    await asyncio.sleep(0.01)
+                assert connection.closed
+                await transport.handle_message(self.profile, "{}", endpoint)
+                await asyncio.sleep(0.05)
+
+        await asyncio.wait_for(send_messages(WsTransport(), server_addr), 5.0)
+        assert self.message_results == [{}, {}]
+        assert self.connections == 2
+
+    @unittest_run_loop
+    async def test_close_idle(self):
+        server_addr = f"ws://localhost:{self.server.port}"
+        transport = WsTransport(idle_timeout=0.01)
+
+        async with transport:
+            await transport.handle_message(self.profile, "{}", server_addr)
+            connection = transport.get_connection(server_addr)
+            await asyncio.sleep(0.05)
+            assert not transport.connections
+            assert connection.closed
+
+    @unittest_run_loop
+    async def test_close_idle_pending(self):
+        server_addr = f"ws://localhost:{self.server.port}"
+        transport = WsTransport(max_in_flight=1)
+
+        async with transport:
+            connection = transport.get_connection(server_addr)
+            await connection._in_flight.acquire()
+            sending = asyncio.ensure_future(
+                transport.handle_message(self.profile, "{}", server_addr)
+            )
+            await asyncio.sleep(0.01)
+            connection.last_used = 0
+            await transport.close_idle()
+            assert transport.get_connection(server_addr) is connection
+
+            connection._in_flight.release()
+            await asyncio.wait_for(sending, 5.0)
+            await asyncio.sleep(0.05)
+            assert self.message_results == [{}]
+
+            connection.last_used = 0
+            await transport.close_idle()
+            assert not transport.connections
+            with pytest.raises(OutboundTransportError):
+                await connection.send("{}")
+
+    @unittest_run_loop
+    async def test_connect_error(self):
+        transport = WsTransport()
+        async with transport:
+            with pytest.raises(OutboundTransportError):
+                await transport.handle_message(self.profile, "{}", None)
+            connection = WsConnection(
+                transport.client_session,
+                "ws://localhost:1",
+                connect_attempts=2,
+                connect_interval=0.01,
+            )
+            with pytest.raises(OutboundTransportError):
+                await connection.send("{}")
+            assert connection.closed
@@ -1,13 +1,142 @@
 """Websockets outbound transport."""
 
+import asyncio
 import logging
-from typing import Union
+import time
 
-from aiohttp import ClientSession, DummyCookieJar
+from typing import Dict, Mapping, Tuple, Union
+
+from aiohttp import (
+    ClientError,
+    ClientSession,
+    ClientWebSocketResponse,
+    DummyCookieJar,
+    WSMsgType,
+)
 
 from ...core.profile import Profile
+from ...utils.repeat import RepeatSequence
+
+from .base import BaseOutboundTransport, OutboundTransportError
+
+LOGGER = logging.getLogger(__name__)
+
+
+class WsConnection:
+    """A long-lived outbound websocket connection to a single endpoint."""
+
+    def __init__(
+        self,
+        client_session: ClientSession,
+        endpoint: str,
+        headers: Mapping[str, str] = None,
+        heartbeat: float = 30.0,
+        max_in_flight: int = 10,
+        connect_attempts: int = 3,
+        connect_interval: float = 2.0,
+    ):
+        """
+        Initialize a `WsConnection` instance.
+
+        Args:
+            client_session: the client session used to connect
+            endpoint: the websocket endpoint
+            headers: the headers sent when connecting
+            heartbeat: the interval in seconds between pings
+            max_in_flight: the maximum number of messages being sent at once
+            connect_attempts: the number of attempts made to connect
+            connect_interval: the base interval in seconds between attempts
+
+        """
+        self.client_session = client_session
+        self.endpoint = endpoint
+        self.headers = headers
+        self.heartbeat = heartbeat
+        self.connect_attempts = connect_attempts
+        self.connect_interval = connect_interval
+        self.last_used = time.perf_counter()
+        # sends waiting for or holding an in-flight slot
+        self.pending = 0
+        self.retired = False
+        self.ws: ClientWebSocketResponse = None
+        self._connect_lock = asyncio.Lock()
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._reader: asyncio.Task = None
+
+    @property
+    def closed(self) -> bool:
+        """Check whether the websocket is not open."""
+        return not self.ws or self.ws.closed
 
-from .base import BaseOutboundTransport
+    async def connect(self):
+        """Open the websocket, retrying with backoff."""
+        async with self._connect_lock:
+            if self.retired:
+                raise OutboundTransportError(
+                    f"Connection to {self.endpoint} has been closed"
+                )
+            if not self.closed:
+                return
+            async for attempt in RepeatSequence(
+                self.connect_attempts, self.connect_interval, 0.25
+            ):
+                try:
+                    self.ws = await self.client_session.ws_connect(
+                        self.endpoint, headers=self.headers, heartbeat=self.heartbeat
+                    )
+                    break
+                except (ClientError, OSError, asyncio.TimeoutError) as err:
+                    if attempt.final:
+                        raise OutboundTransportError(
+                            f"Unable to connect to {self.endpoint}: {err}"
+                        ) from err
+                    LOGGER.debug("Retrying websocket connection to %s", self.endpoint)
+            self._reader = asyncio.ensure_future(self._read(self.ws))
+
+    async def _read(self, ws: ClientWebSocketResponse):
+        """Consume incoming messages, so that heartbeat responses are processed."""
+        async for msg in ws:
+            if msg.type == WSMsgType.ERROR:
+                LOGGER.debug("Websocket error from %s: %s", self.endpoint, msg.data)
+                break
+            LOGGER.debug("Ignoring websocket message from %s", self.endpoint)
+
+    async def send(self, payload: Union[str, bytes]):
+        """Send a message, opening the websocket if necessary."""
+        self.pending += 1
+        try:
+            async with self._in_flight:
+                await self.connect()
+                try:
+                    if isinstance(payload, bytes):
+                        await self.ws.send_bytes(payload)
+                    else:
+                        await self.ws.send_str(payload)
+                except (ClientError, ConnectionError, RuntimeError) as err:
+                    await self.close()
+                    raise OutboundTransportError(
+                        f"Error sending message to {self.endpoint}: {err}"
+                    ) from err
+        finally:
+            self.pending -= 1
+            self.last_used = time.perf_counter()
+
+    async def close(self, retire: bool = False):
+        """Close the websocket, and refuse to reopen it if retired."""
+        if retire:
+            self.retired = True
+        if self._reader:
+            self._reader.cancel()
+            self._reader = None
+        if self.ws:
+            await self.ws.close()
+            self.ws = None
+
+    def __repr__(self) -> str:
+        """Human readable representation of this instance."""
+        return "<{}(endpoint={}, closed={})>".format(
+            self.__class__.__name__, self.endpoint, self.closed
+        )
 
 
 class WsTransport(BaseOutboundTransport):
@@ -15,27 +144,92 @@ class WsTransport(BaseOutboundTransport):
 
     schemes = ("ws", "wss")
 
-    def __init__(self) -> None:
-        """Initialize an `WsTransport` instance."""
+    def __init__(
+        self,
+        heartbeat: float = 30.0,
+        idle_timeout: float = 300.0,
+        max_in_flight: int = 10,
+    ) -> None:
+        """
+        Initialize an `WsTransport` instance.
+
+        Args:
+            heartbeat: the interval in seconds between pings on open websockets
+            idle_timeout: the number of seconds after which an unused
+                websocket is closed
+            max_in_flight: the maximum number of messages being sent at once
+                on a single websocket
+
+        """
         super().__init__()
+        self.client_session: ClientSession = None
+        self.connections: Dict[Tuple, WsConnection] = {}
+        self.heartbeat = heartbeat
+        self.idle_timeout = idle_timeout
+        self.max_in_flight = max_in_flight
         self.logger = logging.getLogger(__name__)
+        self._sweep_task: asyncio.Task = None
+
+    def configure(self, settings: Mapping[str, object]):
+        """Apply the websocket pool settings."""
+        if settings.get("transport.ws_heartbeat"):
+            self.heartbeat = settings["transport.ws_heartbeat"]
+        if settings.get("transport.ws_idle_timeout"):
+            self.idle_timeout = settings["transport.ws_idle_timeout"]
 
     async def start(self):
         """Start the outbound transport."""
         self.client_session = ClientSession(cookie_jar=DummyCookieJar(), trust_env=True)
+        self._sweep_task = asyncio.ensure_future(self._sweep())
         return self
 
     async def stop(self):
         """Stop the outbound transport."""
+        if self._sweep_task:
+            self._sweep_task.cancel()
+            self._sweep_task = None
+        for connection in self.connections.values():
+            await connection.close(retire=True)
+        self.connections = {}
         await self.client_session.close()
         self.client_session = None
 
+    async def _sweep(self):
+        """Periodically close the websockets which have been idle too long."""
+        while True:
+            await asyncio.sleep(self.idle_timeout / 2)
+            await self.close_idle()
+
+    async def close_idle(self):
+        """Close the websockets which have not been used within the idle timeout."""
+        expired = time.perf_counter() - self.idle_timeout
+        for key, connection in list(self.connections.items()):
+            # connections with sends in progress stay in the pool
+            if connection.last_used < expired and not connection.pending:
+                del self.connections[key]
+                await connection.close(retire=True)
+
+    def get_connection(self, endpoint: str, headers: dict = None) -> WsConnection:
+        """Get the pooled connection for an endpoint, creating it if necessary."""
+        key = (endpoint, tuple(sorted(headers.items())) if headers else ())
+        connection = self.connections.get(key)
+        if not connection:
+            connection = self.connections[key] = WsConnection(
+                self.client_session,
+                endpoint,
+                headers,
+                heartbeat=self.heartbeat,
+                max_in_flight=self.max_in_flight,
+            )
+        return connection
+
     async def handle_message(
         self,
         profile: Profile,
         payload: Union[str, bytes],
         endpoint: str,
         metadata: dict = None,
+        api_key: str = None,
     ):
         """
         Handle message from queue.
@@ -46,9 +240,6 @@ class WsTransport(BaseOutboundTransport):
             endpoint: URI endpoint for delivery
             metadata: Additional metadata associated with the payload
         """
-        # aiohttp should automatically handle websocket sessions
-        async with self.client_session.ws_connect(endpoint, headers=metadata) as ws:
-            if isinstance(payload, bytes):
-                await ws.send_bytes(payload)
-            else:
-                await ws.send_str(payload)
+        if not endpoint:
+            raise OutboundTransportError("No endpoint provided")
+        await self.get_connection(endpoint, metadata).send(payload)
@@ -10,6 +10,7 @@ from ..core.profile import ProfileSession
 from ..protocols.routing.v1_0.messages.forward import Forward
 
 from ..messaging.util import time_now
+from ..utils.json_codec import get_json_loads
 from ..utils.task_queue import TaskQueue
 from ..wallet.base import BaseWallet
 from ..wallet.error import WalletError
@@ -60,8 +61,9 @@ class PackWireFormat(BaseWireFormat):
         if not message_json:
             raise WireFormatParseError("Message body is empty")
 
+        loads = get_json_loads(session.settings.get("transport.json_codec"))
         try:
-            message_dict = json.loads(message_json)
+            message_dict = loads(message_json)
         except ValueError:
             raise WireFormatParseError("Message JSON parsing failed")
         if not isinstance(message_dict, dict):
@@ -71,7 +73,8 @@ class PackWireFormat(BaseWireFormat):
         if "@type" not in message_dict:
 
             try:
-                unpack = self.unpack(session, message_body, receipt)
+                # hand over the parsed envelope so the wallet need not parse it
+                unpack = self.unpack(session, message_body, receipt, message_dict)
                 message_json = await (
                     self.task_queue and self.task_queue.run(unpack) or unpack
                 )
@@ -80,7 +83,7 @@ class PackWireFormat(BaseWireFormat):
             else:
                 receipt.raw_message = message_json
                 try:
-                    message_dict = json.loads(message_json)
+                    message_dict = loads(message_json)
                 except ValueError:
                     raise WireFormatParseError("Message JSON parsing failed")
                 if not isinstance(message_dict, dict):
@@ -106,6 +109,7 @@ class PackWireFormat(BaseWireFormat):
         session: ProfileSession,
         message_body: Union[str, bytes],
         receipt: MessageReceipt,
+        envelope: dict = None,
     ):
         """Look up the wallet instance and perform the message unpack."""
         wallet = session.inject(BaseWallet, required=False)
@@ -113,7 +117,10 @@ class PackWireFormat(BaseWireFormat):
             raise WireFormatParseError("Wallet not defined in profile session")
 
         try:
-            unpacked = await wallet.unpack_message(message_body)
+            if envelope is not None:
+                unpacked = await wallet.unpack_message_parsed(envelope, message_body)
+            else:
+                unpacked = await wallet.unpack_message(message_body)
             (
                 message_json,
                 receipt.sender_verkey,
@@ -184,12 +191,12 @@ class PackWireFormat(BaseWireFormat):
         if routing_keys:
             recip_keys = recipient_keys
             for router_key in routing_keys:
-                message = json.loads(message.decode("utf-8"))
-                fwd_msg = Forward(to=recip_keys[0], msg=message)
+                # embed the packed message as-is instead of decoding it again
+                fwd_json = Forward.encode_packed(recip_keys[0], message)
                 # Forwards are anon packed
                 recip_keys = [router_key]
                 try:
-                    message = await wallet.pack_message(fwd_msg.to_json(), recip_keys)
+                    message = await wallet.pack_message(fwd_json, recip_keys)
                 except WalletError as e:
                     raise WireFormatEncodeError("Forward message pack failed") from e
         return message
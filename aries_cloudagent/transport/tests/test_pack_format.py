@@ -122,6 +122,25 @@ class TestPackWireFormat(AsyncTestCase):
         assert delivery.thread_id == self.test_thread_id
         assert delivery.direct_response_mode == "all"
 
+    async def test_unpack_parsed_envelope(self):
+        serializer = PackWireFormat()
+        envelope = {"protected": "data"}
+        mock_wallet = async_mock.MagicMock(
+            unpack_message=async_mock.CoroutineMock(),
+            unpack_message_parsed=async_mock.CoroutineMock(
+                return_value=(json.dumps(self.test_message), "sender", "recipient")
+            ),
+        )
+        session = InMemoryProfile.test_session(bind={BaseWallet: mock_wallet})
+        message_json = json.dumps(envelope)
+        message_dict, delivery = await serializer.parse_message(session, message_json)
+        assert message_dict == self.test_message
+        assert delivery.sender_verkey == "sender"
+        mock_wallet.unpack_message_parsed.assert_awaited_once_with(
+            envelope, message_json
+        )
+        mock_wallet.unpack_message.assert_not_called()
+
     async def test_fallback(self):
         serializer = PackWireFormat()
 
@@ -0,0 +1,37 @@
+"""Selectable JSON decoders for inbound message parsing."""
+
+import json
+
+from typing import Any, Callable, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_CODECS = ("json", "orjson")
+
+
+def json_codec_available(codec: str) -> bool:
+    """Check whether a named JSON codec can be used in this environment."""
+    if codec == "orjson":
+        return orjson is not None
+    return codec in JSON_CODECS
+
+
+def get_json_loads(codec: str = None) -> Callable[[Union[str, bytes]], Any]:
+    """
+    Get the JSON decoding function for a named codec.
+
+    Args:
+        codec: the codec name, defaulting to the standard library decoder
+
+    Returns:
+        A function decoding a JSON document, raising `ValueError` on failure
+
+    """
+    if codec == "orjson":
+        if not orjson:
+            raise ImportError("The orjson package is not installed")
+        return orjson.loads
+    return json.loads
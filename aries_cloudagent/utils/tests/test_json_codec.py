@@ -0,0 +1,25 @@
+import json
+
+from unittest import TestCase
+
+from .. import json_codec as test_module
+
+
+class TestJsonCodec(TestCase):
+    def test_default(self):
+        assert test_module.get_json_loads() is json.loads
+        assert test_module.get_json_loads("json") is json.loads
+        assert test_module.json_codec_available("json")
+        assert not test_module.json_codec_available("bogus")
+
+    def test_orjson(self):
+        if test_module.orjson:
+            assert test_module.json_codec_available("orjson")
+            loads = test_module.get_json_loads("orjson")
+            assert loads(b'{"a": 1}') == {"a": 1}
+            with self.assertRaises(ValueError):
+                loads(b"{")
+        else:
+            assert not test_module.json_codec_available("orjson")
+            with self.assertRaises(ImportError):
+                test_module.get_json_loads("orjson")
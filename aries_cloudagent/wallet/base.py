@@ -1,8 +1,10 @@
 """Wallet base class."""
 
+import json
+
 from abc import ABC, abstractmethod
 from collections import namedtuple
-from typing import Sequence
+from typing import Mapping, Sequence
 
 from ..ledger.base import BaseLedger
 from ..ledger.endpoint_type import EndpointType
@@ -324,6 +326,27 @@ class BaseWallet(ABC):
 
         """
 
+    async def unpack_message_parsed(
+        self, envelope: Mapping, enc_message: bytes = None
+    ) -> (str, str, str):
+        """
+        Unpack a message whose envelope has already been parsed from JSON.
+
+        Wallets able to work from the parsed envelope override this to avoid
+        decoding it again; others unpack the original message bytes.
+
+        Args:
+            envelope: The parsed packed message envelope
+            enc_message: The original encrypted message, if available
+
+        Returns:
+            A tuple: (message, from_verkey, to_verkey)
+
+        """
+        if enc_message is None:
+            enc_message = json.dumps(envelope).encode("utf-8")
+        return await self.unpack_message(enc_message)
+
     def __repr__(self) -> str:
         """Get a human readable string."""
         return "<{}>".format(self.__class__.__name__)
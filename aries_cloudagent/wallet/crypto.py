@@ -2,8 +2,10 @@
 
 import json
 
+import threading
+
 from collections import OrderedDict
-from typing import Callable, Optional, Sequence, Tuple
+from typing import Callable, Mapping, Optional, Sequence, Tuple, Union
 
 import nacl.bindings
 import nacl.exceptions
@@ -160,6 +162,83 @@ def verify_signed_message(signed: bytes, verkey: bytes) -> bool:
     return True
 
 
+class VerkeyCache:
+    """
+    Bounded LRU cache of decoded verkeys and their Curve25519 public keys.
+
+    Entries are keyed by the verkey as given, either base58-encoded or as raw
+    bytes, so the same peers recurring across many messages are only decoded
+    and converted once. The cache is shared between crypto worker threads.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        """
+        Initialize a `VerkeyCache` instance.
+
+        Args:
+            max_entries: the maximum number of verkeys to retain
+
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @property
+    def stats(self) -> Mapping[str, int]:
+        """Accessor for hit, miss and eviction counters."""
+        return {**self._stats, "entries": len(self._entries)}
+
+    def reset_stats(self):
+        """Reset the hit, miss and eviction counters."""
+        with self._lock:
+            self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def clear(self):
+        """Remove all cached verkeys."""
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, verkey: Union[str, bytes]) -> list:
+        """Look up or create the entry for a verkey, updating the usage order."""
+        with self._lock:
+            entry = self._entries.get(verkey)
+            if entry:
+                self._entries.move_to_end(verkey)
+                self._stats["hits"] += 1
+                return entry
+            self._stats["misses"] += 1
+        # decode outside the lock; a concurrent miss on the same key is harmless
+        if isinstance(verkey, str):
+            entry = [b58_to_bytes(verkey), verkey, None]
+        else:
+            entry = [bytes(verkey), bytes_to_b58(verkey), None]
+        with self._lock:
+            self._entries[verkey] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        return entry
+
+    def decode(self, verkey: Union[str, bytes]) -> bytes:
+        """Get the raw bytes of a verkey."""
+        return self._lookup(verkey)[0]
+
+    def encode(self, verkey: Union[str, bytes]) -> str:
+        """Get the base58 encoding of a verkey."""
+        return self._lookup(verkey)[1]
+
+    def to_curve25519(self, verkey: Union[str, bytes]) -> bytes:
+        """Get the Curve25519 public key corresponding to a verkey."""
+        entry = self._lookup(verkey)
+        if entry[2] is None:
+            entry[2] = nacl.bindings.crypto_sign_ed25519_pk_to_curve25519(entry[0])
+        return entry[2]
+
+
+VERKEY_CACHE = VerkeyCache()
+
+
 def prepare_pack_recipient_keys(
     to_verkeys: Sequence[bytes], from_secret: bytes = None
 ) -> Tuple[str, bytes]:
@@ -177,14 +256,15 @@ def prepare_pack_recipient_keys(
     cek = nacl.bindings.crypto_secretstream_xchacha20poly1305_keygen()
     recips = []
 
-    for target_vk in to_verkeys:
-        target_pk = nacl.bindings.crypto_sign_ed25519_pk_to_curve25519(target_vk)
+    # convert all recipient keys up front, reusing previous conversions
+    target_pks = [VERKEY_CACHE.to_curve25519(target_vk) for target_vk in to_verkeys]
+    if from_secret:
+        sender_vk = bytes_to_b58(sign_pk_from_sk(from_secret)).encode("ascii")
+        sk = nacl.bindings.crypto_sign_ed25519_sk_to_curve25519(from_secret)
+
+    for target_vk, target_pk in zip(to_verkeys, target_pks):
         if from_secret:
-            sender_pk = sign_pk_from_sk(from_secret)
-            sender_vk = bytes_to_b58(sender_pk).encode("ascii")
             enc_sender = nacl.bindings.crypto_box_seal(sender_vk, target_pk)
-            sk = nacl.bindings.crypto_sign_ed25519_sk_to_curve25519(from_secret)
-
             nonce = nacl.utils.random(nacl.bindings.crypto_box_NONCEBYTES)
             enc_cek = nacl.bindings.crypto_box(cek, nonce, target_pk, sk)
         else:
@@ -200,7 +280,7 @@ def prepare_pack_recipient_keys(
                         "header",
                         OrderedDict(
                             [
-                                ("kid", bytes_to_b58(target_vk)),
+                                ("kid", VERKEY_CACHE.encode(target_vk)),
                                 (
                                     "sender",
                                     bytes_to_b64(enc_sender, urlsafe=True)
@@ -366,7 +446,7 @@ def encode_pack_message(
 
 
 def decode_pack_message(
-    enc_message: bytes, find_key: Callable
+    enc_message: Union[bytes, Mapping], find_key: Callable
 ) -> Tuple[str, Optional[str], str]:
     """
     Decode a packed message.
@@ -376,7 +456,7 @@ def decode_pack_message(
     recipient.
 
     Args:
-        enc_message: The encrypted message
+        enc_message: The encrypted message, or its already parsed envelope
         find_key: Function to retrieve private key
 
     Returns:
@@ -408,18 +488,23 @@ def decode_pack_message(
     return message, sender_vk, recip_vk
 
 
-def decode_pack_message_outer(enc_message: bytes) -> Tuple[dict, dict, bool]:
+def decode_pack_message_outer(
+    enc_message: Union[bytes, Mapping]
+) -> Tuple[dict, dict, bool]:
     """
     Decode the outer wrapper of a packed message and extract the recipients.
 
     Args:
-        enc_message: The encrypted message
+        enc_message: The encrypted message, or its already parsed envelope
 
     Returns: a tuple of the decoded wrapper, recipients, and authcrypt flag
 
     """
     try:
-        wrapper = PackMessageSchema().loads(enc_message)
+        if isinstance(enc_message, Mapping):
+            wrapper = PackMessageSchema().load(enc_message)
+        else:
+            wrapper = PackMessageSchema().loads(enc_message)
     except ValidationError:
         raise ValueError("Invalid packed message")
 
@@ -506,7 +591,7 @@ def extract_payload_key(sender_cek: dict, recip_secret: bytes) -> Tuple[bytes, s
     Returns: A tuple of the CEK and sender verkey
     """
     recip_vk = sign_pk_from_sk(recip_secret)
-    recip_pk = nacl.bindings.crypto_sign_ed25519_pk_to_curve25519(recip_vk)
+    recip_pk = VERKEY_CACHE.to_curve25519(recip_vk)
     recip_sk = nacl.bindings.crypto_sign_ed25519_sk_to_curve25519(recip_secret)
 
     if sender_cek["nonce"] and sender_cek["sender"]:
@@ -514,9 +599,7 @@ def extract_payload_key(sender_cek: dict, recip_secret: bytes) -> Tuple[bytes, s
             sender_cek["sender"], recip_pk, recip_sk
         )
         sender_vk = sender_vk_bin.decode("ascii")
-        sender_pk = nacl.bindings.crypto_sign_ed25519_pk_to_curve25519(
-            b58_to_bytes(sender_vk_bin)
-        )
+        sender_pk = VERKEY_CACHE.to_curve25519(sender_vk)
         cek = nacl.bindings.crypto_box_open(
             sender_cek["key"], sender_cek["nonce"], sender_pk, recip_sk
         )
@@ -0,0 +1,95 @@
+"""Worker pool for CPU-bound DIDComm pack and unpack operations."""
+
+import asyncio
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Mapping, Optional, Sequence, Tuple, Union
+
+from .crypto import decode_pack_message, encode_pack_message
+
+
+class CryptoWorkerPool:
+    """
+    Pool of workers performing message encryption off the event loop.
+
+    Keys are passed to the workers by value, so a process pool can spread
+    pack and unpack operations across cores.
+    """
+
+    def __init__(self, max_workers: int = None, use_processes: bool = False):
+        """
+        Initialize a `CryptoWorkerPool` instance.
+
+        Args:
+            max_workers: the number of workers, defaulting to the executor default
+            use_processes: whether to run the workers in separate processes
+
+        """
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self._executor: Executor = None
+
+    @property
+    def executor(self) -> Executor:
+        """Accessor for the executor, created on first use."""
+        if not self._executor:
+            executor_cls = (
+                ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+            )
+            self._executor = executor_cls(max_workers=self.max_workers)
+        return self._executor
+
+    async def run(self, fn: Callable, *args):
+        """Run a function with the given arguments in the pool."""
+        return await asyncio.get_event_loop().run_in_executor(
+            self.executor, partial(fn, *args)
+        )
+
+    async def pack_message(
+        self, message: str, to_verkeys: Sequence[bytes], secret: bytes = None
+    ) -> bytes:
+        """
+        Pack a message for one or more recipients.
+
+        Args:
+            message: The message to pack
+            to_verkeys: The verkeys of the recipients, as bytes
+            secret: The secret key of the sender, if any
+
+        Returns:
+            The resulting packed message bytes
+
+        """
+        return await self.run(encode_pack_message, message, to_verkeys, secret)
+
+    async def unpack_message(
+        self, enc_message: Union[bytes, Mapping], secrets: Mapping[str, bytes]
+    ) -> Tuple[str, Optional[str], str]:
+        """
+        Unpack a message.
+
+        Args:
+            enc_message: The packed message bytes, or the parsed envelope
+            secrets: The secret keys of the possible recipients, by verkey
+
+        Returns:
+            A tuple of (message, sender_vk, recip_vk)
+
+        Raises:
+            ValueError: If the message could not be unpacked
+
+        """
+        return await self.run(decode_pack_message, enc_message, dict(secrets).get)
+
+    def shutdown(self, wait: bool = True):
+        """Stop the workers."""
+        if self._executor:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def __repr__(self) -> str:
+        """Human readable representation of this instance."""
+        return "<{}(max_workers={}, use_processes={})>".format(
+            self.__class__.__name__, self.max_workers, self.use_processes
+        )
@@ -1,12 +1,15 @@
 """In-memory implementation of BaseWallet interface."""
 
 import asyncio
-from typing import Sequence
+import json
+
+from typing import Mapping, Sequence, Union
 
 from ..core.in_memory import InMemoryProfile
 
 from .base import BaseWallet, KeyInfo, DIDInfo
 from .crypto import (
+    VERKEY_CACHE,
     create_keypair,
     random_seed,
     validate_seed,
@@ -15,8 +18,9 @@ from .crypto import (
     encode_pack_message,
     decode_pack_message,
 )
+from .crypto_pool import CryptoWorkerPool
 from .error import WalletError, WalletDuplicateError, WalletNotFoundError
-from .util import b58_to_bytes, bytes_to_b58
+from .util import b58_to_bytes, b64_to_bytes, bytes_to_b58
 
 
 class InMemoryWallet(BaseWallet):
@@ -141,6 +145,7 @@ class InMemoryWallet(BaseWallet):
             raise WalletError("Key rotation not in progress for DID: {}".format(did))
         verkey_enc = temp_keys[0]
 
+        self._unindex_did(did)
         self.profile.local_dids[did].update(
             {
                 "seed": self.profile.keys[verkey_enc]["seed"],
@@ -148,6 +153,7 @@ class InMemoryWallet(BaseWallet):
                 "verkey": verkey_enc,
             }
         )
+        self.profile.local_did_verkeys.setdefault(verkey_enc, did)
         self.profile.keys.pop(verkey_enc)
         return DIDInfo(did, verkey_enc, self.profile.local_dids[did]["metadata"].copy())
 
@@ -185,8 +191,21 @@ class InMemoryWallet(BaseWallet):
             "verkey": verkey_enc,
             "metadata": metadata.copy() if metadata else {},
         }
+        self.profile.local_did_verkeys.setdefault(verkey_enc, did)
         return DIDInfo(did, verkey_enc, self.profile.local_dids[did]["metadata"].copy())
 
+    def _unindex_did(self, did: str):
+        """Remove a local DID from the verkey index ahead of changing its verkey."""
+        verkey = self.profile.local_dids[did]["verkey"]
+        if self.profile.local_did_verkeys.get(verkey) != did:
+            return
+        del self.profile.local_did_verkeys[verkey]
+        # another local DID may share the verkey
+        for other, info in self.profile.local_dids.items():
+            if other != did and info["verkey"] == verkey:
+                self.profile.local_did_verkeys[verkey] = other
+                break
+
     def _get_did_info(self, did: str) -> DIDInfo:
         """
         Convert internal DID record to DIDInfo.
@@ -244,9 +263,9 @@ class InMemoryWallet(BaseWallet):
             WalletNotFoundError: If the verkey is not found
 
         """
-        for did, info in self.profile.local_dids.items():
-            if info["verkey"] == verkey:
-                return self._get_did_info(did)
+        did = self.profile.local_did_verkeys.get(verkey)
+        if did:
+            return self._get_did_info(did)
         raise WalletNotFoundError("Verkey not found: {}".format(verkey))
 
     async def replace_local_did_metadata(self, did: str, metadata: dict):
@@ -265,6 +284,37 @@ class InMemoryWallet(BaseWallet):
             raise WalletNotFoundError("Unknown DID: {}".format(did))
         self.profile.local_dids[did]["metadata"] = metadata.copy() if metadata else {}
 
+    def _find_private_key(self, verkey: str) -> bytes:
+        """Resolve the private key for a verkey, if held by the wallet."""
+        did = self.profile.local_did_verkeys.get(verkey)
+        if did:
+            return self.profile.local_dids[did]["secret"]
+        if verkey in self.profile.keys:
+            return self.profile.keys[verkey]["secret"]
+        return None
+
+    def _get_recipient_secrets(
+        self, enc_message: Union[bytes, Mapping]
+    ) -> Mapping[str, bytes]:
+        """Collect the private keys held for the recipients of a packed message."""
+        try:
+            wrapper = (
+                enc_message
+                if isinstance(enc_message, Mapping)
+                else json.loads(enc_message)
+            )
+            protected = json.loads(b64_to_bytes(wrapper["protected"], urlsafe=True))
+            recip_keys = [recip["header"]["kid"] for recip in protected["recipients"]]
+        except (ValueError, TypeError, KeyError):
+            # leave reporting the invalid message to the unpack operation
+            return {}
+        secrets = {}
+        for verkey in recip_keys:
+            secret = self._find_private_key(verkey)
+            if secret:
+                secrets[verkey] = secret
+        return secrets
+
     def _get_private_key(self, verkey: str) -> bytes:
         """
         Resolve private key for a wallet DID.
@@ -279,13 +329,9 @@ class InMemoryWallet(BaseWallet):
             WalletError: If the private key is not found
 
         """
-
-        keys_and_dids = list(self.profile.local_dids.values()) + list(
-            self.profile.keys.values()
-        )
-        for info in keys_and_dids:
-            if info["verkey"] == verkey:
-                return info["secret"]
+        secret = self._find_private_key(verkey)
+        if secret:
+            return secret
 
         raise WalletError("Private key not found for verkey: {}".format(verkey))
 
@@ -364,8 +410,11 @@ class InMemoryWallet(BaseWallet):
         if message is None:
             raise WalletError("Message not provided")
 
-        keys_bin = [b58_to_bytes(key) for key in to_verkeys]
+        keys_bin = [VERKEY_CACHE.decode(key) for key in to_verkeys]
         secret = self._get_private_key(from_verkey) if from_verkey else None
+        pool = self.profile.inject(CryptoWorkerPool, required=False)
+        if pool:
+            return await pool.pack_message(message, keys_bin, secret)
         result = await asyncio.get_event_loop().run_in_executor(
             None, lambda: encode_pack_message(message, keys_bin, secret)
         )
@@ -388,6 +437,40 @@ class InMemoryWallet(BaseWallet):
         """
         if not enc_message:
             raise WalletError("Message not provided")
+        return await self._unpack(enc_message)
+
+    async def unpack_message_parsed(
+        self, envelope: Mapping, enc_message: bytes = None
+    ) -> (str, str, str):
+        """
+        Unpack a message whose envelope has already been parsed from JSON.
+
+        Args:
+            envelope: The parsed packed message envelope
+            enc_message: The original encrypted message, if available
+
+        Returns:
+            A tuple: (message, from_verkey, to_verkey)
+
+        Raises:
+            WalletError: If the message is not provided
+            WalletError: If there is a problem unpacking the message
+
+        """
+        if not envelope:
+            raise WalletError("Message not provided")
+        return await self._unpack(envelope)
+
+    async def _unpack(self, enc_message: Union[bytes, Mapping]) -> (str, str, str):
+        """Unpack a message given as bytes or as a parsed envelope."""
+        pool = self.profile.inject(CryptoWorkerPool, required=False)
+        if pool:
+            try:
+                return await pool.unpack_message(
+                    enc_message, self._get_recipient_secrets(enc_message)
+                )
+            except ValueError as e:
+                raise WalletError("Message could not be unpacked: {}".format(str(e)))
         try:
             (
                 message,
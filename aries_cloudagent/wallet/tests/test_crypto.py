@@ -35,6 +35,39 @@ class TestUtil(TestCase):
 
         assert test_module.sign_pk_from_sk(secret_key) in secret_key
 
+    def test_pack_multiple_recipients(self):
+        keypairs = [test_module.create_keypair() for _ in range(3)]
+        sender_vk, sender_sk = test_module.create_keypair()
+        packed = test_module.encode_pack_message(
+            "message", [vk for vk, _ in keypairs], sender_sk
+        )
+        for vk, sk in keypairs:
+            message, from_vk, to_vk = test_module.decode_pack_message(
+                packed, lambda kid: sk if kid == test_module.bytes_to_b58(vk) else None
+            )
+            assert message == "message"
+            assert from_vk == test_module.bytes_to_b58(sender_vk)
+            assert to_vk == test_module.bytes_to_b58(vk)
+
+    def test_verkey_cache(self):
+        cache = test_module.VerkeyCache(max_entries=2)
+        keys = [test_module.create_keypair()[0] for _ in range(2)]
+        vk_b58 = test_module.bytes_to_b58(keys[0])
+
+        assert cache.decode(vk_b58) == keys[0]
+        assert cache.to_curve25519(vk_b58) == cache.to_curve25519(keys[0])
+        assert cache.encode(keys[0]) == vk_b58
+        assert cache.stats == {"hits": 2, "misses": 2, "evictions": 0, "entries": 2}
+
+        cache.to_curve25519(keys[1])
+        assert cache.stats["evictions"] == 1
+        cache.decode(vk_b58)
+        assert cache.stats["misses"] == 4
+
+        cache.reset_stats()
+        cache.clear()
+        assert cache.stats == {"hits": 0, "misses": 0, "evictions": 0, "entries": 0}
+
     def test_decode_pack_message_x(self):
         with mock.patch.object(
             test_module, "decode_pack_message_outer", mock.MagicMock()
@@ -1,8 +1,10 @@
+import json
 import pytest
 import time
 
 from ...core.in_memory import InMemoryProfile
 from ...messaging.decorators.signature_decorator import SignatureDecorator
+from ...wallet.crypto_pool import CryptoWorkerPool
 from ...wallet.in_memory import InMemoryWallet
 from ...wallet.error import (
     WalletError,
@@ -112,6 +114,15 @@ class TestInMemoryWallet:
         assert new_info.did == self.test_did
         assert new_info.verkey != info.verkey
 
+        found = await wallet.get_local_did_for_verkey(new_info.verkey)
+        assert found.did == self.test_did
+        with pytest.raises(WalletNotFoundError):
+            await wallet.get_local_did_for_verkey(info.verkey)
+        signature = await wallet.sign_message(self.test_message_bytes, new_info.verkey)
+        assert await wallet.verify_message(
+            self.test_message_bytes, signature, new_info.verkey
+        )
+
     @pytest.mark.asyncio
     async def test_create_local_with_did(self, wallet):
         info = await wallet.create_local_did(None, self.test_did)
@@ -289,6 +300,25 @@ class TestInMemoryWallet:
             unpacked_auth, from_verkey, to_verkey = await wallet.unpack_message(b"bad")
         with pytest.raises(WalletError):
             unpacked_auth, from_verkey, to_verkey = await wallet.unpack_message(b"{}")
+
+    @pytest.mark.asyncio
+    async def test_unpack_parsed(self, wallet):
+        await wallet.create_local_did(self.test_seed, self.test_did)
+        await wallet.create_local_did(self.test_target_seed, self.test_target_did)
+        packed = await wallet.pack_message(
+            self.test_message, [self.test_target_verkey], self.test_verkey
+        )
+        unpacked, from_verkey, to_verkey = await wallet.unpack_message_parsed(
+            json.loads(packed)
+        )
+        assert unpacked == self.test_message
+        assert from_verkey == self.test_verkey
+        assert to_verkey == self.test_target_verkey
+
+        with pytest.raises(WalletError):
+            await wallet.unpack_message_parsed({})
+        with pytest.raises(WalletError):
+            await wallet.unpack_message_parsed({"protected": "bad"})
         with pytest.raises(WalletError):
             await wallet.unpack_message(None)
 
@@ -303,3 +333,37 @@ class TestInMemoryWallet:
         msg_decode, ts_decode = sig.decode()
         assert msg_decode == msg
         assert ts_decode == timestamp
+
+
+class TestInMemoryWalletCryptoPool:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("use_processes", [False, True])
+    async def test_pack_unpack_pool(self, wallet, use_processes):
+        pool = CryptoWorkerPool(1, use_processes)
+        wallet.profile.context.injector.bind_instance(CryptoWorkerPool, pool)
+        sender = await wallet.create_local_did(TestInMemoryWallet.test_seed)
+        other = await wallet.create_signing_key()
+        target = await wallet.create_local_did(TestInMemoryWallet.test_target_seed)
+
+        packed = await wallet.pack_message(
+            TestInMemoryWallet.test_message,
+            [TestInMemoryWallet.missing_verkey, other.verkey, target.verkey],
+            sender.verkey,
+        )
+        assert pool.executor
+        unpacked, from_verkey, to_verkey = await wallet.unpack_message(packed)
+        assert unpacked == TestInMemoryWallet.test_message
+        assert from_verkey == sender.verkey
+        assert to_verkey == other.verkey
+
+        packed = await wallet.pack_message(
+            TestInMemoryWallet.test_message, [TestInMemoryWallet.missing_verkey]
+        )
+        with pytest.raises(WalletError):
+            await wallet.unpack_message(packed)
+        with pytest.raises(WalletError):
+            await wallet.unpack_message(b"bad")
+
+        pool.shutdown()
+        assert not pool._executor
+        assert "use_processes" in repr(pool)